@@ -0,0 +1,251 @@
+"""
+Per tick latency of the Sarudnahk boid steering: the actor by actor version
+(SeqDiabloCombat before engine.boids, copied here) against packing the tick's actor
+index and the NumPy pass. Every direction must match. The index is built once per
+tick in game and shared with the attack check, so it is timed on its own and the
+boids only add the pack and the NumPy pass to it.
+
+The actors here are plain Python objects. In game their reads go through the per
+tick snapshot, measure there (record_boids) before drawing conclusions.
+
+Frames are replayed from a recording (record_boids in config.yaml), or generated:
+a horde around the player, walking along a straight line.
+
+Run from the repo root: python -m benchmarks.boids [--frames boids.npz] [--actors 150]
+"""
+import argparse
+import math
+import random
+import time
+from enum import IntEnum
+
+import numpy as np
+
+from engine.boids import BoidKind, BoidWeights, boid_steering, load_frames, pack_actors
+from engine.mathlib import Vec2, is_close
+from engine.spatial import ActorIndex, Tags
+
+
+# memory.evo1.kind, only the kinds used here
+class EKind(IntEnum):
+    MONSTER = 2
+    INTERACT = 7
+    NPC = 5
+
+
+class IKind(IntEnum):
+    FIRE = 4
+    LIFE_GLOBE = 5
+    PLATE = 0
+
+
+class MKind(IntEnum):
+    SKELETON = 9
+    BAT = 1
+
+
+class Actor:
+    """Like Evo1DiabloEntity, the kinds are properties."""
+
+    def __init__(self, pos: Vec2, kind: EKind, sub_kind: int = 0) -> None:
+        self._pos = pos
+        self._kind = kind
+        self._sub = sub_kind
+
+    @property
+    def pos(self) -> Vec2:
+        return self._pos
+
+    @property
+    def kind(self) -> EKind:
+        return self._kind
+
+    @property
+    def ikind(self) -> IKind:
+        return IKind(self._sub)
+
+    @property
+    def mkind(self) -> MKind:
+        return MKind(self._sub)
+
+
+_TO_ACTOR = {
+    BoidKind.MONSTER: (EKind.MONSTER, MKind.BAT),
+    BoidKind.SKELETON: (EKind.MONSTER, MKind.SKELETON),
+    BoidKind.FIRE: (EKind.INTERACT, IKind.FIRE),
+    BoidKind.LIFE_GLOBE: (EKind.INTERACT, IKind.LIFE_GLOBE),
+    BoidKind.IGNORE: (EKind.NPC, 0),
+}
+
+
+def to_actors(positions: np.ndarray, kinds: np.ndarray) -> list[Actor]:
+    return [
+        Actor(Vec2(*pos), *_TO_ACTOR[BoidKind(kind)])
+        for pos, kind in zip(positions.tolist(), kinds.tolist())
+    ]
+
+
+# SeqDiabloCombat, as it was
+class ActorByActor:
+    _BOID_AVOID_RANGE = 4
+    _BOID_SKELETON_MULT = 2
+    _BOID_HEALTH_RANGE = 2
+    _MIN_TARGET_WEIGHT = 1
+    _BOID_HEALTH_FACTOR = 0.4
+    _BOID_AVOID_FACTOR = 0.4
+
+    def __init__(self, actors: list[Actor], need_healing: bool) -> None:
+        self.actors = actors
+        self.need_healing = need_healing
+
+    def _get_boid_enemy_adjustment(self, player_pos: Vec2) -> Vec2:
+        ret = Vec2(0, 0)
+        for actor in self.actors:
+            actor_kind = actor.kind
+            if actor_kind == EKind.MONSTER or (
+                actor_kind == EKind.INTERACT and actor.ikind == IKind.FIRE
+            ):
+                factor = 1
+                if actor_kind == EKind.MONSTER and actor.mkind == MKind.SKELETON:
+                    factor = self._BOID_SKELETON_MULT
+                actor_pos = actor.pos
+                if is_close(player_pos, actor_pos, precision=self._BOID_AVOID_RANGE):
+                    ret = ret + ((player_pos - actor_pos) * factor)
+        return ret
+
+    def _get_boid_health_adjustment(self, player_pos: Vec2) -> Vec2:
+        ret = Vec2(0, 0)
+        for actor in self.actors:
+            if actor.kind == EKind.INTERACT and actor.ikind == IKind.LIFE_GLOBE:
+                actor_pos = actor.pos
+                if is_close(player_pos, actor_pos, precision=self._BOID_HEALTH_RANGE):
+                    ret = ret + (actor_pos - player_pos)
+        return ret
+
+    def get_boid_movement(self, player_pos: Vec2, target: Vec2) -> Vec2:
+        move_vector = target - player_pos
+        if move_vector.norm < self._MIN_TARGET_WEIGHT:
+            return move_vector.normalized
+        move_vector = move_vector.normalized
+        move_vector = move_vector + (
+            self._get_boid_enemy_adjustment(player_pos).normalized
+            * self._BOID_AVOID_FACTOR
+        )
+        heal_factor = (
+            self._BOID_HEALTH_FACTOR
+            if self.need_healing
+            else self._BOID_HEALTH_FACTOR / 3
+        )
+        move_vector = move_vector + (
+            self._get_boid_health_adjustment(player_pos).normalized * heal_factor
+        )
+        return move_vector.normalized
+
+
+def actor_tags(actor: Actor) -> Tags:
+    # Evo1ZeldaMemory._actor_tags
+    kind = actor.kind
+    match kind:
+        case EKind.MONSTER:
+            return kind, actor.mkind
+        case EKind.INTERACT:
+            return kind, actor.ikind
+    return (kind,)
+
+
+def boid_kind(tags: Tags) -> BoidKind:
+    # SeqDiabloCombat._boid_kind
+    match tags:
+        case (EKind.MONSTER, MKind.SKELETON):
+            return BoidKind.SKELETON
+        case (EKind.MONSTER, _):
+            return BoidKind.MONSTER
+        case (EKind.INTERACT, IKind.FIRE):
+            return BoidKind.FIRE
+        case (EKind.INTERACT, IKind.LIFE_GLOBE):
+            return BoidKind.LIFE_GLOBE
+    return BoidKind.IGNORE
+
+
+_WEIGHTS = BoidWeights()
+_AVOID = _WEIGHTS.avoid_table()
+
+
+def steer(
+    positions: np.ndarray, kinds: np.ndarray, player: Vec2, target: Vec2, healing: bool
+) -> Vec2:
+    return boid_steering(player, target, positions, kinds, _WEIGHTS, healing, _AVOID)
+
+
+def generate_frames(count: int, actors: int, seed: int) -> list[tuple]:
+    rand = random.Random(seed)
+    weights = [0.6, 0.15, 0.1, 0.05, 0.1]
+    kinds = rand.choices(list(BoidKind)[1:] + [BoidKind.IGNORE], weights, k=actors)
+    spread = np.array([[rand.gauss(0, 6), rand.gauss(0, 6)] for _ in range(actors)])
+    frames = []
+    for tick in range(count):
+        player = Vec2(20 + tick * 0.05, 30 + math.sin(tick * 0.02))
+        drift = np.array([[rand.gauss(0, 0.05), rand.gauss(0, 0.05)]])
+        spread = spread + drift
+        positions = spread + np.array(player)
+        target = Vec2(player.x + 5, 30)
+        frames.append((player, target, positions, np.array(kinds), tick % 200 < 50))
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", help="Recording (.npz) to replay")
+    parser.add_argument("--ticks", type=int, default=2000, help="Generated ticks")
+    parser.add_argument("--actors", type=int, default=150, help="Generated actors")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = load_frames(args.frames)
+        print(f"Replaying {len(frames)} recorded frames")
+    else:
+        frames = generate_frames(args.ticks, args.actors, args.seed)
+        print(f"{len(frames)} generated frames, {args.actors} actors")
+    ticks = [
+        (player, target, to_actors(positions, kinds), healing)
+        for player, target, positions, kinds, healing in frames
+    ]
+
+    mismatches = 0
+    timings = {
+        "actor by actor": [],
+        "index (shared)": [],
+        "pack + numpy": [],
+        "numpy only": [],
+    }
+    for player, target, actors, healing in ticks:
+        start = time.perf_counter()
+        old = ActorByActor(actors, healing).get_boid_movement(player, target)
+        timings["actor by actor"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        index = ActorIndex(actors, pos_of=lambda actor: actor.pos, tags_of=actor_tags)
+        timings["index (shared)"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        positions, kinds = pack_actors(index, boid_kind)
+        packed = time.perf_counter()
+        new = steer(positions, kinds, player, target, healing)
+        end = time.perf_counter()
+        timings["pack + numpy"].append(end - start)
+        timings["numpy only"].append(end - packed)
+        if not is_close(old, new, precision=1e-9):
+            mismatches += 1
+    print("All directions match" if mismatches == 0 else f"{mismatches} mismatches")
+
+    for name, samples in timings.items():
+        samples = np.array(samples) * 1e6
+        print(
+            f"{name:>16}: mean {samples.mean():7.1f} us, p99 "
+            f"{np.percentile(samples, 99):7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Flow fields against searching again: from random positions on every grid map, time
+AStar.search to a goal against one flow field build plus a next move lookup per
+position (what a section does after being knocked off course). The flow field paths
+are optimal: never longer than the A* ones. They can be shorter, the A* heuristic
+(straight distance) overestimates diagonals, which cost 1.4.
+
+Run from the repo root: python -m benchmarks.flowfield [--goals 3] [--starts 50]
+"""
+import argparse
+import glob
+import math
+import random
+import time
+
+from engine.mathlib import Vec2
+from engine.pathing import AStar, FlowField, TileMap
+
+
+def path_cost(start: Vec2, path: list[Vec2]) -> float:
+    cost, prev = 0.0, start
+    for pos in path:
+        cost += 1.4 if pos.x != prev.x and pos.y != prev.y else 1
+        prev = pos
+    return cost
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--goals", type=int, default=3, help="Goals per map")
+    parser.add_argument("--starts", type=int, default=50, help="Starts per goal")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'map':<26}{'tiles':>7}{'astar (s)':>11}{'build (ms)':>12}"
+        f"{'move (us)':>11}{'speedup':>9}"
+    )
+    mismatches, shorter = 0, 0
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        tilemap = TileMap(filename=filename)
+        if tilemap.nav_nodes:
+            # NavMesh maps have no grid
+            continue
+        nav = AStar(tilemap.map)
+        tiles = list(nav.map)
+        astar_time, build_time, move_time, moves = 0.0, 0.0, 0.0, 0
+        for _ in range(args.goals):
+            goal = rng.choice(tiles)
+            start = time.perf_counter()
+            field = FlowField(nav.map, goal)
+            build_time += time.perf_counter() - start
+            for pos in rng.sample(tiles, min(args.starts, len(tiles))):
+                start = time.perf_counter()
+                try:
+                    astar_path = nav.search(pos, goal)
+                except ValueError:
+                    astar_path = None
+                astar_time += time.perf_counter() - start
+                start = time.perf_counter()
+                field.next_tile(pos)
+                move_time += time.perf_counter() - start
+                moves += 1
+                cost = field.cost(pos)
+                if astar_path is None:
+                    mismatches += not math.isinf(cost)
+                    continue
+                astar_cost = path_cost(pos, astar_path)
+                if cost > astar_cost + 1e-3:
+                    mismatches += 1
+                    print(f"  LONGER {tilemap.name}: {pos} -> {goal}")
+                elif cost < astar_cost - 1e-3:
+                    shorter += 1
+        flow_time = build_time + move_time
+        print(
+            f"{tilemap.name:<26}{len(tiles):>7}{astar_time:>11.3f}"
+            f"{build_time / args.goals * 1000:>12.2f}{move_time / moves * 1e6:>11.2f}"
+            f"{astar_time / flow_time:>8.1f}x"
+        )
+    print(f"{shorter} flow field paths shorter than A*")
+    print("None longer" if mismatches == 0 else f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
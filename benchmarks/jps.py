@@ -0,0 +1,71 @@
+"""
+Jump Point Search against AStar on the same queries: nodes expanded (calls to
+_neighbors) and wall time. Both searches use the same moves and costs, the paths are
+checked against the optimal cost (a flow field from the goal). Only free move queries,
+JPS searches like AStar otherwise.
+
+Run from the repo root: python -m benchmarks.jps [--queries 50] [--maps overworld ...]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.flowfield import path_cost
+from benchmarks.pathing import make_queries
+from engine.pathing import JPS, AStar, FlowField, Pathing, TileMap
+
+_DEFAULT_MAPS = ["overworld", "noria_mines", "sacred_grove"]
+
+
+def counted(nav: Pathing) -> list[int]:
+    # Count the expansions, without touching the class
+    expanded = [0]
+    neighbors = nav._neighbors
+
+    def _neighbors(node, goal, free_move):
+        expanded[0] += 1
+        return neighbors(node, goal, free_move)
+
+    nav._neighbors = _neighbors
+    return expanded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=50, help="Searches per map")
+    parser.add_argument("--maps", nargs="+", default=_DEFAULT_MAPS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'map':<16}{'astar nodes':>13}{'jps nodes':>11}{'astar (s)':>11}"
+        f"{'jps (s)':>9}{'speedup':>9}{'astar opt':>11}{'jps opt':>9}"
+    )
+    for name in args.maps:
+        tilemap = TileMap(filename=f"maps/evo1/{name}.yaml")
+        astar, jps = AStar(tilemap.map), JPS(tilemap.map)
+        astar_nodes, jps_nodes = counted(astar), counted(jps)
+        times = {"astar": 0.0, "jps": 0.0}
+        optimal = {"astar": 0, "jps": 0}
+        queries = [
+            (start, goal)
+            for start, goal, free_move in make_queries(astar, args.queries * 2, rng)
+            if free_move
+        ]
+        for start, goal in queries:
+            best = FlowField(tilemap.map, goal).cost(start)
+            for key, nav in (("astar", astar), ("jps", jps)):
+                begin = time.perf_counter()
+                path = nav.search(start, goal)
+                times[key] += time.perf_counter() - begin
+                optimal[key] += path_cost(start, path) <= best + 1e-3
+        print(
+            f"{name:<16}{astar_nodes[0]:>13}{jps_nodes[0]:>11}{times['astar']:>11.3f}"
+            f"{times['jps']:>9.3f}{times['astar'] / times['jps']:>8.1f}x"
+            f"{optimal['astar']:>7}/{len(queries):<3}{optimal['jps']:>5}/{len(queries)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
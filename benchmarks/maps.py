@@ -0,0 +1,68 @@
+"""
+Time loading every map in maps/evo1, with the per-pixel bitmap loader (as it was
+before vectorizing) and the current TileMap. Both must give the same tiles and
+passability grid.
+
+Run from the repo root: python -m benchmarks.maps [--repeat 3]
+"""
+import argparse
+import glob
+import time
+
+from PIL import Image
+
+from engine.mathlib import Vec2
+from engine.pathing import PassabilityGrid, TileMap
+
+
+class PixelLoopTileMap(TileMap):
+    # The original loader: one getpixel and one BitmapTile per pixel
+    def _load_bitmap(self, filename: str, map_data: dict) -> None:
+        self.tiles = []
+        trees_passable = map_data.get("trees_passable", False)
+        bitmap = Image.open(filename)
+        if bitmap.mode != "RGB":
+            bitmap = bitmap.convert("RGB")
+        width, height = bitmap.size[0], bitmap.size[1]
+        self.map = PassabilityGrid(Vec2(0, 0), width, height)
+        for y_pos in range(height):
+            self.tiles.append("")
+            for x_pos in range(width):
+                red, green, blue = bitmap.getpixel((x_pos, y_pos))[:3]
+                tile = self.BitmapTile((red << 16) | (green << 8) | blue)
+                self.tiles[y_pos] += self.TileToAscii.get(tile, ".")
+                if self._is_passable(tile, trees_passable):
+                    self.map.add(Vec2(x_pos, y_pos))
+
+
+def timed_load(cls: type[TileMap], filename: str, repeat: int) -> tuple[float, TileMap]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        tilemap = cls(filename=filename)
+    return (time.perf_counter() - start) / repeat, tilemap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="Loads per map")
+    args = parser.parse_args()
+
+    print(f"{'map':<26}{'type':>8}{'old (ms)':>10}{'new (ms)':>10}{'speedup':>9}")
+    total_old, total_new, mismatches = 0.0, 0.0, 0
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        t_old, old_map = timed_load(PixelLoopTileMap, filename, args.repeat)
+        t_new, new_map = timed_load(TileMap, filename, args.repeat)
+        total_old += t_old
+        total_new += t_new
+        if old_map.tiles != new_map.tiles or old_map.map.cells != new_map.map.cells:
+            mismatches += 1
+            print(f"  MISMATCH {filename}")
+        print(
+            f"{new_map.name:<26}{new_map.type:>8}{t_old * 1000:>10.1f}{t_new * 1000:>10.1f}{t_old / t_new:>8.1f}x"
+        )
+    print(f"{'total':<34}{total_old * 1000:>10.1f}{total_new * 1000:>10.1f}")
+    print("All maps identical" if mismatches == 0 else f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Compare the list based A* (as it was before the heap rewrite) against
+Pathing.calculate, on every map in maps/evo1. Both use the same neighbor function, so
+this measures the search itself. Both must return the same paths.
+
+Run from the repo root: python -m benchmarks.pathing [--queries 5] [--seed 0]
+"""
+import argparse
+import glob
+import random
+import time
+from collections import deque
+from typing import Optional
+
+from engine.mathlib import Vec2
+from engine.pathing import AStar, NavMesh, Pathing, TileMap
+
+
+# The original implementation: sorts the open list on every pop, linear scans for
+# membership and updates
+def calculate_reference(
+    nav: Pathing,
+    start: Vec2,
+    goal: Vec2,
+    final_pos: Optional[Vec2] = None,
+    free_move: bool = True,
+) -> list[Vec2]:
+    def update_node(cur_node, neighbor, node_list) -> None:
+        n_idx = node_list.index(neighbor)
+        if neighbor.cost < node_list[n_idx].cost:
+            node_list[n_idx].cost = neighbor.cost
+            node_list[n_idx].parent = cur_node
+
+    open_list = [Pathing.Node(start, goal)]
+    closed_list: list[Pathing.Node] = []
+    while open_list:
+        open_list.sort()
+        node = open_list.pop()
+        if node.pos == goal:
+            return node.trace_path(final_pos)
+        closed_list.append(node)
+        for neighbor in nav._neighbors(node, goal, free_move):
+            if neighbor in closed_list:
+                update_node(node, neighbor, closed_list)
+            elif neighbor in open_list:
+                update_node(node, neighbor, open_list)
+            else:
+                open_list.append(neighbor)
+    raise ValueError
+
+
+def load_nav(filename: str) -> tuple[TileMap, Pathing]:
+    tilemap = TileMap(filename=filename)
+    if tilemap.nav_nodes:
+        return tilemap, NavMesh(map_nodes=tilemap.nav_nodes, edges=tilemap.nav_edges)
+    return tilemap, AStar(tilemap.map)
+
+
+def reachable(nav: Pathing, start: Vec2, free_move: bool) -> list[Vec2]:
+    # Flood fill using the same neighbors as the search
+    seen = {start}
+    queue = deque([Pathing.Node(start, start)])
+    while queue:
+        node = queue.popleft()
+        for neighbor in nav._neighbors(node, start, free_move):
+            if neighbor.pos not in seen:
+                seen.add(neighbor.pos)
+                queue.append(neighbor)
+    return list(seen)
+
+
+def make_queries(
+    nav: Pathing, count: int, rng: random.Random
+) -> list[tuple[Vec2, Vec2, bool]]:
+    queries = []
+    for i in range(count):
+        free_move = i % 2 == 0
+        start = rng.choice(list(nav.map))
+        goal = rng.choice(sorted(reachable(nav, start, free_move)))
+        queries.append((start, goal, free_move))
+    return queries
+
+
+def timed(func, *args, **kwargs) -> tuple[float, Optional[list[Vec2]]]:
+    start = time.perf_counter()
+    try:
+        ret = func(*args, **kwargs)
+    except ValueError:
+        ret = None
+    return time.perf_counter() - start, ret
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=5, help="Searches per map")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'map':<26}{'tiles':>7}{'old (s)':>10}{'new (s)':>10}{'speedup':>9}")
+    total_old, total_new, mismatches = 0.0, 0.0, 0
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        tilemap, nav = load_nav(filename)
+        old_time, new_time = 0.0, 0.0
+        for start, goal, free_move in make_queries(nav, args.queries, rng):
+            t_old, old_path = timed(
+                calculate_reference, nav, start, goal, free_move=free_move
+            )
+            t_new, new_path = timed(nav.calculate, start, goal, free_move=free_move)
+            old_time += t_old
+            new_time += t_new
+            if old_path != new_path:
+                mismatches += 1
+                print(f"  MISMATCH {tilemap.name}: {start} -> {goal}")
+        total_old += old_time
+        total_new += new_time
+        speedup = old_time / new_time if new_time else float("inf")
+        print(
+            f"{tilemap.name:<26}{len(nav.map):>7}{old_time:>10.3f}{new_time:>10.3f}{speedup:>8.1f}x"
+        )
+    print(f"{'total':<33}{total_old:>10.3f}{total_new:>10.3f}")
+    print("All paths identical" if mismatches == 0 else f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Forecast the HashLink rng with the pure Python twister (EvolandRNG.RNGStruct, see
+benchmarks/rng_check.py) and the vectorized engine.rng. The outputs are checked to be
+bit-exact first, with the same check as benchmarks/rng_check.py.
+
+Run from the repo root: python -m benchmarks.rng [--states 200] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.rng_check import check, python_forecast, random_state
+from engine import rng as twister
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=200, help="States to check")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check(args.states, max_count=3000, seed=args.seed)
+    print("All forecasts bit-exact")
+
+    values, cursor = random_state(random.Random(args.seed))
+    print(f"{'steps':>10}{'python (ms)':>13}{'numpy (ms)':>12}{'speedup':>9}")
+    for count in [100, 1_000, 10_000, 100_000, 1_000_000]:
+        t_old = timed(lambda: python_forecast(values, cursor, count), args.repeat)
+        t_new = timed(lambda: twister.forecast(values, cursor, count), args.repeat)
+        print(
+            f"{count:>10}{t_old * 1000:>13.2f}{t_new * 1000:>12.2f}{t_old / t_new:>8.1f}x"
+        )
+
+    # Many states (one per seed) at once, 40 batches each
+    states = np.array([random_state(random.Random(i))[0] for i in range(1000)])
+    t_old = timed(
+        lambda: [python_forecast(list(s), twister.RNG_VALS, 1000) for s in states], 1
+    )
+    t_new = timed(lambda: twister.forecast_batches(states, 40), args.repeat)
+    print(
+        f"1000 states x 1000 steps: python {t_old * 1000:.1f} ms, numpy {t_new * 1000:.2f} ms ({t_old / t_new:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Check the vectorized engine.rng against the pure Python twister (EvolandRNG.RNGStruct,
+copied here since memory.rng attaches to the game). Every output must be bit-exact, for
+random states at every cursor position and for batches of many states. Fails on the
+first mismatch, no timing involved (see benchmarks/rng.py for that).
+
+Run from the repo root: python -m benchmarks.rng_check [--states 200] [--seed 0]
+"""
+import argparse
+import random
+
+from engine import rng as twister
+
+
+class RNGStruct:
+    # EvolandRNG.RNGStruct, as the game memory code uses it
+    def __init__(self, cursor: int, values: list[int]) -> None:
+        self.cursor = cursor
+        self.values = values
+
+    def advance_rng(self) -> int:
+        pos = self.cursor
+        self.cursor += 1
+        if pos >= twister.RNG_VALS:
+            self._calc_next_rng()
+            self.cursor = 1
+            pos = 0
+        return pos
+
+    def _calc_next_rng(self):
+        for kk in range(twister.RNG_VALS - twister.RNG_MAX):
+            self.values[kk] = (
+                self.values[kk + twister.RNG_MAX]
+                ^ (self.values[kk] >> 1)
+                ^ twister.RNG_MAG01[self.values[kk] % 2]
+            )
+        for kk in range(twister.RNG_VALS - twister.RNG_MAX, twister.RNG_VALS):
+            self.values[kk] = (
+                self.values[kk + (twister.RNG_MAX - twister.RNG_VALS)]
+                ^ (self.values[kk] >> 1)
+                ^ twister.RNG_MAG01[self.values[kk] % 2]
+            )
+
+    def rand_int(self) -> int:
+        ret = self.values[self.advance_rng()]
+        ret ^= (ret << 7) & 0x2B5B2500
+        ret ^= (ret << 15) & 0xDB8B0000
+        ret ^= ret >> 16
+        return ret
+
+
+def random_state(rand: random.Random) -> tuple[list[int], int]:
+    values = [rand.getrandbits(32) for _ in range(twister.RNG_VALS)]
+    return values, rand.randint(0, twister.RNG_VALS)
+
+
+def python_forecast(values: list[int], cursor: int, count: int) -> list[int]:
+    rng = RNGStruct(cursor, list(values))
+    return [rng.rand_int() for _ in range(count)]
+
+
+def check_forecast(values: list[int], cursor: int, count: int) -> None:
+    expected = python_forecast(values, cursor, count)
+    forecasted = twister.forecast(values, cursor, count).tolist()
+    assert len(forecasted) == count, f"{len(forecasted)} values, expected {count}"
+    for i, (got, want) in enumerate(zip(forecasted, expected)):
+        assert got == want, f"cursor {cursor}, step {i}: {got:#010x} != {want:#010x}"
+
+
+def check_batches(states: list[list[int]], batches: int) -> None:
+    forecasted = twister.forecast_batches(states, batches)
+    assert len(forecasted) == len(states)
+    for n, (values, found) in enumerate(zip(states, forecasted)):
+        expected = python_forecast(values, twister.RNG_VALS, batches * twister.RNG_VALS)
+        assert found.ravel().tolist() == expected, f"state {n} differs"
+
+
+def check(states: int, max_count: int, seed: int) -> None:
+    rand = random.Random(seed)
+    values, _ = random_state(rand)
+    # Every cursor, and the counts around a batch
+    for cursor in range(twister.RNG_VALS + 1):
+        check_forecast(values, cursor, 2 * twister.RNG_VALS + 1)
+    for count in [0, 1, twister.RNG_VALS - 1, twister.RNG_VALS, twister.RNG_VALS + 1]:
+        check_forecast(values, 0, count)
+    for _ in range(states):
+        values, cursor = random_state(rand)
+        check_forecast(values, cursor, rand.randint(0, max_count))
+    # Several states at once
+    check_batches([random_state(rand)[0] for _ in range(16)], 40)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=200, help="States to check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check(args.states, max_count=3000, seed=args.seed)
+    print("All forecasts bit-exact")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Waypoints and travel distance of the A* paths on every grid map, before and after the
+line of sight smoothing (engine.pathing.smoothing). Every smoothed segment is checked
+again by sampling points along it and along its sides: they must all stand on
+traversable tiles.
+
+Run from the repo root: python -m benchmarks.smoothing [--queries 20] [--seed 0]
+"""
+import argparse
+import glob
+import math
+import random
+import time
+
+from benchmarks.pathing import load_nav, make_queries
+from engine.mathlib import Vec2, dist
+from engine.pathing import AStar, PassabilityGrid
+from engine.pathing.flowfield import tile_of
+from engine.pathing.smoothing import CLEARANCE, smooth_path
+
+_SAMPLE_STEP = 0.05
+
+
+def length(start: Vec2, path: list[Vec2]) -> float:
+    return sum(dist(a, b) for a, b in zip([start] + path, path))
+
+
+def walkable(grid: PassabilityGrid, a: Vec2, b: Vec2) -> bool:
+    steps = max(1, math.ceil(dist(a, b) / _SAMPLE_STEP))
+    norm = dist(a, b) or 1
+    # Just inside the clearance, the raycasts are exact at it
+    side = Vec2(a.y - b.y, b.x - a.x) * (CLEARANCE * 0.99 / norm)
+    for i in range(steps + 1):
+        pos = a + (b - a) * (i / steps)
+        for sample in (pos, pos + side, pos - side):
+            if tile_of(sample) not in grid:
+                return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=20, help="Paths per map")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'map':<26}{'waypoints':>11}{'smoothed':>10}{'length':>9}"
+        f"{'smoothed':>10}{'time (ms)':>11}"
+    )
+    totals = [0, 0, 0.0, 0.0]
+    invalid = 0
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        tilemap, nav = load_nav(filename)
+        if not isinstance(nav, AStar):
+            continue
+        raw_count, smooth_count, raw_len, smooth_len, smooth_time = 0, 0, 0.0, 0.0, 0.0
+        for start, goal, free_move in make_queries(nav, args.queries * 2, rng):
+            # Only free move paths are smoothed
+            if not free_move:
+                continue
+            try:
+                path = nav.search(start, goal)
+            except ValueError:
+                continue
+            begin = time.perf_counter()
+            smoothed = smooth_path(nav.map, start, path)
+            smooth_time += time.perf_counter() - begin
+            raw_count += len(path)
+            smooth_count += len(smoothed)
+            raw_len += length(start, path)
+            smooth_len += length(start, smoothed)
+            for a, b in zip([start] + smoothed, smoothed):
+                if not walkable(nav.map, a, b):
+                    invalid += 1
+                    print(f"  BLOCKED {tilemap.name}: {a} -> {b}")
+        totals = [
+            totals[0] + raw_count,
+            totals[1] + smooth_count,
+            totals[2] + raw_len,
+            totals[3] + smooth_len,
+        ]
+        print(
+            f"{tilemap.name:<26}{raw_count:>11}{smooth_count:>10}{raw_len:>9.1f}"
+            f"{smooth_len:>10.1f}{smooth_time * 1000:>11.2f}"
+        )
+    print(
+        f"{'total':<26}{totals[0]:>11}{totals[1]:>10}{totals[2]:>9.1f}"
+        f"{totals[3]:>10.1f}"
+    )
+    print("Every segment walkable" if invalid == 0 else f"{invalid} blocked segments")
+
+
+if __name__ == "__main__":
+    main()
@@ -76,6 +76,18 @@ class EvolandController:
             self.none()
             wait_frames(self.delay)
 
+        # Shortest hold/release the game still reads as separate presses
+        _BURST_FRAMES = 1
+
+        def burst(self, steps: int):
+            """Tap down steps times (up when negative), back to back."""
+            press = self.down if steps > 0 else self.up
+            for _ in range(abs(steps)):
+                press()
+                wait_frames(self._BURST_FRAMES)
+                self.none()
+                wait_frames(self._BURST_FRAMES)
+
         def tap_left(self):
             self.left()
             wait_frames(self.delay)
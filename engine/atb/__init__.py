@@ -0,0 +1,34 @@
+from engine.atb.plan import ATBAction, ATBActor, ATBPlan
+from engine.atb.sim import (
+    ATBRules,
+    BattleResult,
+    BattleState,
+    Combatant,
+    RNGStream,
+    attack_damage,
+    attack_hits,
+    simulate,
+)
+from engine.atb.stats import ATBEntity, ATBEntityID, ATBEntityStats, atb_stats_from_id
+from engine.atb.turns import GaugeTracker, Turn, turn_order
+
+__all__ = [
+    "ATBAction",
+    "ATBActor",
+    "ATBPlan",
+    "ATBRules",
+    "BattleResult",
+    "BattleState",
+    "Combatant",
+    "RNGStream",
+    "attack_damage",
+    "attack_hits",
+    "simulate",
+    "ATBEntity",
+    "ATBEntityID",
+    "ATBEntityStats",
+    "atb_stats_from_id",
+    "GaugeTracker",
+    "Turn",
+    "turn_order",
+]
@@ -0,0 +1,243 @@
+"""
+Score ATB plan policies over many rng seeds, with the simulator running in a process
+pool. A policy is scored by its win rate and the average duration of the fights it
+wins. The rules (ATBRules) and turn gauge speeds aren't calibrated against the game,
+so the scores rank policies, the times themselves are only estimates.
+
+Run from the repo root: python -m engine.atb.evaluate [--fight zephyros] [--seeds 2000]
+"""
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from engine import rng as twister
+from engine.atb.plan import ATBAction, ATBActor, ATBPlan
+from engine.atb.sim import (
+    ATBRules,
+    BattleResult,
+    BattleState,
+    Combatant,
+    Policy,
+    RNGStream,
+    simulate,
+)
+from engine.atb.stats import ATBEntityID, atb_stats_from_id
+
+
+@dataclass
+class PolicyScore:
+    name: str
+    fights: int
+    win_rate: float
+    mean_time: Optional[float]  # Of the fights won
+    stdev_time: Optional[float]
+    mean_turns: float
+    mean_potions: float
+
+    def __str__(self) -> str:
+        if self.mean_time is None:
+            return f"{self.name}: never wins"
+        return (
+            f"{self.name}: {self.mean_time:.1f}s (+-{self.stdev_time:.1f}), "
+            f"win rate {self.win_rate:.1%}, {self.mean_turns:.1f} turns, "
+            f"{self.mean_potions:.2f} potions"
+        )
+
+
+def seeded_rng(seed: int) -> RNGStream:
+    """A random rng state (as found in the game at the start of a fight)."""
+    rand = random.Random(seed)
+    values = [rand.getrandbits(32) for _ in range(twister.RNG_VALS)]
+    return RNGStream(values, cursor=rand.randint(0, twister.RNG_VALS))
+
+
+def _simulate_seeds(
+    start: BattleState, policy: Policy, rules: ATBRules, seeds: list[int]
+) -> list[BattleResult]:
+    return [simulate(start, policy, seeded_rng(seed), rules) for seed in seeds]
+
+
+def score_policy(
+    name: str,
+    start: BattleState,
+    policy: Policy,
+    seeds: Iterable[int],
+    rules: Optional[ATBRules] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    chunk_size: int = 250,
+) -> PolicyScore:
+    """
+    Simulate the fight once per seed. The policy has to be picklable (a module level
+    function) when a pool is given.
+    """
+    if rules is None:
+        rules = ATBRules()
+    seeds = list(seeds)
+    chunks = [seeds[i : i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    if pool is None:
+        batches = [_simulate_seeds(start, policy, rules, chunk) for chunk in chunks]
+    else:
+        futures = [
+            pool.submit(_simulate_seeds, start, policy, rules, chunk)
+            for chunk in chunks
+        ]
+        batches = [future.result() for future in futures]
+    results = [result for batch in batches for result in batch]
+    won = [result.time for result in results if result.won]
+    return PolicyScore(
+        name=name,
+        fights=len(results),
+        win_rate=len(won) / len(results),
+        mean_time=statistics.fmean(won) if won else None,
+        stdev_time=statistics.pstdev(won) if won else None,
+        mean_turns=statistics.fmean(result.turns for result in results),
+        mean_potions=statistics.fmean(result.potions_used for result in results),
+    )
+
+
+# Fights and candidate policies. The turn gauge speeds are guesses, replace them with
+# BattleEntity.turn_gauge_speed readings (see combatant_from_memory in evo1.atb)
+_ALLY_SPEED = 0.5
+_KAERIS_SPEED = 0.45
+_BOSS_SPEED = 0.4
+_POTIONS = 3
+
+
+def _party(level: int) -> list[Combatant]:
+    return [
+        Combatant.from_stats(
+            "Clink", atb_stats_from_id(ATBEntityID.CLINK, level), _ALLY_SPEED
+        ),
+        Combatant.from_stats(
+            "Kaeris", atb_stats_from_id(ATBEntityID.KAERIS, level), _KAERIS_SPEED
+        ),
+    ]
+
+
+# SeqZephyrosATB._PHASE_2_HP. Under it the route only attacks until Zephyros' super
+# move ends the battle, then Babamut chases him away in a battle of its own
+_ZEPHYROS_PHASE_2_HP = 800
+# ATBEntityID.ZEPHYROS has placeholder stats (250 hp), below the phase 2 threshold.
+# Guess until it is read in game, set it with --zephyros-hp
+_ZEPHYROS_HP = 1200
+
+
+def _zephyros(hp: int, min_hp: int = 1) -> Combatant:
+    stats = atb_stats_from_id(ATBEntityID.ZEPHYROS)
+    stats.max_hp = stats.cur_hp = hp
+    return Combatant.from_stats("Zephyros", stats, _BOSS_SPEED, min_hp=min_hp)
+
+
+def zephyros_fight(hp: int = _ZEPHYROS_HP) -> BattleState:
+    # Phase 1, won once Zephyros is under the phase 2 threshold
+    return BattleState(
+        allies=_party(level=3),
+        enemies=[_zephyros(hp, min_hp=_ZEPHYROS_PHASE_2_HP)],
+        potions=_POTIONS,
+    )
+
+
+def zephyros_babamut_fight(hp: int = _ZEPHYROS_HP) -> BattleState:
+    # SeqZephyrosBabamut, the party is back to full health
+    return BattleState(allies=_party(level=3), enemies=[_zephyros(hp)])
+
+
+def attack_only(state: BattleState, actor: ATBActor) -> ATBPlan:
+    return ATBPlan(actor, ATBAction.ATTACK, target=0)
+
+
+def crystal_attack(state: BattleState, actor: ATBActor) -> ATBPlan:
+    if actor == ATBActor.KAERIS:
+        return ATBPlan(actor, ATBAction.X_CRYSTAL, target=0)
+    return ATBPlan(actor, ATBAction.ATTACK, target=0)
+
+
+def _potion_if_critical(state: BattleState, actor: ATBActor) -> Optional[ATBPlan]:
+    if state.potions == 0:
+        return None
+    for target in (ATBActor.KAERIS, ATBActor.CLINK):
+        ally = state.allies[target]
+        if ally.alive and ally.cur_hp < 30:
+            return ATBPlan(actor, ATBAction.POTION, target=target)
+    return None
+
+
+def zephyros_heuristic(state: BattleState, actor: ATBActor) -> ATBPlan:
+    # Same decisions as SeqZephyrosATB.create_plan, keep them in sync
+    if state.enemies[0].cur_hp < _ZEPHYROS_PHASE_2_HP:
+        return ATBPlan(actor, ATBAction.ATTACK, target=0)
+    clink_hp = state.allies[0].cur_hp
+    kaeris_hp = state.allies[1].cur_hp
+    # It doesn't check the potions left, the turn is wasted without any
+    if kaeris_hp < 30 and kaeris_hp != 0:
+        return ATBPlan(actor, ATBAction.POTION, target=ATBActor.KAERIS)
+    if clink_hp < 30 and clink_hp != 0:
+        return ATBPlan(actor, ATBAction.POTION, target=ATBActor.CLINK)
+    should_heal = clink_hp < 50 and kaeris_hp < 45
+    if actor == ATBActor.KAERIS:
+        if should_heal:
+            return ATBPlan(actor, ATBAction.HEAL, target=None)
+        return ATBPlan(actor, ATBAction.X_CRYSTAL, target=0)
+    return ATBPlan(actor, ATBAction.ATTACK, target=0)
+
+
+def attack_with_potions(state: BattleState, actor: ATBActor) -> ATBPlan:
+    if (plan := _potion_if_critical(state, actor)) is not None:
+        return plan
+    return ATBPlan(actor, ATBAction.ATTACK, target=0)
+
+
+def babamut(state: BattleState, actor: ATBActor) -> ATBPlan:
+    # SeqZephyrosBabamut.create_plan
+    return ATBPlan(actor, ATBAction.BABAMUT, target=None)
+
+
+# Kefka's Ghost is left out until its invincible counter phase is simulated (see
+# SeqKefkasGhost._is_invincible), the scores would say nothing about the real fight
+FIGHTS: dict[str, tuple[Callable[[int], BattleState], dict[str, Policy]]] = {
+    "zephyros": (
+        zephyros_fight,
+        {
+            "heuristic": zephyros_heuristic,
+            "attack": attack_only,
+            "attack+potions": attack_with_potions,
+            "x-crystal": crystal_attack,
+        },
+    ),
+    "zephyros_babamut": (zephyros_babamut_fight, {"babamut": babamut}),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fight", choices=list(FIGHTS), default="zephyros")
+    parser.add_argument("--seeds", type=int, default=2000, help="Fights per policy")
+    parser.add_argument(
+        "--processes", type=int, default=None, help="Pool size (default: CPU count)"
+    )
+    parser.add_argument("--zephyros-hp", type=int, default=_ZEPHYROS_HP)
+    args = parser.parse_args()
+
+    fight, policies = FIGHTS[args.fight]
+    start = fight(args.zephyros_hp)
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        scores = [
+            score_policy(name, start, policy, range(args.seeds), pool=pool)
+            for name, policy in policies.items()
+        ]
+    elapsed = time.perf_counter() - start_time
+    # Fastest first, among the ones that always win
+    scores.sort(key=lambda score: (-score.win_rate, score.mean_time or float("inf")))
+    print("Uncalibrated rules and speeds, compare the policies, not the times")
+    for score in scores:
+        print(score)
+    print(f"{len(scores) * args.seeds} fights simulated in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+from enum import Enum, IntEnum, auto
+from typing import NamedTuple, Optional
+
+
+class ATBAction(Enum):
+    ATTACK = auto()
+    POTION = auto()
+    HEAL = auto()
+    X_CRYSTAL = auto()
+    BABAMUT = auto()
+
+
+class ATBActor(IntEnum):
+    CLINK = 0
+    KAERIS = 1
+
+
+class ATBPlan(NamedTuple):
+    cur_actor: ATBActor
+    action: ATBAction
+    target: Optional[ATBActor | int]
+
+    def __repr__(self) -> str:
+        if self.target is not None:
+            target = (
+                f"->{self.target.name}"
+                if isinstance(self.target, ATBActor)
+                else f"->{self.target}"
+            )
+        else:
+            target = ""
+        return f"Plan({self.cur_actor.name}: {self.action.name}{target})"
@@ -0,0 +1,253 @@
+"""
+Deterministic ATB battle simulator. Plays a whole fight turn by turn from a rng state,
+with the same damage and hit rolls as the game, so plan policies can be compared
+offline (see engine/atb/evaluate.py).
+
+Turn order follows the game: every combatant fills its turn gauge at its own speed
+(turn_gauge_speed per second), and acts when it reaches 1 (see engine/atb/turns.py).
+Fast combatants get double turns on their own.
+"""
+import copy
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+from engine import rng as twister
+from engine.atb.plan import ATBAction, ATBActor, ATBPlan
+from engine.atb.stats import ATBEntityStats
+from engine.atb.turns import Gauge, turn_order
+
+logger = logging.getLogger(__name__)
+
+
+# Att + (0.5 * Att * random_float) - enemy_def
+def attack_damage(attack: int, defense: int, rng_float: float) -> int:
+    return int(attack + (0.5 * attack * rng_float) - defense + 0.5)
+
+
+def attack_hits(evade: int, rng_int: int) -> bool:
+    roll = (rng_int & 0x3FFFFFFF) % 100
+    return roll >= evade
+
+
+@dataclass(frozen=True)
+class ATBRules:
+    """
+    Everything that isn't read from the game. None of it is calibrated yet: the
+    heal and X-crystal powers, Babamut's damage and the action times are guesses,
+    so simulated times are only good for comparing policies with each other.
+    """
+
+    potion_heal: int = 50
+    # Kaeris' heal restores magic * heal_power to every ally alive (guess)
+    heal_power: float = 4.0
+    # X-crystal deals magic * x_crystal_power to one enemy, it never misses (guess)
+    x_crystal_power: float = 5.0
+    # Placeholder, only says that Babamut ends the fight
+    babamut_damage: int = 9999
+    # Seconds the animation of each action takes (guesses). Gauges don't fill
+    # meanwhile
+    action_time: dict[ATBAction, float] = field(
+        default_factory=lambda: {
+            ATBAction.ATTACK: 1.5,
+            ATBAction.POTION: 1.5,
+            ATBAction.HEAL: 2.0,
+            ATBAction.X_CRYSTAL: 2.0,
+            ATBAction.BABAMUT: 5.0,
+        }
+    )
+    enemy_action_time: float = 1.5
+    # Fights longer than this are lost
+    timeout: float = 600.0
+
+
+@dataclass
+class Combatant:
+    name: str
+    max_hp: int
+    cur_hp: int
+    attack: int
+    defense: int
+    magic: int
+    evade: int
+    # Turn gauge units per second, acts at 1
+    speed: float
+    gauge: float = 0.0
+    # Out of the fight under this hp, e.g. a boss moving to its next phase
+    min_hp: int = 1
+
+    @classmethod
+    def from_stats(
+        cls,
+        name: str,
+        stats: ATBEntityStats,
+        speed: float,
+        gauge: float = 0.0,
+        min_hp: int = 1,
+    ) -> "Combatant":
+        return cls(
+            name=name,
+            max_hp=stats.max_hp,
+            cur_hp=stats.cur_hp,
+            attack=stats.attack,
+            defense=stats.defense,
+            magic=stats.magic,
+            evade=stats.evade,
+            speed=speed,
+            gauge=gauge,
+            min_hp=min_hp,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.cur_hp >= self.min_hp
+
+
+class RNGStream:
+    """The rand_int outputs from a rng state, forecast in chunks."""
+
+    _CHUNK = 1024
+
+    def __init__(self, values: Sequence[int], cursor: int) -> None:
+        self._values = list(values)
+        self._cursor = cursor
+        self._ints: list[int] = []
+        self.offset = 0
+
+    def rand_int(self) -> int:
+        if self.offset >= len(self._ints):
+            count = max(2 * len(self._ints), self._CHUNK)
+            self._ints = twister.forecast(self._values, self._cursor, count).tolist()
+        ret = self._ints[self.offset]
+        self.offset += 1
+        return ret
+
+    def rand_float(self) -> float:
+        big = 4294967296.0
+        return ((self.rand_int() / big + self.rand_int()) / big + self.rand_int()) / big
+
+
+@dataclass
+class BattleState:
+    allies: list[Combatant]
+    enemies: list[Combatant]
+    potions: int = 0
+    time: float = 0.0
+    turns: int = 0
+
+
+@dataclass
+class BattleResult:
+    won: bool
+    time: float
+    turns: int
+    potions_used: int
+    rng_used: int
+
+
+# (state, actor) -> plan, like SeqATBCombat.create_plan
+Policy = Callable[[BattleState, ATBActor], ATBPlan]
+# (state, enemy index, rng) -> ally index to attack
+EnemyPolicy = Callable[[BattleState, int, RNGStream], int]
+
+
+def random_target(state: BattleState, enemy: int, rng: RNGStream) -> int:
+    """Attack one of the allies alive, picked with one rng value."""
+    alive = [i for i, ally in enumerate(state.allies) if ally.alive]
+    return alive[rng.rand_int() % len(alive)]
+
+
+def _attack(attacker: Combatant, defender: Combatant, rng: RNGStream) -> None:
+    dmg = attack_damage(attacker.attack, defender.defense, rng.rand_float())
+    if attack_hits(defender.evade, rng.rand_int()):
+        defender.cur_hp = max(defender.cur_hp - max(dmg, 0), 0)
+
+
+def _gauges(group: list[Combatant]) -> list[Gauge]:
+    return [(member.gauge, member.speed if member.alive else 0.0) for member in group]
+
+
+def _first_alive(group: list[Combatant]) -> Optional[int]:
+    return next((i for i, member in enumerate(group) if member.alive), None)
+
+
+def _ally_turn(
+    state: BattleState, actor: ATBActor, plan: ATBPlan, rules: ATBRules, rng: RNGStream
+) -> None:
+    caster = state.allies[actor]
+    match plan.action:
+        case ATBAction.ATTACK:
+            target = plan.target
+            if target is None or not state.enemies[target].alive:
+                target = _first_alive(state.enemies)
+            _attack(caster, state.enemies[target], rng)
+        case ATBAction.POTION:
+            target = plan.target
+            if target is None:
+                # The ally alive with the least hp
+                alive = [i for i, ally in enumerate(state.allies) if ally.alive]
+                target = min(alive, key=lambda i: state.allies[i].cur_hp)
+            ally = state.allies[target]
+            # On a dead ally the turn is wasted
+            if state.potions > 0 and ally.alive:
+                state.potions -= 1
+                ally.cur_hp = min(ally.cur_hp + rules.potion_heal, ally.max_hp)
+        case ATBAction.HEAL:
+            for ally in state.allies:
+                if ally.alive:
+                    ally.cur_hp = min(
+                        ally.cur_hp + int(caster.magic * rules.heal_power),
+                        ally.max_hp,
+                    )
+        case ATBAction.X_CRYSTAL:
+            target = plan.target
+            if target is None or not state.enemies[target].alive:
+                target = _first_alive(state.enemies)
+            enemy = state.enemies[target]
+            enemy.cur_hp = max(
+                enemy.cur_hp - int(caster.magic * rules.x_crystal_power), 0
+            )
+        case ATBAction.BABAMUT:
+            for enemy in state.enemies:
+                enemy.cur_hp = max(enemy.cur_hp - rules.babamut_damage, 0)
+
+
+def simulate(
+    start: BattleState,
+    policy: Policy,
+    rng: RNGStream,
+    rules: Optional[ATBRules] = None,
+    enemy_policy: EnemyPolicy = random_target,
+) -> BattleResult:
+    """Play the fight until one side is down, or the timeout."""
+    if rules is None:
+        rules = ATBRules()
+    state = copy.deepcopy(start)
+    while state.time < rules.timeout:
+        if not any(enemy.alive for enemy in state.enemies):
+            break
+        if not any(ally.alive for ally in state.allies):
+            break
+        turn = turn_order(_gauges(state.allies), _gauges(state.enemies), count=1)[0]
+        member = (state.allies if turn.ally else state.enemies)[turn.index]
+        for other in state.allies + state.enemies:
+            if other.alive:
+                other.gauge += turn.time * other.speed
+        state.time += turn.time
+        member.gauge = 0.0
+        state.turns += 1
+        if not turn.ally:
+            target = enemy_policy(state, turn.index, rng)
+            _attack(member, state.allies[target], rng)
+            state.time += rules.enemy_action_time
+        else:
+            plan = policy(state, ATBActor(turn.index))
+            _ally_turn(state, ATBActor(turn.index), plan, rules, rng)
+            state.time += rules.action_time[plan.action]
+    return BattleResult(
+        won=not any(enemy.alive for enemy in state.enemies),
+        time=state.time,
+        turns=state.turns,
+        potions_used=start.potions - state.potions,
+        rng_used=rng.offset,
+    )
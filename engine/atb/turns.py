@@ -0,0 +1,103 @@
+"""
+Turn order prediction. Every combatant fills its turn gauge at its own speed (gauge
+units per second) and acts when it reaches 1, after which it starts again from 0. The
+gauges are extrapolated to list the upcoming turns with the time until each of them.
+
+Action animations pause the gauges, so the times are a lower bound past the first
+turn; the order itself holds.
+
+When several gauges are full at once, the one that filled up first acts first. The
+turn gauge is only known to cover [0-1.0]; whether it keeps growing past 1 while
+waiting has not been confirmed in game, so GaugeTracker works out the fill moments
+from the gauges seen on the previous ticks instead of relying on an overshoot.
+"""
+import heapq
+from typing import NamedTuple, Optional, Sequence
+
+
+class Turn(NamedTuple):
+    time: float  # Seconds from now, 0 when the gauge is already full
+    ally: bool
+    index: int
+
+
+# (turn_gauge, turn_gauge_speed), a speed of 0 never acts (dead, frozen...)
+Gauge = tuple[float, float]
+
+
+def turn_order(
+    allies: Sequence[Gauge], enemies: Sequence[Gauge], count: int = 6
+) -> list[Turn]:
+    """
+    The next turns, soonest first. Full gauges go first, in the order they filled up
+    (the one past 1 the longest acts first, see GaugeTracker). Allies go first on
+    ties.
+    """
+    # (time it fills, enemy, index, speed). Full gauges have a negative fill time
+    queue = [
+        ((1.0 - gauge) / speed, not is_ally, index, speed)
+        for is_ally, group in ((True, allies), (False, enemies))
+        for index, (gauge, speed) in enumerate(group)
+        if speed > 0
+    ]
+    heapq.heapify(queue)
+    order = []
+    while queue and len(order) < count:
+        fill, is_enemy, index, speed = queue[0]
+        order.append(Turn(max(fill, 0.0), not is_enemy, index))
+        # Starts again from 0 once it acts
+        heapq.heapreplace(queue, (max(fill, 0.0) + 1.0 / speed, is_enemy, index, speed))
+    return order
+
+
+class GaugeTracker:
+    """
+    Follows the gauges from tick to tick to tell in which order the full ones filled
+    up, whether or not the game clamps them at 1. The fill moment is taken from the
+    last gauge seen below 1, extrapolated at its speed and capped to the tick it was
+    seen full on. A gauge already full on the first tick counts as just filled.
+    """
+
+    def __init__(self) -> None:
+        self.clock = 0.0
+        # (ally, index) -> last gauge seen, and the moment it filled up once full
+        self._last: dict[tuple[bool, int], Gauge] = {}
+        self._filled: dict[tuple[bool, int], float] = {}
+
+    def reset(self) -> None:
+        self.clock = 0.0
+        self._last = {}
+        self._filled = {}
+
+    def _fill_moment(self, key: tuple[bool, int], delta: float) -> float:
+        last: Optional[Gauge] = self._last.get(key)
+        if last is None or last[0] >= 1.0 or last[1] <= 0:
+            return self.clock
+        prev_clock = self.clock - delta
+        return prev_clock + min((1.0 - last[0]) / last[1], delta)
+
+    def update(
+        self, allies: Sequence[Gauge], enemies: Sequence[Gauge], delta: float
+    ) -> tuple[list[Gauge], list[Gauge]]:
+        """
+        The gauges of this tick, with the full ones pushed past 1 by the time since
+        they filled up, ready for turn_order.
+        """
+        self.clock += delta
+        tracked: tuple[list[Gauge], list[Gauge]] = ([], [])
+        for is_ally, group, out in (
+            (True, allies, tracked[0]),
+            (False, enemies, tracked[1]),
+        ):
+            for index, (gauge, speed) in enumerate(group):
+                key = (is_ally, index)
+                if gauge < 1.0:
+                    self._filled.pop(key, None)
+                elif key not in self._filled:
+                    self._filled[key] = self._fill_moment(key, delta)
+                self._last[key] = (gauge, speed)
+                if key in self._filled:
+                    waited = self.clock - self._filled[key]
+                    gauge = max(gauge, 1.0 + speed * waited)
+                out.append((gauge, speed))
+        return tracked
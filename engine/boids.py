@@ -0,0 +1,190 @@
+"""
+Boid steering over packed actor arrays. The actors of a tick are packed from its actor
+index (engine.spatial), which has already read them, into positions (N x 2) and kinds
+(N), then all the rules are evaluated in one NumPy pass:
+
+1. Move towards the goal
+2. Avoid monsters and fire, weighted by kind
+3. Grab life globes
+
+The final direction is the goal direction plus each adjustment (normalized) times its
+weight. Ticks can be recorded to replay them offline (see benchmarks/boids.py).
+"""
+import atexit
+import logging
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Optional
+
+import numpy as np
+
+from engine.mathlib import Vec2
+from engine.spatial import ActorIndex, Tags
+
+logger = logging.getLogger(__name__)
+
+
+class BoidKind(IntEnum):
+    IGNORE = 0
+    MONSTER = 1
+    SKELETON = 2
+    FIRE = 3
+    LIFE_GLOBE = 4
+
+
+@dataclass(frozen=True)
+class BoidWeights:
+    # Actors to avoid, and how much
+    avoid: dict[BoidKind, float] = field(
+        default_factory=lambda: {
+            BoidKind.MONSTER: 1.0,
+            # Skeletons are dangerous
+            BoidKind.SKELETON: 2.0,
+            BoidKind.FIRE: 1.0,
+        }
+    )
+    avoid_range: float = 4.0
+    avoid_factor: float = 0.4
+    health_range: float = 2.0
+    # Towards life globes, a third of it while healthy
+    health_factor: float = 0.4
+    healthy_health_factor: float = 0.4 / 3
+    # Closer to the goal than this, go straight for it
+    min_target_weight: float = 1.0
+
+    def avoid_table(self) -> np.ndarray:
+        table = np.zeros(len(BoidKind))
+        for kind, weight in self.avoid.items():
+            table[kind] = weight
+        return table
+
+
+def pack_actors(
+    index: ActorIndex, classify: Callable[[Tags], BoidKind]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Positions (N x 2) and kinds (N) of the actors the boids care about, from the
+    index of the tick. Each kind tags is classified once, and no actor is read again.
+    """
+    positions: list[float] = []
+    kinds: list[int] = []
+    for tags, coords in index.coords():
+        kind = classify(tags)
+        if kind == BoidKind.IGNORE:
+            continue
+        positions += coords
+        kinds += [kind] * (len(coords) // 2)
+    return (
+        np.array(positions, dtype=np.float64).reshape(-1, 2),
+        np.array(kinds, dtype=np.int64),
+    )
+
+
+def _normalized(vec: np.ndarray) -> np.ndarray:
+    norm = np.hypot(vec[0], vec[1])
+    return vec if norm == 0 else vec / norm
+
+
+def boid_steering(
+    player: Vec2,
+    target: Vec2,
+    positions: np.ndarray,
+    kinds: np.ndarray,
+    weights: BoidWeights,
+    need_healing: bool,
+    avoid_table: Optional[np.ndarray] = None,
+) -> Vec2:
+    """Normalized direction to move in."""
+    player_arr = np.array(player, dtype=np.float64)
+    move = np.array(target, dtype=np.float64) - player_arr
+    if np.hypot(move[0], move[1]) < weights.min_target_weight:
+        return Vec2(*_normalized(move))
+    move = _normalized(move)
+    if len(kinds) > 0:
+        if avoid_table is None:
+            avoid_table = weights.avoid_table()
+        offsets = positions - player_arr
+        reach = np.hypot(offsets[:, 0], offsets[:, 1])
+        # Away from the threats in range
+        avoid = avoid_table[kinds] * (reach <= weights.avoid_range)
+        move += _normalized(-(offsets * avoid[:, None]).sum(axis=0)) * (
+            weights.avoid_factor
+        )
+        # Towards the life globes in range
+        globes = (kinds == BoidKind.LIFE_GLOBE) & (reach <= weights.health_range)
+        factor = (
+            weights.health_factor if need_healing else weights.healthy_health_factor
+        )
+        move += _normalized(offsets[globes].sum(axis=0)) * factor
+    return Vec2(*_normalized(move))
+
+
+class BoidRecorder:
+    """Keeps the steering inputs of every tick, to save them for benchmarks."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._frames: list[tuple] = []
+
+    def record(
+        self,
+        player: Vec2,
+        target: Vec2,
+        positions: np.ndarray,
+        kinds: np.ndarray,
+        need_healing: bool,
+    ) -> None:
+        self._frames.append((player, target, positions, kinds, need_healing))
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def save(self) -> None:
+        if not self._frames:
+            return
+        players, targets, positions, kinds, healing = zip(*self._frames)
+        np.savez_compressed(
+            self.path,
+            player=np.array(players),
+            target=np.array(targets),
+            need_healing=np.array(healing),
+            # Frames are concatenated, split at these offsets
+            offsets=np.cumsum([0] + [len(k) for k in kinds]),
+            positions=np.concatenate(positions).reshape(-1, 2),
+            kinds=np.concatenate(kinds),
+        )
+        logger.info(f"Saved {len(self._frames)} boid frames to {self.path}")
+
+
+def load_frames(path: str) -> list[tuple]:
+    """Frames saved by BoidRecorder, as (player, target, positions, kinds, healing)."""
+    data = np.load(path)
+    offsets = data["offsets"]
+    return [
+        (
+            Vec2(*data["player"][i]),
+            Vec2(*data["target"][i]),
+            data["positions"][offsets[i] : offsets[i + 1]],
+            data["kinds"][offsets[i] : offsets[i + 1]],
+            bool(data["need_healing"][i]),
+        )
+        for i in range(len(offsets) - 1)
+    ]
+
+
+_recorder: Optional[BoidRecorder] = None
+
+
+def get_boid_recorder() -> Optional[BoidRecorder]:
+    return _recorder
+
+
+def set_boid_recording(path: Optional[str]) -> None:
+    """Record the boid inputs of every tick to path (.npz), saved on exit."""
+    global _recorder
+    if _recorder is not None:
+        _recorder.save()
+        atexit.unregister(_recorder.save)
+    _recorder = BoidRecorder(path) if path else None
+    if _recorder is not None:
+        atexit.register(_recorder.save)
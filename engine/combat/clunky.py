@@ -46,10 +46,11 @@ class SeqMove2DClunkyCombat(SeqMove2D):
         player_pos = mem.player.pos
 
         with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
+            nearby = mem.actor_index.in_radius(player_pos, self.DETECTION_DISTANCE)
+            for enemy_pos, actor in nearby:
                 if not actor.is_enemy:
                     continue
-                enemy_pos = actor.pos
+                # in_radius includes the edge, the detection doesn't
                 dist_to_player = dist(player_pos, enemy_pos)
                 if dist_to_player < self.DETECTION_DISTANCE and self.turn_towards_pos(
                     target_pos=enemy_pos, precision=math.pi / 4
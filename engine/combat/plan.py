@@ -33,12 +33,8 @@ class CombatPlan:
         # Map enemies in arena to array of GameEntity2D to track
         # Needed until I figure out which enemies are valid (broken pointers will throw an exception)
         with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
-                if not actor.is_enemy:
-                    continue
-                enemy_pos = actor.pos
-                # Check if target is found. If so, initialize the tracking entity
-                if self.arena.contains(enemy_pos):
+            for _, actor in mem.actor_index.in_box(self.arena):
+                if actor.is_enemy:
                     ret.append(actor)
         return ret
 
@@ -0,0 +1,13 @@
+from typing import Optional
+
+
+def menu_steps(cursor: int, target: int, size: Optional[int] = None) -> int:
+    """
+    Fewest inputs to move a menu cursor to the target: the number of downs, negative
+    for ups. Menus of known size wrap around, ties go down.
+    """
+    if size is None:
+        return target - cursor
+    down = (target - cursor) % size
+    up = (cursor - target) % size
+    return down if down <= up else -up
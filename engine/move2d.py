@@ -4,7 +4,9 @@ import math
 from typing import Callable, Optional
 
 from control import evo_ctrl
-from engine.mathlib import Facing, Vec2, angle_between, is_close
+from engine.mathlib import Facing, Vec2, angle_between, dist, is_close
+from engine.pathing.astar import AStar
+from engine.pathing.flowfield import FlowField
 from engine.seq import SeqBase, SeqDelay
 from term.window import SubWindow, WindowLayout
 
@@ -347,6 +349,94 @@ class SeqMove2D(SeqSection2D):
         return f"{self.name}[{step}/{num_coords}]: {target}"
 
 
+# Move to a goal following a flow field instead of a fixed list of coordinates.
+# Gets back on track from anywhere, e.g. after being knocked back
+class SeqFlowMove2D(SeqSection2D):
+    # Further than this from the tile walked to, we were pushed: pick it again
+    _OFF_COURSE = 1.5
+
+    def __init__(
+        self,
+        name: str,
+        nav: AStar,
+        goal: Vec2,
+        final_pos: Optional[Vec2] = None,
+        precision: float = 0.2,
+        free_move: bool = True,
+        func=None,
+        invert: bool = False,
+    ):
+        self.nav = nav
+        self.goal = goal
+        self.final_pos = final_pos or goal
+        self.precision = precision
+        self.free_move = free_move
+        self.invert = invert
+        self.target: Optional[Vec2] = None
+        # Sections like SeekDeath keep running on the final position, log it once
+        self.arrived = False
+        super().__init__(name, func=func)
+
+    def reset(self) -> None:
+        self.target = None
+        self.arrived = False
+
+    @property
+    def field(self) -> FlowField:
+        # Cached by the map, built the first time the goal is used
+        return self.nav.flow_field(self.goal, self.free_move)
+
+    def _next_target(self, player_pos: Vec2) -> Optional[Vec2]:
+        field = self.field
+        tile = field.next_tile(player_pos)
+        # On the goal tile, finish on the exact position
+        if tile is None or tile == field.goal:
+            return self.final_pos
+        return tile
+
+    def execute(self, delta: float) -> bool:
+        mem = self.zelda_mem()
+        player_pos = mem.player.pos
+        if is_close(player_pos, self.final_pos, self.precision):
+            if not self.arrived:
+                logger.info(f"Finished flow move2D section: {self.name}")
+                self.arrived = True
+            evo_ctrl().set_neutral()
+            return True
+        self.arrived = False
+        if (
+            self.target is None
+            or is_close(player_pos, self.target, self.precision)
+            or dist(player_pos, self.target) > self._OFF_COURSE
+        ):
+            self.target = self._next_target(player_pos)
+        move_to(
+            player=player_pos,
+            target=self.target,
+            precision=self.precision,
+            invert=self.invert,
+        )
+        return False
+
+    def render(self, window: WindowLayout) -> None:
+        super().render(window=window)
+        if self.target is None:
+            return
+        field = self.field
+        mem = self.zelda_mem()
+        center = mem.player.pos
+        window.stats.write_centered(
+            line=8, text=f"Flowing to {self.final_pos} ({field.cost(center):.1f})"
+        )
+        window.stats.addstr(Vec2(1, 9), f" Target X: {self.target.x:.3f}")
+        window.stats.addstr(Vec2(1, 10), f" Target Y: {self.target.y:.3f}")
+        self._print_ch_in_map(map_win=window.map, pos=self.target - center, ch="X")
+        self._print_actors(map_win=window.map)
+
+    def __repr__(self) -> str:
+        return f"{self.name}: flowing to {self.final_pos}"
+
+
 # Mash confirm while moving along a path (to get past talk triggers)
 class SeqMove2DConfirm(SeqMove2D):
     def __init__(
@@ -1,11 +1,20 @@
 from engine.pathing.astar import AStar
 from engine.pathing.base import Pathing
+from engine.pathing.cache import PathCache
+from engine.pathing.flowfield import FlowField, FlowFieldCache
+from engine.pathing.grid import PassabilityGrid
+from engine.pathing.jps import JPS
 from engine.pathing.navmesh import NavMesh
 from engine.pathing.tilemap import TileMap
 
 __all__ = [
     "AStar",
+    "FlowField",
+    "FlowFieldCache",
+    "JPS",
     "NavMesh",
+    "PassabilityGrid",
+    "PathCache",
     "Pathing",
     "TileMap",
 ]
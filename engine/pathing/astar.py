@@ -1,9 +1,49 @@
+from typing import Optional
+
 from engine.mathlib import Vec2
 from engine.pathing.base import Pathing
+from engine.pathing.flowfield import FlowField, FlowFieldCache
+from engine.pathing.grid import PassabilityGrid
+from engine.pathing.smoothing import smooth_path
 
 
 # f(n) = g(n) + h(n)
 class AStar(Pathing):
+    def __init__(
+        self, map_nodes: PassabilityGrid | list[Vec2], smooth: bool = False
+    ) -> None:
+        # Traversable tiles, packed in a grid for constant time lookups
+        if not isinstance(map_nodes, PassabilityGrid):
+            map_nodes = PassabilityGrid.from_nodes(map_nodes)
+        super().__init__(map_nodes=map_nodes)
+        # Skip the waypoints in line of sight (free move only)
+        self.smooth = smooth
+        self.flow_fields = FlowFieldCache(map_nodes)
+
+    def flow_field(self, goal: Vec2, free_move: bool = True) -> FlowField:
+        """Next move towards goal from anywhere on the map, built on first use."""
+        return self.flow_fields.get(goal, free_move)
+
+    def search(
+        self,
+        start: Vec2,
+        goal: Vec2,
+        final_pos: Optional[Vec2] = None,
+        free_move: bool = True,
+    ) -> list[Vec2]:
+        if not free_move:
+            return super().search(start, goal, final_pos, free_move)
+        path = self._tiles(start, goal)
+        if self.smooth:
+            path = smooth_path(self.map, start, path)
+        if final_pos:
+            path.append(final_pos)
+        return path
+
+    # Free move path, one waypoint per tile
+    def _tiles(self, start: Vec2, goal: Vec2) -> list[Vec2]:
+        return super().search(start, goal, None, True)
+
     def _neighbors(
         self, node: Pathing.Node, goal: Vec2, free_move: bool
     ) -> list[Pathing.Node]:
@@ -1,6 +1,9 @@
+import heapq
+import itertools
 from typing import Optional
 
 from engine.mathlib import Vec2, dist
+from engine.pathing.cache import PathCache
 
 
 # f(n) = g(n) + h(n)
@@ -41,6 +44,8 @@ class Pathing:
 
     def __init__(self, map_nodes: list[Vec2]) -> None:
         self.map = map_nodes
+        # Optional on-disk cache of calculated paths
+        self.cache: Optional[PathCache] = None
 
     def calculate(
         self,
@@ -49,32 +54,45 @@ class Pathing:
         final_pos: Optional[Vec2] = None,
         free_move: bool = True,
     ) -> list[Vec2]:
-        open_list = [Pathing.Node(start, goal)]
-        closed_list: list[Pathing.Node] = []
-        while open_list:
-            open_list.sort()
-            node = open_list.pop()
+        if self.cache is not None:
+            return self.cache.calculate(self.search, start, goal, final_pos, free_move)
+        return self.search(start, goal, final_pos, free_move)
+
+    # Uncached search
+    def search(
+        self,
+        start: Vec2,
+        goal: Vec2,
+        final_pos: Optional[Vec2] = None,
+        free_move: bool = True,
+    ) -> list[Vec2]:
+        # Heap ordered on the least f. Ties go to the most recently added node
+        counter = itertools.count(1)
+        start_node = Pathing.Node(start, goal)
+        open_heap = [(start_node.f, 0, start_node)]
+        # Every node seen (open or closed), by tile. Both kinds are updated the same
+        # way, so the tile alone tells if a neighbor is new
+        nodes: dict[Vec2, Pathing.Node] = {start: start_node}
+        while open_heap:
+            _, _, node = heapq.heappop(open_heap)
             if node.pos == goal:
                 return node.trace_path(final_pos)
-            # else (goal not reached), add to closed_list list and elaborate
-            closed_list.append(node)
+            # else (goal not reached), elaborate
             for neighbor in self._neighbors(node, goal, free_move):
-                if neighbor in closed_list:
-                    self._update_node(node, neighbor, closed_list)
-                elif neighbor in open_list:
-                    self._update_node(node, neighbor, open_list)
+                known = nodes.get(neighbor.pos)
+                if known is None:
+                    nodes[neighbor.pos] = neighbor
+                    heapq.heappush(open_heap, (neighbor.f, -next(counter), neighbor))
                 else:
-                    open_list.append(neighbor)
+                    # Closed or open, only the cost and parent are updated
+                    self._update_node(node, neighbor, known)
         raise ValueError  # No path could be found between start and goal
 
     # OVERRIDE
     def _neighbors(self, node: Node, goal: Vec2, free_move: bool) -> list[Node]:
         return []
 
-    def _update_node(
-        self, cur_node: Node, neighbor: Node, node_list: list[Node]
-    ) -> None:
-        n_idx = node_list.index(neighbor)
-        if neighbor.cost < node_list[n_idx].cost:
-            node_list[n_idx].cost = neighbor.cost
-            node_list[n_idx].parent = cur_node
+    def _update_node(self, cur_node: Node, neighbor: Node, known: Node) -> None:
+        if neighbor.cost < known.cost:
+            known.cost = neighbor.cost
+            known.parent = cur_node
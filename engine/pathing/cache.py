@@ -0,0 +1,143 @@
+"""
+On-disk cache of calculated paths. Paths are filled in at first use, stale paths can
+be recalculated ahead of time with engine/pathing/prebuild.py
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Optional
+
+from engine.mathlib import Vec2
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join("cache", "paths")
+# Files that make up a map. Any change in them invalidates the cached paths
+_MAP_EXTENSIONS = [".yaml", ".png", ".tmx"]
+# Bump when the search returns different paths for the same map (2: smoothed paths,
+# 3: least cost JPS paths, 4: smoothing off by default)
+_SEARCH_VERSION = 4
+
+# search(start, goal, final_pos, free_move)
+Search = Callable[[Vec2, Vec2, Optional[Vec2], bool], list[Vec2]]
+
+
+def map_hash(filename: str) -> str:
+    stem = os.path.splitext(filename)[0]
+    digest = hashlib.sha1(f"v{_SEARCH_VERSION}".encode())
+    for ext in _MAP_EXTENSIONS:
+        if os.path.exists(f"{stem}{ext}"):
+            with open(f"{stem}{ext}", mode="rb") as map_file:
+                digest.update(ext.encode())
+                digest.update(map_file.read())
+    return digest.hexdigest()
+
+
+class PathCache:
+    """
+    Paths of one map, keyed by (start, goal, free_move, final_pos). The file stores the
+    hash of the map files and the search used ("astar", "jps", "navmesh"). On mismatch
+    the paths are dropped, but the queries are kept so the prebuild step knows what to
+    calculate. Without a search, the stored one is used.
+    """
+
+    def __init__(
+        self, filename: str, cache_dir: str = CACHE_DIR, search: Optional[str] = None
+    ) -> None:
+        self.filename = filename
+        name = os.path.splitext(os.path.basename(filename))[0]
+        self.path = os.path.join(cache_dir, f"{name}.json")
+        self.hash = map_hash(filename)
+        self.search = search
+        self.entries: dict[str, dict] = {}
+        self._load()
+        if self.search is None:
+            self.search = "astar"
+
+    @staticmethod
+    def _key(
+        start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> str:
+        final = f"{final_pos.x},{final_pos.y}" if final_pos else "-"
+        return f"{start.x},{start.y}:{goal.x},{goal.y}:{final}:{int(free_move)}"
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, mode="r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        self.entries = data.get("paths", {})
+        stored_search = data.get("search", "astar")
+        if self.search is None:
+            self.search = stored_search
+        if data.get("hash") != self.hash or stored_search != self.search:
+            logger.info(f"Map {self.filename} changed, dropping cached paths")
+            for entry in self.entries.values():
+                entry["path"] = None
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, mode="w") as cache_file:
+            json.dump(
+                {"hash": self.hash, "search": self.search, "paths": self.entries},
+                cache_file,
+            )
+        os.replace(tmp_path, self.path)
+
+    def _store(
+        self,
+        search: Search,
+        start: Vec2,
+        goal: Vec2,
+        final_pos: Optional[Vec2],
+        free_move: bool,
+    ) -> list[Vec2]:
+        path = search(start, goal, final_pos, free_move)
+        self.entries[self._key(start, goal, final_pos, free_move)] = {
+            "start": start,
+            "goal": goal,
+            "final_pos": final_pos,
+            "free_move": free_move,
+            "path": list(path),
+        }
+        return path
+
+    def calculate(
+        self,
+        search: Search,
+        start: Vec2,
+        goal: Vec2,
+        final_pos: Optional[Vec2] = None,
+        free_move: bool = True,
+    ) -> list[Vec2]:
+        entry = self.entries.get(self._key(start, goal, final_pos, free_move))
+        if entry is not None and entry["path"] is not None:
+            return [Vec2(*pos) for pos in entry["path"]]
+        path = self._store(search, start, goal, final_pos, free_move)
+        self.save()
+        return path
+
+    def rebuild(self, search: Search) -> int:
+        """Recalculate the stale paths. Returns the number of paths calculated."""
+        stale = [
+            (key, entry) for key, entry in self.entries.items() if entry["path"] is None
+        ]
+        for key, entry in stale:
+            final_pos = entry["final_pos"]
+            try:
+                self._store(
+                    search,
+                    start=Vec2(*entry["start"]),
+                    goal=Vec2(*entry["goal"]),
+                    final_pos=Vec2(*final_pos) if final_pos else None,
+                    free_move=entry["free_move"],
+                )
+            except ValueError:
+                # Not reachable anymore on the new map, forget about it
+                logger.warning(f"{self.filename}: no path for {key}")
+                del self.entries[key]
+        self.save()
+        return len(stale)
@@ -0,0 +1,157 @@
+"""
+Flow fields: one Dijkstra pass from a goal over the whole map, storing the direction
+to the next tile of a shortest path for every tile (one byte each). Any position then
+gets its next move in constant time, so a section can be knocked off course and keep
+going without searching again. The moves are the same as AStar (diagonals only when
+both sides are free), so the costs match its paths.
+"""
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from engine.mathlib import Vec2
+from engine.pathing.grid import PassabilityGrid
+
+# Direction codes, index into _STEPS
+_GOAL = 0
+_UNREACHABLE = 0xFF
+_STEPS = [
+    (0, 0),
+    # Adjacent
+    (0, -1),
+    (1, 0),
+    (0, 1),
+    (-1, 0),
+    # Diagonals
+    (-1, -1),
+    (1, -1),
+    (1, 1),
+    (-1, 1),
+]
+_OPPOSITE = [_STEPS.index((-dx, -dy)) for dx, dy in _STEPS]
+_DIAGONAL_COST = 1.4  # As AStar
+
+
+def tile_of(pos: Vec2) -> Vec2:
+    """Tile the position stands on (tiles are centered on whole coordinates)."""
+    return Vec2(math.floor(pos[0] + 0.5), math.floor(pos[1] + 0.5))
+
+
+class FlowField:
+    def __init__(
+        self, grid: PassabilityGrid, goal: Vec2, free_move: bool = True
+    ) -> None:
+        self.grid = grid
+        self.goal = tile_of(goal)
+        self.free_move = free_move
+        size = grid.width * grid.height
+        self.directions = bytearray([_UNREACHABLE]) * size
+        self.costs = array("f", [math.inf]) * size
+        self._build()
+
+    def _build(self) -> None:
+        grid, width, height = self.grid, self.grid.width, self.grid.height
+        cells = grid.cells
+        start = grid._index(self.goal)
+        if start < 0 or not cells[start]:
+            raise ValueError(f"Goal {self.goal} is not traversable")
+        steps = range(1, len(_STEPS) if self.free_move else 5)
+        # Exact costs while searching, the array only keeps floats
+        costs = {start: 0.0}
+        self.directions[start] = _GOAL
+        heap = [(0.0, start)]
+        while heap:
+            cost, index = heapq.heappop(heap)
+            if cost > costs[index]:
+                continue
+            self.costs[index] = cost
+            x, y = index % width, index // width
+            for step in steps:
+                dx, dy = _STEPS[step]
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if not cells[neighbor]:
+                    continue
+                if dx and dy:
+                    # Don't cut corners, both sides must be free
+                    if not (cells[y * width + nx] and cells[ny * width + x]):
+                        continue
+                    new_cost = cost + _DIAGONAL_COST
+                else:
+                    new_cost = cost + 1
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    # From the neighbor, step back towards this tile
+                    self.directions[neighbor] = _OPPOSITE[step]
+                    heapq.heappush(heap, (new_cost, neighbor))
+
+    def _direction(self, tile: Vec2) -> int:
+        index = self.grid._index(tile)
+        return _UNREACHABLE if index < 0 else self.directions[index]
+
+    def reachable(self, pos: Vec2) -> bool:
+        return self._direction(tile_of(pos)) != _UNREACHABLE
+
+    def cost(self, pos: Vec2) -> float:
+        """Path cost to the goal from the tile of pos, inf if it can't be reached."""
+        index = self.grid._index(tile_of(pos))
+        return math.inf if index < 0 else self.costs[index]
+
+    def next_tile(self, pos: Vec2) -> Optional[Vec2]:
+        """
+        Next tile to walk to from pos, the goal once on it. Off the field (pushed into
+        a wall), the closest reachable tile around. None if there is none.
+        """
+        tile = tile_of(pos)
+        direction = self._direction(tile)
+        if direction == _UNREACHABLE:
+            around = [
+                tile + Vec2(dx, dy)
+                for dx, dy in _STEPS[1:]
+                if self._direction(tile + Vec2(dx, dy)) != _UNREACHABLE
+            ]
+            return min(around, key=lambda other: (other - pos).norm, default=None)
+        dx, dy = _STEPS[direction]
+        return tile + Vec2(dx, dy)
+
+    def path(self, start: Vec2, final_pos: Optional[Vec2] = None) -> list[Vec2]:
+        """Tiles from start to the goal, like Pathing.calculate."""
+        tile = tile_of(start)
+        if not self.reachable(tile):
+            raise ValueError  # No path could be found between start and goal
+        ret = []
+        while (direction := self._direction(tile)) != _GOAL:
+            dx, dy = _STEPS[direction]
+            tile = tile + Vec2(dx, dy)
+            ret.append(tile)
+        if final_pos:
+            ret.append(final_pos)
+        return ret
+
+
+class FlowFieldCache:
+    """The last `size` flow fields of a map, by (goal, free_move)."""
+
+    def __init__(self, grid: PassabilityGrid, size: int = 8) -> None:
+        self.grid = grid
+        self.size = size
+        self._fields: OrderedDict[tuple[Vec2, bool], FlowField] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def get(self, goal: Vec2, free_move: bool = True) -> FlowField:
+        key = (tile_of(goal), free_move)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            return field
+        field = FlowField(self.grid, goal, free_move)
+        self._fields[key] = field
+        if len(self._fields) > self.size:
+            self._fields.popitem(last=False)
+        return field
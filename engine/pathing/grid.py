@@ -0,0 +1,79 @@
+from typing import Iterator
+
+from engine.mathlib import Vec2
+
+
+class PassabilityGrid:
+    """
+    Traversable tiles packed in a bytearray (one byte per tile), indexed by
+    (x - origin.x, y - origin.y). Acts like the list of traversable Vec2 it replaces:
+    supports `in` (constant time), iteration in row order and len().
+    """
+
+    def __init__(self, origin: Vec2, width: int, height: int) -> None:
+        self.origin = origin
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+        self._count = 0
+
+    @classmethod
+    def from_nodes(cls, nodes: list[Vec2]) -> "PassabilityGrid":
+        if not nodes:
+            return cls(Vec2(0, 0), 0, 0)
+        min_x, min_y = min(node.x for node in nodes), min(node.y for node in nodes)
+        max_x, max_y = max(node.x for node in nodes), max(node.y for node in nodes)
+        grid = cls(Vec2(min_x, min_y), max_x - min_x + 1, max_y - min_y + 1)
+        for node in nodes:
+            grid.add(node)
+        return grid
+
+    @classmethod
+    def from_cells(
+        cls, origin: Vec2, width: int, height: int, cells: bytes
+    ) -> "PassabilityGrid":
+        """Wrap packed cells (row order, 1 for traversable)."""
+        assert len(cells) == width * height
+        grid = cls(origin, width, height)
+        grid.cells[:] = cells
+        grid._count = len(cells) - cells.count(0)
+        return grid
+
+    def _index(self, pos: Vec2) -> int:
+        x, y = pos[0] - self.origin.x, pos[1] - self.origin.y
+        # Only whole tiles inside the grid
+        if x % 1 or y % 1 or not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        return int(y) * self.width + int(x)
+
+    def add(self, pos: Vec2) -> None:
+        index = self._index(pos)
+        if index < 0:
+            raise IndexError(f"{pos} is outside of the grid")
+        if not self.cells[index]:
+            self.cells[index] = 1
+            self._count += 1
+
+    def __contains__(self, pos: object) -> bool:
+        index = self._index(pos)
+        return index >= 0 and self.cells[index] != 0
+
+    def free(self, x: int, y: int) -> bool:
+        """Like `in`, for whole tile coordinates (skips the checks)."""
+        x, y = int(x - self.origin.x), int(y - self.origin.y)
+        return (
+            0 <= x < self.width
+            and 0 <= y < self.height
+            and self.cells[y * self.width + x] != 0
+        )
+
+    def __iter__(self) -> Iterator[Vec2]:
+        for index, cell in enumerate(self.cells):
+            if cell:
+                yield Vec2(
+                    self.origin.x + index % self.width,
+                    self.origin.y + index // self.width,
+                )
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,140 @@
+import heapq
+import itertools
+from typing import Optional
+
+from engine.mathlib import Vec2
+from engine.pathing.astar import AStar
+from engine.pathing.base import Pathing
+
+_DIAGONAL_COST = 1.4  # As AStar
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def _octile(dx: int, dy: int) -> float:
+    dx, dy = abs(dx), abs(dy)
+    return _DIAGONAL_COST * min(dx, dy) + abs(dx - dy)
+
+
+def _fill(start: Vec2, jump_points: list[Vec2]) -> list[Vec2]:
+    # Straight and diagonal runs between jump points, back to one tile per waypoint
+    ret = []
+    cur = start
+    for point in jump_points:
+        step = Vec2(_sign(point.x - cur.x), _sign(point.y - cur.y))
+        while cur != point:
+            cur = cur + step
+            ret.append(cur)
+    return ret
+
+
+# Jump Point Search: same moves and costs as AStar (diagonals only when both sides are
+# free), but straight and diagonal runs are skipped over until a tile where the path
+# could turn. Only those tiles are expanded. The free move paths have the least cost
+class JPS(AStar):
+    class Node(Pathing.Node):
+        # Octile distance with the diagonal cost, never more than the cost left. The
+        # straight distance overestimates diagonals (1.41 > 1.4)
+        def _heuristic(self, a: Vec2, b: Vec2) -> float:
+            return _octile(a[0] - b[0], a[1] - b[1])
+
+    def _tiles(self, start: Vec2, goal: Vec2) -> list[Vec2]:
+        return _fill(start, self._jump_points(start, goal))
+
+    def _jump_points(self, start: Vec2, goal: Vec2) -> list[Vec2]:
+        # Pathing.search keeps a node in place on the heap when a cheaper path to it
+        # is found, which can close the goal on a longer path. Push it again instead,
+        # the entries left behind are skipped
+        counter = itertools.count(1)
+        start_node = self.Node(start, goal)
+        open_heap = [(start_node.f, 0, start_node)]
+        best: dict[Vec2, Pathing.Node] = {start: start_node}
+        closed: set[Vec2] = set()
+        while open_heap:
+            _, _, node = heapq.heappop(open_heap)
+            if node.pos in closed:
+                continue
+            if node.pos == goal:
+                return node.trace_path()
+            closed.add(node.pos)
+            for neighbor in self._neighbors(node, goal, True):
+                if neighbor.pos in closed:
+                    continue
+                known = best.get(neighbor.pos)
+                if known is None or neighbor.cost < known.cost:
+                    best[neighbor.pos] = neighbor
+                    heapq.heappush(open_heap, (neighbor.f, -next(counter), neighbor))
+        raise ValueError  # No path could be found between start and goal
+
+    def _jump(
+        self, x: int, y: int, dx: int, dy: int, goal: Vec2
+    ) -> Optional[tuple[int, int]]:
+        """First jump point stepping from (x, y) in direction (dx, dy)."""
+        free = self.map.free
+        while True:
+            # Diagonals need both sides free
+            if dx and dy and not (free(x + dx, y) and free(x, y + dy)):
+                return None
+            x, y = x + dx, y + dy
+            if not free(x, y):
+                return None
+            if x == goal.x and y == goal.y:
+                return x, y
+            if dx and dy:
+                # Diagonal, stop where a straight run finds something
+                if self._jump(x, y, dx, 0, goal) or self._jump(x, y, 0, dy, goal):
+                    return x, y
+            elif dx:
+                # A side opens up that the tile behind couldn't reach
+                if (free(x, y - 1) and not free(x - dx, y - 1)) or (
+                    free(x, y + 1) and not free(x - dx, y + 1)
+                ):
+                    return x, y
+            elif (free(x - 1, y) and not free(x - 1, y - dy)) or (
+                free(x + 1, y) and not free(x + 1, y - dy)
+            ):
+                return x, y
+
+    def _directions(self, node: Pathing.Node) -> list[tuple[int, int]]:
+        free = self.map.free
+        x, y = node.pos
+        if node.parent is None:
+            # Start, every move AStar allows
+            return [
+                (dx, dy)
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                if (dx or dy)
+                and free(x + dx, y + dy)
+                and (not (dx and dy) or (free(x + dx, y) and free(x, y + dy)))
+            ]
+        dx = _sign(x - node.parent.pos.x)
+        dy = _sign(y - node.parent.pos.y)
+        if dx and dy:
+            # Diagonal: keep going, or straight along either side
+            return [(dx, dy), (dx, 0), (0, dy)]
+        ret = [(dx, dy)]
+        # Straight: turn towards the sides blocked behind
+        for side in (-1, 1):
+            if dx and free(x, y + side) and not free(x - dx, y + side):
+                ret += [(0, side), (dx, side)]
+            if dy and free(x + side, y) and not free(x + side, y - dy):
+                ret += [(side, 0), (side, dy)]
+        return ret
+
+    def _neighbors(
+        self, node: Pathing.Node, goal: Vec2, free_move: bool
+    ) -> list[Pathing.Node]:
+        if not free_move:
+            return super()._neighbors(node, goal, free_move)
+        x, y = node.pos
+        ret = []
+        for dx, dy in self._directions(node):
+            point = self._jump(x, y, dx, dy, goal)
+            if point is None:
+                continue
+            cost = node.cost + _octile(point[0] - x, point[1] - y)
+            ret.append(self.Node(Vec2(*point), goal=goal, cost=cost, parent=node))
+        return ret
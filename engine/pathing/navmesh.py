@@ -10,11 +10,16 @@ class NavMesh(Pathing):
         super().__init__(map_nodes=map_nodes)
         self.edges = edges
         assert len(map_nodes) == len(edges)
+        # Node index by position (first one, like list.index)
+        self._index: dict[Vec2, int] = {}
+        for i, pos in enumerate(map_nodes):
+            self._index.setdefault(pos, i)
 
     def _neighbors(
         self, node: Pathing.Node, goal: Vec2, free_move: bool = False
     ) -> list[Pathing.Node]:
-        index = self.map.index(node.pos)
+        if (index := self._index.get(node.pos)) is None:
+            raise ValueError(f"{node.pos} is not a navmesh node")
         ret = []
         for node_idx in self.edges[index]:
             target = self.map[node_idx]
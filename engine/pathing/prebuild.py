@@ -0,0 +1,37 @@
+"""
+Recalculate every cached path that went stale because its map changed.
+Paths are recorded in the cache the first time the TAS asks for them.
+
+Run from the repo root: python -m engine.pathing.prebuild [maps/evo1/overworld.yaml ...]
+"""
+import glob
+import sys
+
+from engine.pathing import JPS, AStar, NavMesh, PathCache, Pathing, TileMap
+
+
+def create_nav(tilemap: TileMap, search: str) -> Pathing:
+    # Same as the NavMap classes of maps/evo1/maps.py
+    match search:
+        case "navmesh":
+            return NavMesh(map_nodes=tilemap.nav_nodes, edges=tilemap.nav_edges)
+        case "jps":
+            return JPS(tilemap.map, smooth=tilemap.smooth_paths)
+    return AStar(tilemap.map, smooth=tilemap.smooth_paths)
+
+
+def prebuild(filenames: list[str]) -> None:
+    for filename in filenames:
+        tilemap = TileMap(filename=filename)
+        # The cache remembers the search used by the TAS. Maps with a nav graph
+        # always use NavMesh
+        cache = PathCache(filename)
+        if tilemap.nav_nodes:
+            cache.search = "navmesh"
+        nav = create_nav(tilemap, cache.search)
+        count = cache.rebuild(nav.search)
+        print(f"{filename}: {count} paths calculated, {len(cache.entries)} cached")
+
+
+if __name__ == "__main__":
+    prebuild(sys.argv[1:] or sorted(glob.glob("maps/evo1/*.yaml")))
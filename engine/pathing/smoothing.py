@@ -0,0 +1,88 @@
+"""
+Any-angle smoothing of grid paths (string pulling). From each waypoint, skip ahead to
+the furthest one still in line of sight, so straight runs and open areas collapse into
+a few waypoints. Line of sight is a raycast over the passability grid, visiting every
+tile the segment touches. Going exactly through a corner needs both sides free, the
+same rule AStar uses for diagonals.
+"""
+import math
+
+from engine.mathlib import Vec2
+from engine.pathing.grid import PassabilityGrid
+
+# Half the width of the player, kept clear of walls on both sides of a segment. An
+# estimate, not measured in game
+CLEARANCE = 0.4
+_EPSILON = 1e-9
+
+
+def raycast(grid: PassabilityGrid, a: Vec2, b: Vec2) -> bool:
+    """True if every tile touched by the segment from a to b is traversable."""
+    # Tiles are centered on whole coordinates, shift them to [i, i + 1)
+    x0, y0, x1, y1 = a[0] + 0.5, a[1] + 0.5, b[0] + 0.5, b[1] + 0.5
+    x, y = math.floor(x0), math.floor(y0)
+    end_x, end_y = math.floor(x1), math.floor(y1)
+    if not grid.free(x, y):
+        return False
+    dx, dy = x1 - x0, y1 - y0
+    step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+    # Distance along the segment (0 to 1) to the next vertical and horizontal edge
+    t_delta_x = abs(1 / dx) if dx else math.inf
+    t_delta_y = abs(1 / dy) if dy else math.inf
+    t_max_x = ((x + (dx > 0)) - x0) / dx if dx else math.inf
+    t_max_y = ((y + (dy > 0)) - y0) / dy if dy else math.inf
+    left = abs(end_x - x) + abs(end_y - y)
+    while left > 0:
+        if abs(t_max_x - t_max_y) < _EPSILON:
+            # Through a corner
+            if not (grid.free(x + step_x, y) and grid.free(x, y + step_y)):
+                return False
+            x, y = x + step_x, y + step_y
+            t_max_x += t_delta_x
+            t_max_y += t_delta_y
+            left -= 2
+        elif t_max_x < t_max_y:
+            x += step_x
+            t_max_x += t_delta_x
+            left -= 1
+        else:
+            y += step_y
+            t_max_y += t_delta_y
+            left -= 1
+        if not grid.free(x, y):
+            return False
+    return True
+
+
+def line_of_sight(
+    grid: PassabilityGrid, a: Vec2, b: Vec2, clearance: float = CLEARANCE
+) -> bool:
+    """Raycast along the segment, and along both of its sides at clearance."""
+    if not raycast(grid, a, b):
+        return False
+    length = math.hypot(b[0] - a[0], b[1] - a[1])
+    if clearance <= 0 or length == 0:
+        return True
+    side = Vec2(a[1] - b[1], b[0] - a[0]) * (clearance / length)
+    return raycast(grid, a + side, b + side) and raycast(grid, a - side, b - side)
+
+
+def smooth_path(
+    grid: PassabilityGrid, start: Vec2, path: list[Vec2], clearance: float = CLEARANCE
+) -> list[Vec2]:
+    """
+    Path from start (excluded, as in Pathing.calculate) with the waypoints in line of
+    sight skipped.
+    """
+    points = [start] + path
+    ret = []
+    anchor = 0
+    while anchor < len(points) - 1:
+        furthest = anchor + 1
+        while furthest + 1 < len(points) and line_of_sight(
+            grid, points[anchor], points[furthest + 1], clearance
+        ):
+            furthest += 1
+        ret.append(points[furthest])
+        anchor = furthest
+    return ret
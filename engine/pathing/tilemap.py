@@ -2,11 +2,13 @@ import logging
 import os
 from enum import Enum
 
+import numpy as np
 import tmx
 import yaml
 from PIL import Image
 
 from engine.mathlib import Vec2
+from engine.pathing.grid import PassabilityGrid
 
 try:
     from yaml import CLoader as Loader
@@ -23,8 +25,8 @@ class TileMap:
         self.type = map_data.get("type", "ascii")
         origin_vec = map_data.get("origin", [0, 0])
         self.origin = Vec2(origin_vec[0], origin_vec[1])
-        # Map consists of a list of traversible nodes. Nodes are connected NWSE
-        self.map = []  # Map, as a set of Vec2 nodes
+        # Map consists of a grid of traversible nodes. Nodes are connected NWSE
+        self.map = PassabilityGrid(self.origin, 0, 0)
         match self.type:
             case "ascii":
                 self._load_ascii(map_data=map_data)
@@ -35,25 +37,30 @@ class TileMap:
                 tmx_filename = f"{os.path.splitext(filename)[0]}.tmx"
                 self._load_tmx(filename=tmx_filename, map_data=map_data)
         # NavMesh graph nodes
-        nodes = map_data.get("nodes", [])
-        self.nav_nodes = [Vec2(x=node[0], y=node[1]) for node in nodes]
+        self.nav_nodes = self._nav_nodes(map_data)
         self.nav_edges = map_data.get("edges", [])
+        # Any-angle paths on the grid, opt-in per map (smooth_paths: true) until its
+        # route is verified in game. Otherwise one waypoint per tile
+        self.smooth_paths = map_data.get("smooth_paths", False)
 
     def _load_ascii(self, map_data: dict) -> None:
         # ascii representation of map, as array of strings
         self.tiles = map_data.get("tiles", [])
+        width = max((len(line) for line in self.tiles), default=0)
+        self.map = PassabilityGrid(self.origin, width, len(self.tiles))
         for i, line in enumerate(self.tiles):
             y_pos = i + self.origin.y
             for j, tile in enumerate(line):
                 if tile == ".":
                     x_pos = j + self.origin.x
-                    self.map.append(Vec2(x_pos, y_pos))
+                    self.map.add(Vec2(x_pos, y_pos))
 
     def _load_tmx(self, filename: str, map_data: dict) -> None:
         # self.map.append()
         tilemap: tmx.TileMap = tmx.TileMap.load(fname=filename)
         width, height = tilemap.width, tilemap.height
         self.tiles = ["" for _ in range(height)]
+        self.map = PassabilityGrid(Vec2(0, 0), width, height)
         logger.debug(f"Map bitmap {filename} dims: {width} x {height}")
         layer: tmx.Layer
         for layer in tilemap.layers_list:
@@ -65,7 +72,7 @@ class TileMap:
                 wall = tile.gid != 0
                 self.tiles[y_pos] += "#" if wall else "."
                 if not wall:
-                    self.map.append(Vec2(x_pos, y_pos))
+                    self.map.add(Vec2(x_pos, y_pos))
 
     class BitmapTile(Enum):
         # Impassable terrain
@@ -152,12 +159,6 @@ class TileMap:
         # Default: '.'
     }
 
-    def _get_rgb_hex(self, pixel: list[int]) -> int:
-        red = int(pixel[0]) & 0xFF
-        green = int(pixel[1]) & 0xFF
-        blue = int(pixel[2]) & 0xFF
-        return (red << 16) | (green << 8) | blue
-
     def _is_passable(self, tile: BitmapTile, trees_passable: bool) -> bool:
         match tile:
             case self.BitmapTile.EMPTY | self.BitmapTile.EMPTY_DUNGEON | self.BitmapTile.DEAD_TREE | self.BitmapTile.WALLS | self.BitmapTile.WATER | self.BitmapTile.RIVER | self.BitmapTile.WATER_DUNGEON | self.BitmapTile.ROCKS | self.BitmapTile.DARK_ROCKS | self.BitmapTile.MOUNTAIN | self.BitmapTile.CACTI | self.BitmapTile.BUSH | self.BitmapTile.POT | self.BitmapTile.LAVA | self.BitmapTile.LAVA_TRAP | self.BitmapTile.PITFALL | self.BitmapTile.PITFALL2 | self.BitmapTile.STATUE | self.BitmapTile.WIND_TRAP:
@@ -167,26 +168,39 @@ class TileMap:
         return True
 
     def _load_bitmap(self, filename: str, map_data: dict) -> None:
-        self.tiles = []
         trees_passable = map_data.get("trees_passable", False)
         bitmap = Image.open(filename)
         if bitmap.mode != "RGB":
             bitmap = bitmap.convert("RGB")
         width, height = bitmap.size[0], bitmap.size[1]
         logger.debug(f"Map bitmap {filename} dims: {width} x {height}")
-        for y_pos in range(height):
-            self.tiles.append("")  # Append new empty line
-            for x_pos in range(width):
-                coord = x_pos, y_pos
-                rgb = self._get_rgb_hex(bitmap.getpixel(coord))
-                tile = self.BitmapTile(rgb)
-                # Fill out ascii tile
-                self.tiles[y_pos] += self.TileToAscii.get(tile, ".")
-                # Add passable nodes to AStar map
-                if self._is_passable(tile, trees_passable):
-                    self.map.append(Vec2(x_pos, y_pos))
-
-    def _open(self, filename: str) -> dict:
+        pixels = np.asarray(bitmap, dtype=np.uint32)
+        rgb = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+        # Classify each distinct color once, then look up every pixel in bulk
+        colors, color_idx = np.unique(rgb, return_inverse=True)
+        tiles = [self.BitmapTile(int(color)) for color in colors]
+        ascii_lut = np.array([self.TileToAscii.get(tile, ".") for tile in tiles])
+        passable_lut = np.array(
+            [self._is_passable(tile, trees_passable) for tile in tiles], dtype=np.uint8
+        )
+        color_idx = color_idx.reshape(height, width)
+        self.tiles = ["".join(row) for row in ascii_lut[color_idx].tolist()]
+        # Add passable nodes to AStar map
+        self.map = PassabilityGrid.from_cells(
+            Vec2(0, 0), width, height, passable_lut[color_idx].tobytes()
+        )
+
+    @staticmethod
+    def _nav_nodes(map_data: dict) -> list[Vec2]:
+        return [Vec2(x=node[0], y=node[1]) for node in map_data.get("nodes", [])]
+
+    @classmethod
+    def read_nav_nodes(cls, filename: str) -> list[Vec2]:
+        """NavMesh graph nodes of a map file, without loading the map itself."""
+        return cls._nav_nodes(cls._open(filename))
+
+    @staticmethod
+    def _open(filename: str) -> dict:
         # Open the map file and parse the yaml contents
         with open(filename, mode="r") as map_file:
             return yaml.load(map_file, Loader=Loader)
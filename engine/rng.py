@@ -0,0 +1,117 @@
+"""
+HashLink random generator (the twister used by Evoland), vectorized with NumPy for
+long forecasts. No process access, the state comes from EvolandRNG.
+
+Code: https://github.com/HaxeFoundation/hashlink/blob/master/src/std/random.c
+
+Seen as one stream of raw values (the current batch, then the next ones), the
+generator is x[k + 25] = x[k + 7] ^ f(x[k]), with f linear over GF(2). Squaring the
+recurrence cancels the cross terms, so for any level s:
+    x[k + 25 * 2^s] = x[k + 7 * 2^s] ^ f^(2^s)(x[k])
+which computes 18 * 2^s values per step. The forecast climbs the levels as the
+stream grows, f^(2^s) is applied with lookup tables.
+"""
+from functools import cache
+from typing import Sequence
+
+import numpy as np
+
+RNG_VALS = 25
+RNG_MAX = 7
+RNG_MAG01 = [0x0, 0x8EBFD028]
+
+
+def temper(value: int) -> int:
+    """Turns a raw rng value into the output of rand_int."""
+    value ^= (value << 7) & 0x2B5B2500
+    value ^= (value << 15) & 0xDB8B0000
+    return value ^ (value >> 16)
+
+
+def temper_array(values: np.ndarray) -> np.ndarray:
+    values = values ^ ((values << 7) & np.uint32(0x2B5B2500))
+    values ^= (values << 15) & np.uint32(0xDB8B0000)
+    return values ^ (values >> 16)
+
+
+def _twist(value: int) -> int:
+    return (value >> 1) ^ RNG_MAG01[value % 2]
+
+
+# 32x32 bit matrices are stored as their columns (the image of each bit)
+def _apply(columns: list[int], value: int) -> int:
+    ret = 0
+    for bit, column in enumerate(columns):
+        if value >> bit & 1:
+            ret ^= column
+    return ret
+
+
+@cache
+def _jump_columns(level: int) -> list[int]:
+    if level == 0:
+        return [_twist(1 << bit) for bit in range(32)]
+    columns = _jump_columns(level - 1)
+    return [_apply(columns, column) for column in columns]
+
+
+# The input is split in chunks of _TABLE_BITS bits, one lookup table per chunk
+_TABLE_BITS = 11
+_TABLE_MASK = (1 << _TABLE_BITS) - 1
+
+
+@cache
+def _jump_tables(level: int) -> list[np.ndarray]:
+    columns = _jump_columns(level)
+    tables = []
+    for low in range(0, 32, _TABLE_BITS):
+        bits = min(_TABLE_BITS, 32 - low)
+        index = np.arange(1 << bits)
+        table = np.zeros(1 << bits, dtype=np.uint32)
+        for bit in range(bits):
+            table[(index >> bit & 1).astype(bool)] ^= columns[low + bit]
+        tables.append(table)
+    return tables
+
+
+def _jump(level: int, values: np.ndarray) -> np.ndarray:
+    tables = _jump_tables(level)
+    ret = tables[0][values & _TABLE_MASK]
+    for i, table in enumerate(tables[1:], start=1):
+        ret ^= table[(values >> (i * _TABLE_BITS)) & _TABLE_MASK]
+    return ret
+
+
+def raw_stream(values: Sequence[int] | np.ndarray, count: int) -> np.ndarray:
+    """
+    The current batch followed by the next `count` raw values. values has shape
+    (..., 25), several states are generated at once.
+    """
+    values = np.asarray(values, dtype=np.uint32)
+    stream = np.empty(values.shape[:-1] + (RNG_VALS + count,), dtype=np.uint32)
+    stream[..., :RNG_VALS] = values
+    known, level = RNG_VALS, 0
+    while known < stream.shape[-1]:
+        while RNG_VALS << (level + 1) <= known:
+            level += 1
+        lag, mid = RNG_VALS << level, RNG_MAX << level
+        chunk = min(lag - mid, stream.shape[-1] - known)
+        start = known - lag
+        stream[..., known : known + chunk] = stream[
+            ..., start + mid : start + mid + chunk
+        ] ^ _jump(level, stream[..., start : start + chunk])
+        known += chunk
+    return stream
+
+
+def forecast(values: Sequence[int], cursor: int, count: int) -> np.ndarray:
+    """The next `count` outputs of rand_int from a state, without consuming it."""
+    start = min(cursor, RNG_VALS)
+    stream = raw_stream(values, max(start + count - RNG_VALS, 0))
+    return temper_array(stream[..., start : start + count])
+
+
+def forecast_batches(values: Sequence[int] | np.ndarray, batches: int) -> np.ndarray:
+    """Tempered values of the next `batches` batches, shape (..., batches, 25)."""
+    stream = raw_stream(values, batches * RNG_VALS)[..., RNG_VALS:]
+    return temper_array(stream).reshape(stream.shape[:-1] + (batches, RNG_VALS))
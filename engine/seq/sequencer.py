@@ -7,7 +7,8 @@ import time
 from control import evo_ctrl
 from engine.mathlib import Vec2
 from engine.seq.base import SeqBase
-from memory.rng import EvolandRNG
+from memory.core import mem_handle
+from memory.rng import get_rng_memory
 from term.window import WindowLayout
 
 logger = logging.getLogger(__name__)
@@ -88,7 +89,7 @@ class SequencerEngine(object):
 
     def _print_rng(self) -> None:
         with contextlib.suppress(ReferenceError):
-            rng = EvolandRNG().get_rng()
+            rng = get_rng_memory().get_rng()
             rng_str = f"RNG: {rng.cursor:2}"
             self.window.main.addstr(
                 Vec2(self.window.main.size.x - len(rng_str) - 1, 0), rng_str
@@ -120,6 +121,9 @@ class SequencerEngine(object):
 
     # Execute and render TAS progress
     def run(self) -> None:
+        # Start a new memory frame. Everything read from memory during this tick is
+        # snapshotted and shared between execute and render, and expires on next tick
+        mem_handle().next_tick()
         self._handle_input()
         self._update()
         self._render()
@@ -0,0 +1,167 @@
+"""
+Uniform grid over the actors of a tick. Each actor is read once (position and kind)
+and bucketed by kind and by the tile it stands on, so queries only look at the tiles
+they cover, of the kinds they ask for.
+"""
+import math
+from collections import defaultdict
+from typing import Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from engine.mathlib import Box2, Vec2
+
+T = TypeVar("T")
+
+Cell = tuple[int, int]
+# Kind tags of an actor, e.g. (EKind.MONSTER, MKind.SKELETON)
+Tags = tuple[Hashable, ...]
+
+
+class SpatialHash(Generic[T]):
+    """Items bucketed by grid cell."""
+
+    def __init__(self, cell_size: float = 1.0) -> None:
+        self.cell_size = cell_size
+        self._cells: dict[Cell, list[tuple[Vec2, T]]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._cells.values())
+
+    def cell(self, pos: Vec2) -> Cell:
+        return (
+            math.floor(pos.x / self.cell_size),
+            math.floor(pos.y / self.cell_size),
+        )
+
+    def items(self) -> Iterable[tuple[Vec2, T]]:
+        return (found for items in self._cells.values() for found in items)
+
+    def insert(self, pos: Vec2, item: T) -> None:
+        self._cells[self.cell(pos)].append((pos, item))
+
+    def _cells_in(self, top_left: Vec2, bottom_right: Vec2) -> Iterable[list]:
+        x0, y0 = self.cell(top_left)
+        x1, y1 = self.cell(bottom_right)
+        # Fewer cells in use than covered by the box, go through those instead
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            return (
+                items
+                for (x, y), items in self._cells.items()
+                if x0 <= x <= x1 and y0 <= y <= y1
+            )
+        return (
+            self._cells[(x, y)]
+            for x in range(x0, x1 + 1)
+            for y in range(y0, y1 + 1)
+            if (x, y) in self._cells
+        )
+
+    def in_box(self, box: Box2) -> list[tuple[Vec2, T]]:
+        bottom_right = box.br()
+        return [
+            (pos, item)
+            for items in self._cells_in(box.pos, bottom_right)
+            for pos, item in items
+            if box.contains(pos)
+        ]
+
+    def in_radius(self, center: Vec2, radius: float) -> list[tuple[Vec2, T]]:
+        reach = Vec2(radius, radius)
+        radius_sq = radius * radius
+        return [
+            (pos, item)
+            for items in self._cells_in(center - reach, center + reach)
+            for pos, item in items
+            if (pos.x - center.x) ** 2 + (pos.y - center.y) ** 2 <= radius_sq
+        ]
+
+
+def _matches(tags: Tags, kinds: Optional[set]) -> bool:
+    # Enum kinds of different classes can share values, compare the classes too
+    return kinds is None or any((type(tag), tag) in kinds for tag in tags)
+
+
+class ActorIndex(Generic[T]):
+    """
+    Actors of one tick, with one grid per kind tags. Queries can filter on any of the
+    tags, e.g. an EKind for all of them, or an MKind for one kind of monster. They
+    return the actors in the order they were given, as a scan over them would.
+    """
+
+    def __init__(
+        self,
+        actors: Iterable[T],
+        pos_of: Callable[[T], Vec2],
+        tags_of: Optional[Callable[[T], Tags]] = None,
+        cell_size: float = 1.0,
+        skip: tuple[type[Exception], ...] = (),
+    ) -> None:
+        """Actors raising one of the `skip` exceptions when read are left out."""
+        self._grids: dict[Tags, SpatialHash[T]] = {}
+        # Flat x, y positions by kind tags, for packing them into arrays
+        self._coords: dict[Tags, list[float]] = {}
+        self._pos: dict[int, Vec2] = {}
+        self._order: dict[int, int] = {}
+        for actor in actors:
+            try:
+                pos = pos_of(actor)
+                tags = tags_of(actor) if tags_of is not None else ()
+            except skip:
+                continue
+            grid = self._grids.get(tags)
+            if grid is None:
+                grid = self._grids[tags] = SpatialHash(cell_size)
+                self._coords[tags] = []
+            grid.insert(pos, actor)
+            self._coords[tags] += pos
+            self._pos[id(actor)] = pos
+            self._order[id(actor)] = len(self._order)
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def pos(self, actor: T) -> Vec2:
+        """Position read when the index was built."""
+        return self._pos[id(actor)]
+
+    def coords(self) -> Iterable[tuple[Tags, list[float]]]:
+        """Flat x, y positions of the actors by kind tags, in actor order in each."""
+        return self._coords.items()
+
+    def _in_order(self, found: list[tuple[Vec2, T]]) -> list[tuple[Vec2, T]]:
+        # Grids and cells come in any order, put the actors back in theirs
+        if len(found) > 1:
+            found.sort(key=lambda item: self._order[id(item[1])])
+        return found
+
+    def _grids_of(self, kinds: Optional[Iterable[Hashable]]) -> list[SpatialHash[T]]:
+        wanted = None if kinds is None else {(type(kind), kind) for kind in kinds}
+        return [grid for tags, grid in self._grids.items() if _matches(tags, wanted)]
+
+    def in_radius(
+        self,
+        center: Vec2,
+        radius: float,
+        kinds: Optional[Iterable[Hashable]] = None,
+    ) -> list[tuple[Vec2, T]]:
+        """(pos, actor) within radius of center, of any of the kinds (all if None)."""
+        return self._in_order(
+            [
+                found
+                for grid in self._grids_of(kinds)
+                for found in grid.in_radius(center, radius)
+            ]
+        )
+
+    def in_box(
+        self, box: Box2, kinds: Optional[Iterable[Hashable]] = None
+    ) -> list[tuple[Vec2, T]]:
+        """(pos, actor) inside the box, of any of the kinds (all if None)."""
+        return self._in_order(
+            [found for grid in self._grids_of(kinds) for found in grid.in_box(box)]
+        )
+
+    def of_kind(self, kinds: Iterable[Hashable]) -> list[tuple[Vec2, T]]:
+        """(pos, actor) of any of the kinds."""
+        return self._in_order(
+            [found for grid in self._grids_of(kinds) for found in grid.items()]
+        )
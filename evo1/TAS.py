@@ -3,6 +3,7 @@ import contextlib
 import logging
 
 from engine.blackboard import blackboard
+from engine.boids import set_boid_recording
 from engine.game import GameVersion, set_game_version
 from engine.mathlib import Vec2
 from engine.seq import (
@@ -44,7 +45,8 @@ from evo1.route import (
     Sarudnahk,
 )
 from evo1.route.mana_tree import SeqZephyrosObserver
-from memory.evo1 import load_diablo_memory, load_memory, load_zelda_memory
+from maps.evo1 import SetMapPreload
+from memory.evo1 import load_zelda_memory, update_memory
 from term.window import WindowLayout
 
 logger = logging.getLogger("SYSTEM")
@@ -56,10 +58,8 @@ def stop_timer() -> None:
 
 def setup_memory() -> None:
     with contextlib.suppress(ReferenceError):
-        load_memory()
-        load_zelda_memory()
-        # TODO: Optimize this, should only load when relevant
-        load_diablo_memory()
+        # Only loads the game memory, other views are built when first used
+        update_memory()
 
 
 def observer(window: WindowLayout):
@@ -151,6 +151,10 @@ def perform_TAS(window: WindowLayout):
     # Define sequence to run
     saveslot = window.config_data.get("saveslot", 0)
     checkpoint = window.config_data.get("checkpoint", "")
+    # Load the upcoming maps in the background while the route runs
+    SetMapPreload(window.config_data.get("preload_maps", 2))
+    # Keep the Sarudnahk steering inputs for benchmarks/boids.py
+    set_boid_recording(window.config_data.get("record_boids"))
 
     # TODO: More run modes
     logger.info(
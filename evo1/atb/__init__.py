@@ -1,9 +1,33 @@
 from evo1.atb.base import ATBAction, ATBActor, ATBPlan, SeqATBCombat
 from evo1.atb.encounter import Encounter, EncounterID, calc_next_encounter
-from evo1.atb.entity import atb_stats_from_memory
+from evo1.atb.entity import (
+    atb_stats_from_memory,
+    battle_state_from_memory,
+    combatant_from_memory,
+)
 from evo1.atb.farming import FarmingGoal, SeqATBmove2D
+from evo1.atb.manip import (
+    EncounterForecast,
+    Manip,
+    ManipAction,
+    find_manip,
+    get_encounter_forecast,
+    wants,
+)
 from evo1.atb.manual import SeqATBCombatManual
-from evo1.atb.predict import predict_attack
+from evo1.atb.predict import OutcomeWindow, get_outcome_window, predict_attack
+from evo1.atb.schedule import (
+    FarmAction,
+    FarmModel,
+    FarmPlanner,
+    FarmSchedule,
+    FarmStep,
+)
+from evo1.atb.timer import (
+    EncounterPoint,
+    EncounterTimerModel,
+    get_encounter_timer_model,
+)
 
 __all__ = [
     "ATBAction",
@@ -11,11 +35,29 @@ __all__ = [
     "ATBPlan",
     "Encounter",
     "EncounterID",
+    "EncounterForecast",
+    "Manip",
+    "ManipAction",
+    "find_manip",
+    "get_encounter_forecast",
+    "wants",
     "SeqATBmove2D",
     "FarmingGoal",
+    "FarmAction",
+    "FarmModel",
+    "FarmPlanner",
+    "FarmSchedule",
+    "FarmStep",
+    "EncounterPoint",
+    "EncounterTimerModel",
+    "get_encounter_timer_model",
     "calc_next_encounter",
     "predict_attack",
+    "OutcomeWindow",
+    "get_outcome_window",
     "SeqATBCombat",
     "SeqATBCombatManual",
     "atb_stats_from_memory",
+    "battle_state_from_memory",
+    "combatant_from_memory",
 ]
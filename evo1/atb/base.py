@@ -1,15 +1,17 @@
 import contextlib
 import logging
-from enum import Enum, IntEnum, auto
-from typing import NamedTuple, Optional
+from enum import Enum, auto
+from typing import Callable, Optional
 
 from control import evo_ctrl
+from engine.atb import ATBAction, ATBActor, ATBPlan, GaugeTracker, Turn, turn_order
 from engine.mathlib import Vec2
+from engine.menu import menu_steps
 from engine.seq import SeqBase
 from evo1.atb.entity import atb_stats_from_memory
-from evo1.atb.predict import predict_attack
-from memory.evo1 import BattleEntity, BattleMemory
-from memory.rng import EvolandRNG
+from evo1.atb.predict import get_outcome_window
+from memory.evo1 import BattleEntity, BattleMemory, get_battle_memory
+from memory.rng import get_rng_memory
 from term.window import WindowLayout
 
 logger = logging.getLogger(__name__)
@@ -22,36 +24,6 @@ def _tap_confirm() -> None:
     ctrl.confirm(tapping=True)
 
 
-class ATBAction(Enum):
-    ATTACK = auto()
-    POTION = auto()
-    HEAL = auto()
-    X_CRYSTAL = auto()
-    BABAMUT = auto()
-
-
-class ATBActor(IntEnum):
-    CLINK = 0
-    KAERIS = 1
-
-
-class ATBPlan(NamedTuple):
-    cur_actor: ATBActor
-    action: ATBAction
-    target: Optional[ATBActor | int]
-
-    def __repr__(self) -> str:
-        if self.target is not None:
-            target = (
-                f"->{self.target.name}"
-                if isinstance(self.target, ATBActor)
-                else f"->{self.target}"
-            )
-        else:
-            target = ""
-        return f"Plan({self.cur_actor.name}: {self.action.name}{target})"
-
-
 # Handling of the actual battle logic itself (base class, replace with more complex logic)
 class SeqATBCombat(SeqBase):
     # Finite state machine for keeping track of the battle state
@@ -64,16 +36,25 @@ class SeqATBCombat(SeqBase):
         self.mem: BattleMemory = None
         self.state = self._BattleFSM.PRE_BATTLE
         self.cur_plan: Optional[ATBPlan] = None
+        # Upcoming turns, and the plans prepared for the allies among them
+        self.turns: list[Turn] = []
+        self.gauges = GaugeTracker()
+        self.next_plans: dict[ATBActor, ATBPlan] = {}
+        self._plan_inputs: Optional[tuple] = None
         super().__init__(name=name)
 
     def reset(self) -> None:
         self.mem = None
         self.state = self._BattleFSM.PRE_BATTLE
         self.cur_plan: Optional[ATBPlan] = None
+        self.turns = []
+        self.gauges.reset()
+        self.next_plans = {}
+        self._plan_inputs = None
 
     def update_mem(self) -> bool:
-        # Check if we need to create a new ATB battle structure, or update the old one
-        self.mem = BattleMemory()
+        # Battle memory of this tick, only resolved when in battle
+        self.mem = get_battle_memory()
         # Clear unused memory; we need to try to recreate it next frame
         if not self.active:
             self.mem = None
@@ -84,6 +65,66 @@ class SeqATBCombat(SeqBase):
     _SPECIAL_CURSOR_POS = 1
     _ITEM_CURSOR_POS = 2
     _RUN_CURSOR_POS = 3
+    # Entries in the menus, assuming they wrap around (None: no wrapping). Not
+    # verified in game, _navigate goes the other way when a wrap doesn't move
+    _MAIN_MENU_SIZE = 4
+    _SPECIAL_MENU_SIZE = 2
+    _ITEM_MENU_SIZE = None
+    _NAV_ATTEMPTS = 3
+
+    def _main_cursor(self) -> Optional[int]:
+        return self.mem.cursor if self.mem.menu_open else None
+
+    def _spec_cursor(self) -> Optional[int]:
+        # The sub-menu was opened during this tick, find its cursor again
+        self.mem.update_cursors()
+        return self.mem.spec_cursor if self.mem.spec_menu_open else None
+
+    def _navigate(
+        self,
+        target: int,
+        size: Optional[int] = None,
+        read_cursor: Optional[Callable[[], Optional[int]]] = None,
+    ) -> bool:
+        """
+        Move a menu cursor to the target. Without read_cursor, the cursor is assumed to
+        start on the first entry and is tapped down like any menu. Otherwise the fewest
+        inputs are sent as one burst and the cursor is read back, going the long way
+        if wrapping around didn't move it. Before the first burst an unreadable cursor
+        is assumed on the first entry. Returns False if it never landed on the target
+        or the landing couldn't be read back, the caller tries again on the next tick.
+        """
+        ctrl = evo_ctrl()
+        if read_cursor is None:
+            for _ in range(target):
+                ctrl.dpad.tap_down()
+            return True
+        cursor = 0
+        # Cursor and inputs of the last burst
+        sent: Optional[tuple[int, int]] = None
+        for attempt in range(self._NAV_ATTEMPTS + 1):
+            read: Optional[int] = None
+            with contextlib.suppress(ReferenceError):
+                read = read_cursor()
+            if read is not None:
+                cursor = read
+            elif sent is not None:
+                # Landing not read back, don't assume it; tried again next tick
+                logger.debug(f"Menu cursor couldn't be read back after {sent[1]} steps")
+                return False
+            wrapped = sent is not None and sent[1] != target - sent[0]
+            if wrapped and cursor == sent[0] and size is not None:
+                logger.warning(f"Menu of {size} entries didn't wrap around")
+                size = None
+            steps = menu_steps(cursor, target, size)
+            if steps == 0:
+                return True
+            if attempt == self._NAV_ATTEMPTS:
+                break
+            ctrl.dpad.burst(steps)
+            sent = (cursor, steps)
+        logger.warning(f"Menu cursor didn't reach {target}")
+        return False
 
     def _execute_plan(self, plan: ATBPlan) -> bool:
         match plan.action:
@@ -102,65 +143,108 @@ class SeqATBCombat(SeqBase):
                 return self._act_special(option=1)
         return True
 
+    def _select_main(self, pos: int) -> bool:
+        if not self.mem.menu_open:
+            return False
+        return self._navigate(pos, self._MAIN_MENU_SIZE, self._main_cursor)
+
     def _act_attack(self, target: int) -> bool:
         ctrl = evo_ctrl()
-        if self.mem.menu_open:
+        if self._select_main(self._ATTACK_CURSOR_POS):
             ctrl.confirm(tapping=True)
-            for _ in range(target):
-                ctrl.dpad.tap_down()
+            self._navigate(target)
             ctrl.confirm()
             return True
         return False
 
     def _act_special(self, option: int, target: Optional[int] = None) -> bool:
         ctrl = evo_ctrl()
-        if self.mem.menu_open:
-            # Select special sub-menu
-            with contextlib.suppress(ReferenceError):
-                while self.mem.cursor != self._SPECIAL_CURSOR_POS:
-                    ctrl.dpad.tap_down()
+        # Select special sub-menu
+        if self._select_main(self._SPECIAL_CURSOR_POS):
             ctrl.confirm(tapping=True)
             # Select special ability
-            for _ in range(option):
-                ctrl.dpad.tap_down()
+            if not self._navigate(option, self._SPECIAL_MENU_SIZE, self._spec_cursor):
+                # Back to the main menu, try again next tick
+                ctrl.cancel(tapping=True)
+                return False
             if target is not None:
                 ctrl.confirm(tapping=True)
-                for _ in range(target):
-                    ctrl.dpad.tap_down()
+                self._navigate(target)
             ctrl.confirm()
             return True
         return False
 
     def _act_item(self, item_index: int, target: ATBActor) -> bool:
         ctrl = evo_ctrl()
-        if self.mem.menu_open:
-            # Select item sub-menu
-            with contextlib.suppress(ReferenceError):
-                while self.mem.cursor != self._ITEM_CURSOR_POS:
-                    ctrl.dpad.tap_down()
+        # Select item sub-menu
+        if self._select_main(self._ITEM_CURSOR_POS):
             ctrl.confirm(tapping=True)
-            # Select item
-            for _ in range(item_index):
-                ctrl.dpad.tap_down()
+            # Select item (shares the special menu cursor)
+            if not self._navigate(item_index, self._ITEM_MENU_SIZE, self._spec_cursor):
+                # Back to the main menu, try again next tick
+                ctrl.cancel(tapping=True)
+                return False
             ctrl.confirm(tapping=True)
             # Select target
-            for _ in range(target.value):
-                ctrl.dpad.tap_down()
+            self._navigate(target.value)
             # Use item
             ctrl.confirm()
             return True
         return False
 
+    # Overload to plan the turns, see _take_plan
+    def create_plan(self, actor: ATBActor) -> Optional[ATBPlan]:
+        return None
+
+    _TURN_ORDER_LEN = 6
+    # Plans are prepared for the allies acting within this many seconds
+    _PLAN_AHEAD = 2.0
+
+    def _update_turns(self, delta: float) -> None:
+        def gauges(group: list[BattleEntity]) -> list[tuple[float, float]]:
+            return [
+                (entity.turn_gauge, entity.turn_gauge_speed if entity.cur_hp > 0 else 0)
+                for entity in group
+            ]
+
+        # The gauge is not known to grow past 1, the tracker tells which full one
+        # filled up first
+        allies, enemies = self.gauges.update(
+            gauges(self.mem.allies), gauges(self.mem.enemies), delta
+        )
+        self.turns = turn_order(allies, enemies, self._TURN_ORDER_LEN)
+        # Plans are kept until their turn is taken, and only prepared again when the
+        # hp they were based on changes
+        inputs = tuple(entity.cur_hp for entity in self.mem.allies + self.mem.enemies)
+        if inputs != self._plan_inputs:
+            self.next_plans = {}
+            self._plan_inputs = inputs
+        for turn in self.turns:
+            if not turn.ally or turn.time > self._PLAN_AHEAD:
+                continue
+            actor = ATBActor(turn.index)
+            if actor in self.next_plans:
+                continue
+            if self.cur_plan is not None and self.cur_plan.cur_actor == actor:
+                continue
+            plan = self.create_plan(actor)
+            if plan is not None:
+                self.next_plans[actor] = plan
+
+    def _take_plan(self) -> Optional[ATBPlan]:
+        # Plan of the ally whose turn it is, ready before its menu opens
+        actor = self._cur_actor()
+        if actor is None:
+            return None
+        plan = self.next_plans.pop(actor, None)
+        return plan if plan is not None else self.create_plan(actor)
+
     # TODO: Actual combat logic
     # TODO: Overload with more complex
     def handle_combat(self, should_run: bool = False):
         if should_run:
-            if self.mem.menu_open:
-                with contextlib.suppress(ReferenceError):
-                    ctrl = evo_ctrl()
-                    while self.mem.cursor != self._RUN_CURSOR_POS:
-                        ctrl.dpad.tap_down()
-                    ctrl.confirm()
+            if self._select_main(self._RUN_CURSOR_POS):
+                evo_ctrl().confirm()
         else:
             _tap_confirm()
 
@@ -179,6 +263,7 @@ class SeqATBCombat(SeqBase):
                     return False
             case self._BattleFSM.BATTLE:
                 if active:
+                    self._update_turns(delta)
                     self.handle_combat(should_run)
                     if self.mem.ended:
                         logger.debug("Battle => Post battle")
@@ -206,40 +291,64 @@ class SeqATBCombat(SeqBase):
         if not self.mem.ended:
             self._print_plan(window=window)
             self._render_combat_predictions(window=window)
+            self._print_turns(window=window)
             # TODO: map representation?
 
     def _cur_actor(self) -> Optional[ATBActor]:
-        # Who is acting?
-        clink_turn = self.mem.allies[0].turn_gauge
-        if clink_turn >= 1:
-            return ATBActor.CLINK
-        if len(self.mem.allies) > 1:
-            kaeris_turn = self.mem.allies[1].turn_gauge
-            if kaeris_turn >= 1:
-                return ATBActor.KAERIS
+        # Who is acting? When both gauges are full, the one that filled up first
+        for turn in self.turns:
+            if turn.time > 0:
+                break
+            if turn.ally:
+                return ATBActor(turn.index)
         return None
 
+    def _next_ally(self) -> ATBActor:
+        turn = next((turn for turn in self.turns if turn.ally), None)
+        return ATBActor.CLINK if turn is None else ATBActor(turn.index)
+
     def _print_plan(self, window: WindowLayout) -> None:
         if self.cur_plan is not None:
             window.stats.addstr(Vec2(1, 12), f"{self.cur_plan}")
 
+    _UPCOMING_OUTCOMES = 8
+
     def _render_combat_predictions(self, window: WindowLayout):
         # Who is next actor?
-        clink_turn = self.mem.allies[0].turn_gauge
-        if len(self.mem.allies) > 1:
-            kaeris_turn = self.mem.allies[1].turn_gauge
-            cur_ally = (
-                self.mem.allies[1] if kaeris_turn > clink_turn else self.mem.allies[0]
-            )
-        else:
-            cur_ally = self.mem.allies[0]
-        ally = atb_stats_from_memory(cur_ally)
+        ally = atb_stats_from_memory(self.mem.allies[self._next_ally()])
         enemy = atb_stats_from_memory(self.mem.enemies[0])
-        # Perform damage prediction
-        rng = EvolandRNG().get_rng()
-        prediction = predict_attack(rng, ally, enemy)
+        # Perform damage prediction, the window is only calculated when the rng
+        # lookahead is rebuilt or the stats change
+        rng = get_rng_memory().get_lookahead()
+        outcomes = get_outcome_window(
+            rng.table, rng.offset, ally, enemy, count=self._UPCOMING_OUTCOMES + 1
+        )
+        prediction = outcomes.at(rng.offset, cur_hp=enemy.cur_hp)
         window.stats.addstr(Vec2(1, 13), "Damage prediction:")
         window.stats.addstr(Vec2(2, 14), f" {prediction}")
+        # Outcome if the attack happens after a few more rng steps
+        upcoming = [
+            outcomes.at(rng.offset + step, cur_hp=enemy.cur_hp)
+            for step in range(1, self._UPCOMING_OUTCOMES + 1)
+        ]
+        window.stats.addstr(Vec2(1, 15), "Next offsets:")
+        window.stats.addstr(
+            Vec2(2, 16),
+            " ".join(
+                ("KO" if p.one_shot else str(p.dmg)) if p.hit else "-" for p in upcoming
+            ),
+        )
+
+    def _print_turns(self, window: WindowLayout) -> None:
+        window.stats.addstr(Vec2(1, 18), "Turn order:")
+        for i, turn in enumerate(self.turns):
+            group = self.mem.allies if turn.ally else self.mem.enemies
+            plan = self.next_plans.get(ATBActor(turn.index)) if turn.ally else None
+            window.stats.addstr(
+                Vec2(2, 19 + i),
+                f"{turn.time:5.2f}s {group[turn.index].name}"
+                + (f" {plan}" if plan is not None else ""),
+            )
 
     def _print_group(
         self, window: WindowLayout, group: list[BattleEntity], y_offset: int
@@ -1,10 +1,10 @@
 import logging
 from enum import Enum, auto
 
-from evo1.atb.entity import ATBEntity, ATBEntityID, atb_stats_from_id
+from engine.atb import ATBEntity, ATBEntityID, atb_stats_from_id
 from evo1.atb.predict import AttackPrediction, predict_attack
 from memory.evo1 import MapID, get_memory
-from memory.rng import EvolandRNG
+from memory.rng import RNGSource
 
 logger = logging.getLogger(__name__)
 
@@ -128,7 +128,7 @@ def get_enc_kind(rng_value: int, has_3d_monsters: bool = False) -> EncounterID:
 
 
 def calc_next_encounter(
-    rng: EvolandRNG.RNGStruct, has_3d_monsters: bool = False, clink_level: int = 0
+    rng: RNGSource, has_3d_monsters: bool = False, clink_level: int = 0
 ) -> Encounter:
     rng_value = rng.rand_int() & 0x3FFFFFFF
     enc_kind = get_enc_kind(rng_value, has_3d_monsters)
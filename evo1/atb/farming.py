@@ -4,10 +4,12 @@ from typing import Optional
 from control import evo_ctrl
 from engine.mathlib import Vec2
 from engine.move2d import SeqMove2D, is_close, move_to
+from engine.pathing import AStar
 from evo1.atb.base import SeqATBCombat
-from evo1.atb.encounter import Encounter, calc_next_encounter
+from evo1.atb.encounter import Encounter
+from evo1.atb.manip import get_encounter_forecast
+from evo1.atb.timer import EncounterPoint, get_encounter_timer_model
 from memory.evo1 import get_memory, get_zelda_memory
-from memory.rng import EvolandRNG
 from term.window import WindowLayout
 
 logger = logging.getLogger(__name__)
@@ -27,11 +29,14 @@ class FarmingGoal:
         precision: float = 0.2,
         gli_goal: int = None,
         lvl_goal: int = None,
+        nav: Optional[AStar] = None,
     ) -> None:
         self.farm_coords = farm_coords
         self.precision = precision
         self.gli_goal = gli_goal
         self.lvl_goal = lvl_goal
+        # With a nav, walk around walls (flow fields, one per farm coordinate)
+        self.nav = nav
         self.step = 0
 
     def reset(self) -> None:
@@ -43,12 +48,20 @@ class FarmingGoal:
         mem = get_zelda_memory()
         cur_pos = mem.player.pos
 
-        move_to(player=cur_pos, target=target, precision=self.precision)
+        waypoint = self._waypoint(cur_pos, target)
+        move_to(player=cur_pos, target=waypoint, precision=self.precision)
 
         # If arrived, go to next coordinate in the list
         if is_close(cur_pos, target, self.precision):
             self.step = self.step + 1 if self.step < len(self.farm_coords) - 1 else 0
 
+    def _waypoint(self, cur_pos: Vec2, target: Vec2) -> Vec2:
+        if self.nav is None:
+            return target
+        field = self.nav.flow_field(target)
+        tile = field.next_tile(cur_pos)
+        return target if tile is None or tile == field.goal else tile
+
     def can_farm(self) -> bool:
         return self.farm_coords is not None
 
@@ -87,6 +100,7 @@ class SeqATBmove2D(SeqMove2D):
     ):
         self.goal = goal
         self.next_enc: Encounter = None
+        self.next_enc_point: Optional[EncounterPoint] = None
         self.battle_handler = battle_handler
         self.forced = forced
         super().__init__(name, coords, precision, func=func)
@@ -121,9 +135,14 @@ class SeqATBmove2D(SeqMove2D):
 
     def calc_next_encounter(self, small_sword: bool = False) -> None:
         mem = get_memory()
-        rng = EvolandRNG().get_rng()
-        self.next_enc = calc_next_encounter(
-            rng=rng, has_3d_monsters=False, clink_level=0 if small_sword else mem.lvl
+        forecast, offset = get_encounter_forecast(
+            has_3d_monsters=False, clink_level=0 if small_sword else mem.lvl
+        )
+        self.next_enc = forecast.at(offset)
+        # Where it triggers along the coordinates left
+        player = get_zelda_memory().player
+        self.next_enc_point = get_encounter_timer_model().predict(
+            player.pos, player.encounter_timer, self.coords[self.step :], player.speed
         )
 
     def should_run(self) -> bool:
@@ -133,6 +152,8 @@ class SeqATBmove2D(SeqMove2D):
         mem = get_zelda_memory()
         # For some reason, this flag is set when in ATB combat
         if mem.player.not_in_control:
+            # The timer resets, don't fit across the battle
+            get_encounter_timer_model().reset()
             # Check for active battle (returns True on completion/non-execution)
             if self.battle_handler.execute(delta=delta, should_run=self.should_run()):
                 # Handle non-battle reasons for losing control
@@ -145,6 +166,10 @@ class SeqATBmove2D(SeqMove2D):
     def execute(self, delta: float) -> bool:
         if self.handle_combat(delta):
             return False
+        player = get_zelda_memory().player
+        get_encounter_timer_model().record(
+            player.pos, player.speed, player.encounter_timer, delta
+        )
 
         # Else navigate the world, checking for farming goals
         if self.navigate_to_goal():
@@ -165,7 +190,9 @@ class SeqATBmove2D(SeqMove2D):
         if self.next_enc:
             mem = get_zelda_memory()
             enc_timer = mem.player.encounter_timer
-            window.stats.addstr(Vec2(1, 12), f" Next enc ({enc_timer:.3f}):")
+            point = self.next_enc_point
+            at = f", {point.frame}f at {point.pos}" if point else ""
+            window.stats.addstr(Vec2(1, 12), f" Next enc ({enc_timer:.3f}{at}):")
             window.stats.addstr(Vec2(1, 13), f"  {self.next_enc}")
 
     def __repr__(self) -> str:
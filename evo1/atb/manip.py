@@ -0,0 +1,139 @@
+"""
+Search for RNG manips. The actions that advance the rng (opening a chest, waiting,
+menu manips...) are combined until the next encounter is a wanted one, the cheapest
+combination (in time) wins. Encounters come from calc_next_encounter at each offset
+of the rng lookahead, and are only calculated once per offset.
+"""
+import heapq
+import itertools
+import logging
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from evo1.atb.encounter import Encounter, EncounterID, calc_next_encounter
+from evo1.atb.predict import AttackPrediction
+from memory.evo1 import get_memory
+from memory.rng import RNGLookahead, get_rng_memory
+
+logger = logging.getLogger(__name__)
+
+
+class ManipAction(NamedTuple):
+    name: str
+    steps: int  # RNG values consumed
+    time: float  # Seconds lost doing it
+    uses: Optional[int] = None  # None when it can be repeated at will
+
+
+class Manip(NamedTuple):
+    actions: list[ManipAction]
+    offset: int  # Offset of the encounter in the forecast
+    time: float
+    encounter: Encounter
+
+
+class EncounterForecast:
+    """The encounter calc_next_encounter gives at each offset of a lookahead table."""
+
+    def __init__(
+        self, table: RNGLookahead, has_3d_monsters: bool = False, clink_level: int = 0
+    ) -> None:
+        self.table = table
+        self.has_3d_monsters = has_3d_monsters
+        self.clink_level = clink_level
+        self._encounters: dict[int, Encounter] = {}
+
+    def at(self, offset: int) -> Encounter:
+        enc = self._encounters.get(offset)
+        if enc is None:
+            enc = calc_next_encounter(
+                self.table.at(offset),
+                has_3d_monsters=self.has_3d_monsters,
+                clink_level=self.clink_level,
+            )
+            self._encounters[offset] = enc
+        return enc
+
+
+# Forecasts on the current lookahead table, by (map, has_3d_monsters, clink_level)
+_forecasts: dict[tuple, EncounterForecast] = {}
+
+
+def get_encounter_forecast(
+    has_3d_monsters: bool = False, clink_level: int = 0
+) -> tuple[EncounterForecast, int]:
+    """Forecast of the current rng, with the offset of the next encounter in it."""
+    cursor = get_rng_memory().get_lookahead()
+    key = (get_memory().map_id, has_3d_monsters, clink_level)
+    forecast = _forecasts.get(key)
+    if forecast is None or forecast.table is not cursor.table:
+        if forecast is not None:
+            # The table was rebuilt, the other forecasts are stale too
+            _forecasts.clear()
+        forecast = EncounterForecast(cursor.table, has_3d_monsters, clink_level)
+        _forecasts[key] = forecast
+    return forecast, cursor.offset
+
+
+def wants(
+    enc_ids: Optional[Iterable[EncounterID]] = None,
+    first_turn: Optional[Callable[[AttackPrediction], bool]] = None,
+) -> Callable[[Encounter], bool]:
+    """Goal for find_manip: one of the encounters, and/or a first turn outcome."""
+    enc_ids = set(enc_ids) if enc_ids is not None else None
+
+    def goal(enc: Encounter) -> bool:
+        if enc_ids is not None and enc.enc_id not in enc_ids:
+            return False
+        return first_turn is None or first_turn(enc.first_turn)
+
+    return goal
+
+
+def find_manip(
+    forecast: EncounterForecast,
+    offset: int,
+    actions: list[ManipAction],
+    goal: Callable[[Encounter], bool],
+    max_steps: int = 500,
+) -> Optional[Manip]:
+    """
+    Cheapest sequence of actions from the offset that lands on a wanted encounter. Ties
+    go to fewer actions. An empty sequence means the next encounter is already good.
+    Returns None if no encounter within max_steps is wanted.
+    """
+    # Uniform cost search. The order of the actions doesn't change where they land,
+    # so they are only applied in list order (the index of the last one is part of
+    # the state). Limited actions keep their remaining uses.
+    start_uses = tuple(action.uses for action in actions)
+    counter = itertools.count()
+    queue = [(0.0, 0, next(counter), offset, 0, start_uses, [])]
+    visited = set()
+    while queue:
+        time, _, _, cur_offset, last, uses, path = heapq.heappop(queue)
+        if (cur_offset, last, uses) in visited:
+            continue
+        visited.add((cur_offset, last, uses))
+        enc = forecast.at(cur_offset)
+        if goal(enc):
+            return Manip(path, cur_offset, time, enc)
+        for index in range(last, len(actions)):
+            action = actions[index]
+            next_offset = cur_offset + action.steps
+            if uses[index] == 0 or next_offset - offset > max_steps:
+                continue
+            next_uses = uses
+            if uses[index] is not None:
+                next_uses = uses[:index] + (uses[index] - 1,) + uses[index + 1 :]
+            heapq.heappush(
+                queue,
+                (
+                    time + action.time,
+                    len(path) + 1,
+                    next(counter),
+                    next_offset,
+                    index,
+                    next_uses,
+                    path + [action],
+                ),
+            )
+    return None
@@ -1,7 +1,10 @@
 import logging
+from typing import Optional
 
-from evo1.atb.entity import ATBEntityStats
-from memory.rng import EvolandRNG
+import numpy as np
+
+from engine.atb import ATBEntityStats, attack_damage, attack_hits
+from memory.rng import RNGLookahead, RNGSource
 
 logger = logging.getLogger(__name__)
 
@@ -21,20 +24,89 @@ class AttackPrediction:
         return True if miss else True if ko else self.dmg == other.dmg
 
 
-def predict_attack(
-    rng: EvolandRNG.RNGStruct, attacker: ATBEntityStats, defender: ATBEntityStats
-) -> AttackPrediction:
-    dmg = _predict_damage(attacker.attack, defender.defense, rng.rand_float())
-    hit = _predict_hit(defender.evade, rng.rand_int())
-    cur_hp = defender.cur_hp
-    return AttackPrediction(dmg=dmg, hit=hit, cur_hp=cur_hp)
+class OutcomeWindow:
+    """
+    Outcome of an attack (damage, hit) with the rng at each offset of a lookahead
+    table, from `start` onwards. Everything is calculated in one vectorized pass.
+    """
+
+    def __init__(
+        self,
+        table: RNGLookahead,
+        start: int,
+        count: int,
+        attacker: ATBEntityStats,
+        defender: ATBEntityStats,
+    ) -> None:
+        self.start = start
+        # One float (3 values) then one int per attack
+        values = table.ints(start, count + 3)
+        big = 4294967296.0
+        rng_float = ((values[:-3] / big + values[1:-2]) / big + values[2:-1]) / big
+        # Same operations as attack_damage and attack_hits, so it is bit-exact
+        self.dmg = np.trunc(
+            attacker.attack + 0.5 * attacker.attack * rng_float - defender.defense + 0.5
+        ).astype(np.int64)
+        self.hit = (values[3:] & 0x3FFFFFFF) % 100 >= defender.evade
+
+    def __len__(self) -> int:
+        return len(self.dmg)
+
+    def covers(self, offset: int, count: int = 1) -> bool:
+        return self.start <= offset and offset + count <= self.start + len(self)
 
+    def at(self, offset: int, cur_hp: int) -> AttackPrediction:
+        index = offset - self.start
+        return AttackPrediction(
+            dmg=int(self.dmg[index]), hit=bool(self.hit[index]), cur_hp=cur_hp
+        )
 
-# Att + (0.5 * Att * random_float) - enemy_def
-def _predict_damage(attack: int, defense: int, rng_float: float) -> int:
-    return int(attack + (0.5 * attack * rng_float) - defense + 0.5)
+    def ko(self, cur_hp: int) -> np.ndarray:
+        return self.hit & (self.dmg >= cur_hp)
 
 
-def _predict_hit(evade: int, rng_int: int) -> bool:
-    roll = (rng_int & 0x3FFFFFFF) % 100
-    return roll >= evade
+_WINDOW_SIZE = 256
+# Windows of the current lookahead table, by (attack, defense, evade)
+_windows: dict[tuple[int, int, int], OutcomeWindow] = {}
+_windows_table: Optional[RNGLookahead] = None
+
+
+def get_outcome_window(
+    table: RNGLookahead,
+    offset: int,
+    attacker: ATBEntityStats,
+    defender: ATBEntityStats,
+    count: int = 1,
+) -> OutcomeWindow:
+    """
+    Outcome window covering [offset, offset + count). Windows are kept until the rng
+    lookahead is rebuilt, so predictions at the same offsets are only calculated once.
+    A window is only rebuilt (_WINDOW_SIZE outcomes from the offset) when the offsets
+    asked for leave it.
+    """
+    global _windows_table
+    if table is not _windows_table:
+        _windows.clear()
+        _windows_table = table
+    key = (attacker.attack, defender.defense, defender.evade)
+    window = _windows.get(key)
+    if window is None or not window.covers(offset, count):
+        window = OutcomeWindow(
+            table, offset, max(count, _WINDOW_SIZE), attacker, defender
+        )
+        _windows[key] = window
+    return window
+
+
+def predict_attack(
+    rng: RNGSource, attacker: ATBEntityStats, defender: ATBEntityStats
+) -> AttackPrediction:
+    if isinstance(rng, RNGLookahead.Cursor):
+        window = get_outcome_window(rng.table, rng.offset, attacker, defender)
+        prediction = window.at(rng.offset, cur_hp=defender.cur_hp)
+        rng.advance_rng(4)  # One float and one int
+        return prediction
+    dmg = attack_damage(attacker.attack, defender.defense, rng.rand_float())
+    hit = attack_hits(defender.evade, rng.rand_int())
+    cur_hp = defender.cur_hp
+    return AttackPrediction(dmg=dmg, hit=hit, cur_hp=cur_hp)
@@ -0,0 +1,230 @@
+"""
+Plan a gli farm over the next few encounters. Every encounter can be fought or run
+from, and before it the rng can be pushed forward with manips (a chest) or by standing
+still. The rng offset each encounter triggers at is estimated from the farm model,
+so the order of the decisions matters: running or fighting a different encounter moves
+every following one. Dynamic programming over (encounter, offset, gli missing, manip
+uses) finds the fastest schedule to the gli goal.
+
+The schedule should be planned again at every step, as the estimates drift from the
+game. It is not used by the route yet: the FarmModel defaults are placeholders, not
+measured on the route, so the sections decide runs and manips on their own. Only the
+gli goal is planned, level goals are not.
+"""
+import itertools
+import logging
+import math
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import NamedTuple, Optional
+
+from evo1.atb.encounter import Encounter
+from evo1.atb.manip import EncounterForecast, ManipAction
+
+logger = logging.getLogger(__name__)
+
+
+class FarmAction(Enum):
+    FIGHT = auto()
+    RUN = auto()
+    MANIP = auto()
+    WAIT = auto()
+
+
+class FarmStep(NamedTuple):
+    action: FarmAction
+    offset: int  # Rng offset it starts at
+    time: float
+    encounter: Optional[Encounter] = None  # FIGHT/RUN
+    manip: Optional[ManipAction] = None  # MANIP/WAIT
+
+    def __repr__(self) -> str:
+        if self.encounter is not None:
+            return f"{self.action.name} {self.encounter.enc_id.name}"
+        return f"{self.action.name} {self.manip.name}"
+
+
+class FarmSchedule(NamedTuple):
+    steps: list[FarmStep]
+    time: float  # Estimated, includes the estimate past the horizon
+    done: bool  # Goal reached within the planned steps
+
+    @property
+    def next_encounter(self) -> Optional[FarmStep]:
+        return next((step for step in self.steps if step.encounter is not None), None)
+
+    @property
+    def first(self) -> Optional[FarmStep]:
+        return self.steps[0] if self.steps else None
+
+
+@dataclass(frozen=True)
+class FarmModel:
+    """
+    Estimates of the farm loop. The rng rate comes from the rng tracker (values
+    consumed per second on the map). The other defaults are rough guesses, they
+    still have to be measured on the route.
+    """
+
+    gli_per_enemy: int = 50
+    # Seconds walking the farm loop between two encounters
+    walk_time: float = 3.0
+    # Seconds of a fight, and extra ones per enemy
+    fight_time: float = 4.0
+    enemy_time: float = 2.5
+    run_time: float = 2.0
+    # Rng values consumed per second outside of battle
+    rng_rate: float = 0.0
+    # Rng values consumed by a fight (per enemy) and by running
+    rng_per_enemy: int = 12
+    rng_per_run: int = 2
+    # Standing still to move the rng forward, in steps of this many seconds
+    wait_time: float = 0.5
+
+    def fight_cost(self, enc: Encounter) -> float:
+        return self.fight_time + self.enemy_time * len(enc.enemies)
+
+    def walk_steps(self, seconds: float) -> int:
+        return round(self.rng_rate * seconds)
+
+    @property
+    def wait(self) -> Optional[ManipAction]:
+        steps = self.walk_steps(self.wait_time)
+        if steps <= 0:
+            return None
+        return ManipAction(name="wait", steps=steps, time=self.wait_time)
+
+
+def _combinations(
+    actions: list[ManipAction], uses: tuple, max_actions: int
+) -> list[tuple[int, float, tuple, tuple]]:
+    """Every (steps, time, action indices, uses left) doable with up to max_actions."""
+    options = []
+    for count in range(max_actions + 1):
+        for combo in itertools.combinations_with_replacement(
+            range(len(actions)), count
+        ):
+            left = list(uses)
+            for index in combo:
+                if left[index] is not None:
+                    left[index] -= 1
+            if any(use is not None and use < 0 for use in left):
+                continue
+            steps = sum(actions[index].steps for index in combo)
+            time = sum(actions[index].time for index in combo)
+            options.append((steps, time, combo, tuple(left)))
+    return options
+
+
+class FarmPlanner:
+    """Fastest way to the gli goal over the next `horizon` encounters."""
+
+    def __init__(
+        self,
+        model: FarmModel,
+        manips: Optional[list[ManipAction]] = None,
+        horizon: int = 4,
+        max_manips: int = 3,
+    ) -> None:
+        self.model = model
+        self.horizon = horizon
+        self.max_manips = max_manips
+        self.actions = list(manips or [])
+        self._wait_index = None
+        if (wait := model.wait) is not None:
+            self._wait_index = len(self.actions)
+            self.actions.append(wait)
+        self._options: dict[tuple, list] = {}
+
+    def _options_for(self, uses: tuple) -> list:
+        options = self._options.get(uses)
+        if options is None:
+            options = _combinations(self.actions, uses, self.max_manips)
+            self._options[uses] = options
+        return options
+
+    def _tail(self, gli_missing: int) -> float:
+        # Past the horizon: average fights, one to three enemies each
+        fights = math.ceil(gli_missing / (2 * self.model.gli_per_enemy))
+        return fights * (
+            self.model.fight_time + 2 * self.model.enemy_time + self.model.walk_time
+        )
+
+    def plan(
+        self,
+        forecast: EncounterForecast,
+        offset: int,
+        gli_missing: int,
+        first_walk: float = 0.0,
+        uses: Optional[tuple] = None,
+    ) -> FarmSchedule:
+        """
+        Schedule from the current rng offset, first_walk seconds away from the next
+        encounter. `uses` are the uses left of each manip, defaults to theirs.
+        """
+        if uses is None:
+            uses = tuple(action.uses for action in self.actions)
+        elif self._wait_index is not None:
+            uses = tuple(uses) + (None,)
+        model = self.model
+        memo: dict[tuple, tuple[float, Optional[tuple]]] = {}
+
+        # Best (time, decision) from an encounter triggering at the offset
+        def best(depth: int, offset: int, missing: int, uses: tuple):
+            if missing <= 0:
+                return 0.0, None
+            if depth == self.horizon:
+                return self._tail(missing), None
+            key = (depth, offset, missing, uses)
+            if key in memo:
+                return memo[key]
+            result = (math.inf, None)
+            for steps, manip_time, combo, left in self._options_for(uses):
+                after = offset + steps
+                enc = forecast.at(after)
+                walk = model.walk_steps(model.walk_time)
+                # Fight
+                gli = model.gli_per_enemy * len(enc.enemies)
+                fight_time = model.fight_cost(enc)
+                next_offset = after + model.rng_per_enemy * len(enc.enemies) + walk
+                rest = (
+                    best(depth + 1, next_offset, missing - gli, left)[0]
+                    if missing > gli
+                    else -model.walk_time
+                )
+                time = manip_time + fight_time + model.walk_time + rest
+                if time < result[0]:
+                    result = (time, (combo, FarmAction.FIGHT, next_offset, left))
+                # Run
+                next_offset = after + model.rng_per_run + walk
+                rest = best(depth + 1, next_offset, missing, left)[0]
+                time = manip_time + model.run_time + model.walk_time + rest
+                if time < result[0]:
+                    result = (time, (combo, FarmAction.RUN, next_offset, left))
+            memo[key] = result
+            return result
+
+        start = offset + model.walk_steps(first_walk)
+        total, _ = best(0, start, gli_missing, uses)
+        # Replay the decisions into steps
+        steps: list[FarmStep] = []
+        depth, cur, missing, cur_uses = 0, start, gli_missing, uses
+        while missing > 0 and depth < self.horizon:
+            _, decision = best(depth, cur, missing, cur_uses)
+            combo, action, next_offset, cur_uses = decision
+            for index in combo:
+                manip = self.actions[index]
+                kind = (
+                    FarmAction.WAIT if index == self._wait_index else FarmAction.MANIP
+                )
+                steps.append(FarmStep(kind, cur, manip.time, manip=manip))
+                cur += manip.steps
+            enc = forecast.at(cur)
+            if action == FarmAction.FIGHT:
+                steps.append(FarmStep(action, cur, model.fight_cost(enc), enc))
+                missing -= model.gli_per_enemy * len(enc.enemies)
+            else:
+                steps.append(FarmStep(action, cur, model.run_time, enc))
+            cur = next_offset
+            depth += 1
+        return FarmSchedule(steps, first_walk + total, missing <= 0)
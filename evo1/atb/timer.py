@@ -0,0 +1,136 @@
+"""
+Model of the encounter timer. It counts down while the player moves around, and the
+encounter triggers when it runs out. Every tick out of battle is recorded, and the
+timer deltas are fitted by least squares as
+
+    -d_timer = per_tile * distance walked + per_second * time
+
+so the encounter can be placed along the path ahead: where it triggers, and when.
+"""
+import logging
+import math
+from typing import NamedTuple, Optional
+
+from engine.mathlib import Vec2, dist
+
+logger = logging.getLogger(__name__)
+
+_FPS = 30.0  # As control.evoland
+
+
+class EncounterPoint(NamedTuple):
+    pos: Vec2
+    time: float  # Seconds from now
+    frame: int  # Frames from now
+    step: int  # Index in the path of the coordinate walked towards
+
+
+class EncounterTimerModel:
+    # Until enough samples are fitted: the timer is the distance left
+    _DEFAULT_PER_TILE = 1.0
+    _DEFAULT_WALK_SPEED = 4.0  # Tiles per second
+    _MIN_SAMPLES = 10
+    # Teleports (zone transitions) and encounter resets aren't walking
+    _MAX_STEP = 2.0
+
+    def __init__(self) -> None:
+        self._last: Optional[tuple[Vec2, float]] = None
+        self.samples = 0
+        # Sums of the normal equations
+        self._dd = self._dt = self._tt = self._yd = self._yt = 0.0
+        # Distance walked, seconds spent walking and sum of speed readings * seconds
+        self._walked = self._walk_time = self._speed_time = 0.0
+
+    def reset(self) -> None:
+        # Forget the last sample (after a battle, a map change...), keep the fit
+        self._last = None
+
+    def record(self, pos: Vec2, speed: float, timer: float, delta: float) -> None:
+        """One tick: player position, speed reading and encounter timer."""
+        last, self._last = self._last, (pos, timer)
+        if last is None or delta <= 0:
+            return
+        moved = dist(last[0], pos)
+        spent = last[1] - timer
+        # The timer went back up, or we were moved
+        if spent < 0 or moved > self._MAX_STEP:
+            return
+        self.samples += 1
+        self._dd += moved * moved
+        self._dt += moved * delta
+        self._tt += delta * delta
+        self._yd += spent * moved
+        self._yt += spent * delta
+        if moved > 0:
+            self._walked += moved
+            self._walk_time += delta
+            self._speed_time += speed * delta
+
+    @property
+    def fitted(self) -> bool:
+        return self.samples >= self._MIN_SAMPLES and self._dd > 0
+
+    def rates(self) -> tuple[float, float]:
+        """(per_tile, per_second) timer units."""
+        if not self.fitted:
+            return self._DEFAULT_PER_TILE, 0.0
+        det = self._dd * self._tt - self._dt * self._dt
+        if abs(det) < 1e-9 * max(self._dd * self._tt, 1e-9):
+            # Never stood still, can't tell the two apart
+            return self._yd / self._dd, 0.0
+        per_tile = (self._yd * self._tt - self._yt * self._dt) / det
+        per_second = (self._yt * self._dd - self._yd * self._dt) / det
+        return max(per_tile, 0.0), max(per_second, 0.0)
+
+    def walk_speed(self, speed: Optional[float] = None) -> float:
+        """Tiles per second, from a speed reading if given (and known to scale)."""
+        if speed and self._speed_time > 0:
+            return speed * self._walked / self._speed_time
+        if self._walk_time > 0:
+            return self._walked / self._walk_time
+        return self._DEFAULT_WALK_SPEED
+
+    def time_left(self, timer: float, speed: Optional[float] = None) -> float:
+        """Seconds to the next encounter, walking all the way."""
+        per_tile, per_second = self.rates()
+        drain = per_tile * self.walk_speed(speed) + per_second
+        return timer / drain if drain > 0 else math.inf
+
+    def predict(
+        self,
+        pos: Vec2,
+        timer: float,
+        path: list[Vec2],
+        speed: Optional[float] = None,
+    ) -> Optional[EncounterPoint]:
+        """
+        Where and when the encounter triggers walking along the path from pos. None if
+        the timer outlasts the path.
+        """
+        time = self.time_left(timer, speed)
+        if math.isinf(time):
+            return None
+        # Distance walked by then
+        left = time * self.walk_speed(speed)
+        cur = pos
+        for step, target in enumerate(path):
+            length = dist(cur, target)
+            if left <= length:
+                point = cur + (target - cur) * (left / length) if length > 0 else cur
+                return EncounterPoint(point, time, round(time * _FPS), step)
+            left -= length
+            cur = target
+        return None
+
+    def reaches(
+        self, pos: Vec2, timer: float, path: list[Vec2], speed: Optional[float] = None
+    ) -> bool:
+        """True if the whole path can be walked before the encounter triggers."""
+        return self.predict(pos, timer, path, speed) is None
+
+
+_model = EncounterTimerModel()
+
+
+def get_encounter_timer_model() -> EncounterTimerModel:
+    return _model
@@ -49,8 +49,8 @@ class SeqDarkClinkObserver(SeqCombat3D):
     def _track_dark_clink(self) -> Optional[Evo1GameEntity2D]:
         mem = get_zelda_memory()
         with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
-                if self.arena.contains(actor.pos) and actor.hp == self._DARK_CLINK_HP:
+            for _, actor in mem.actor_index.in_box(self.arena):
+                if actor.hp == self._DARK_CLINK_HP:
                     return actor
         return None
 
@@ -52,9 +52,8 @@ class SeqPlaceBomb(SeqSection2D):
             with contextlib.suppress(ReferenceError):
                 box = get_box_with_size(center=player_pos, half_size=2 * self.precision)
                 # Wait for bomb to explode
-                for actor in mem.actors:
-                    if actor.kind == EKind.INTERACT and box.contains(actor.pos):
-                        return False
+                if mem.actor_index.in_box(box, [EKind.INTERACT]):
+                    return False
             # Close menu
             ctrl.dpad.none()
             ctrl.menu()
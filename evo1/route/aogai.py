@@ -7,25 +7,25 @@ from engine.mathlib import Facing, Vec2
 from engine.move2d import SeqGrabChest, SeqMove2D, SeqMove2DCancel, SeqSection2D
 from engine.seq import SeqBase, SeqInteract, SeqList, wait_seconds
 from evo1.move2d import SeqZoneTransition
-from maps.evo1 import GetNavmap
+from maps.evo1 import GetNavmap, GetNavNode
 from memory.evo1 import MapID, get_memory
 
 logger = logging.getLogger(__name__)
 
 _aogai_nav = GetNavmap(MapID.AOGAI)
 
-_SOUTH_ENTRANCE = _aogai_nav.map[0]  # Exit is down
-_NORTH_ENTRANCE = _aogai_nav.map[18]  # Exit is up
-_SID = _aogai_nav.map[6]  # Sid is left
-_HEALER = _aogai_nav.map[16]  # Healer is right
-_CARD_CHEST = _aogai_nav.map[10]  # Chest is up
-_SHOP_CHEST = _aogai_nav.map[13]  # Chest is left
-_GRANNY = _aogai_nav.map[5]  # Note, adjacent point to Granny map
-_DEPUTY = _aogai_nav.map[21]  # Deputy is left
-_MOM = _aogai_nav.map[7]  # Mom is up
-_CARD_PLAYER = _aogai_nav.map[22]  # Player is left
-_SHOP_KEEPER = _aogai_nav.map[19]  # Shop is up
-_POST_BOMB_SKIP = _aogai_nav.map[9]  # Gets teleported here
+_SOUTH_ENTRANCE = GetNavNode(MapID.AOGAI, 0)  # Exit is down
+_NORTH_ENTRANCE = GetNavNode(MapID.AOGAI, 18)  # Exit is up
+_SID = GetNavNode(MapID.AOGAI, 6)  # Sid is left
+_HEALER = GetNavNode(MapID.AOGAI, 16)  # Healer is right
+_CARD_CHEST = GetNavNode(MapID.AOGAI, 10)  # Chest is up
+_SHOP_CHEST = GetNavNode(MapID.AOGAI, 13)  # Chest is left
+_GRANNY = GetNavNode(MapID.AOGAI, 5)  # Note, adjacent point to Granny map
+_DEPUTY = GetNavNode(MapID.AOGAI, 21)  # Deputy is left
+_MOM = GetNavNode(MapID.AOGAI, 7)  # Mom is up
+_CARD_PLAYER = GetNavNode(MapID.AOGAI, 22)  # Player is left
+_SHOP_KEEPER = GetNavNode(MapID.AOGAI, 19)  # Shop is up
+_POST_BOMB_SKIP = GetNavNode(MapID.AOGAI, 9)  # Gets teleported here
 
 
 class AogaiWrongWarp(SeqBase):
@@ -66,12 +66,12 @@ class TalkToGranny(SeqBase):
         player = self.zelda_mem().player
         ctrl.dpad.none()
         # TODO: Slightly inefficient
-        while player.pos.y < 7:
+        while player.refresh().pos.y < 7:
             ctrl.dpad.left()
         ctrl.dpad.none()
         ctrl.dpad.up()
         # Approach Granny
-        while player.pos.x > 3.75:
+        while player.refresh().pos.x > 3.75:
             wait_seconds(0.1)
         ctrl.dpad.none()
         # Talk to Granny (bomb skip)
@@ -82,7 +82,7 @@ class TalkToGranny(SeqBase):
         # Go away from Granny
         ctrl.dpad.down()
         # Detect when we return to regular control area
-        while player.pos.x < 7:
+        while player.refresh().pos.x < 7:
             wait_seconds(0.1)
         ctrl.dpad.none()
         return True
@@ -140,7 +140,7 @@ class SeqBombSkip(SeqSection2D):
         ctrl.confirm(tapping=True)
 
         player = self.zelda_mem().player
-        while not player.in_control:
+        while not player.refresh().in_control:
             ctrl.confirm(tapping=True)
         # TODO: Might be slightly unoptimal, but works
         ctrl.menu()
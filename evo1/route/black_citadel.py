@@ -49,12 +49,10 @@ class SeqZephyrosATB(SeqATBCombat):
                 return ATBPlan(actor, ATBAction.X_CRYSTAL, target=0)
 
     def handle_combat(self, should_run: bool = False):
-        # TODO: Handle double turn
-
         if self.cur_plan is None:
-            actor = self._cur_actor()
-            if actor is not None:
-                self.cur_plan = self.create_plan(actor)
+            # Prepared ahead of the turn (see _update_turns), double turns included
+            self.cur_plan = self._take_plan()
+            if self.cur_plan is not None:
                 logger.debug(f"Crafting plan: {self.cur_plan}")
 
         if self.cur_plan is not None:
@@ -4,7 +4,14 @@ from control import evo_ctrl
 from engine.mathlib import Facing, Vec2
 from engine.move2d import SeqGrabChest, SeqMove2D, SeqMove2DConfirm
 from engine.seq import SeqDelay, SeqList, SeqMashDelay, SeqMenu
-from evo1.atb import EncounterID, FarmingGoal, SeqATBCombat, SeqATBmove2D
+from evo1.atb import (
+    Encounter,
+    EncounterID,
+    FarmingGoal,
+    SeqATBCombat,
+    SeqATBmove2D,
+    wants,
+)
 from evo1.move2d import SeqZoneTransition
 from maps.evo1 import GetNavmap
 from memory.evo1 import MapID, get_zelda_memory
@@ -27,8 +34,17 @@ class CrystalCavernEncManip(SeqATBmove2D):
         precision: float = 0.2,
     ):
         self.pref_enc = pref_enc
+        self._is_pref = wants(pref_enc)
         super().__init__(name=name, coords=coords, goal=goal, precision=precision)
 
+    # A Kobra is only worth fighting if the first attack lands
+    _first_hit = staticmethod(wants(first_turn=lambda turn: turn.hit))
+
+    def _is_wanted(self, enc: Encounter) -> bool:
+        if not self._is_pref(enc):
+            return False
+        return enc.enc_id != EncounterID.KOBRA or self._first_hit(enc)
+
     # TODO: Leveling requirement should account for exp (if the first manip fails)
     def _should_manip(self) -> bool:
         # Check how close we are to getting an encounter
@@ -36,19 +52,8 @@ class CrystalCavernEncManip(SeqATBmove2D):
         enc_timer = mem.player.encounter_timer
 
         # If we are about to get an encounter, potentially manip (stop and wait)
-        if enc_timer < 0.1:
-            if self.next_enc.enc_id in self.pref_enc:
-                # If favorable and it's a Kobra, wait if we're going to miss
-                # TODO: Worth it?
-                return (
-                    not self.next_enc.first_turn.hit
-                    if self.next_enc.enc_id == EncounterID.KOBRA
-                    else False
-                )
-            else:
-                # Not favorable, wait
-                return True
-        return False
+        # TODO: Waiting for a Kobra that hits, worth it?
+        return enc_timer < 0.1 and not self._is_wanted(self.next_enc)
 
     # Returning true means we seize control instead of moving on
     def do_encounter_manip(self) -> bool:
@@ -6,6 +6,7 @@ from control import SeqLoadGame, SeqMenuConfirm, SeqMenuDown, evo_ctrl
 from engine.combat import SeqCombat3D, SeqMove2DClunkyCombat
 from engine.mathlib import Box2, Facing, Vec2, get_box_with_size, is_close
 from engine.move2d import (
+    SeqFlowMove2D,
     SeqGrabChest,
     SeqGrabChestKeyItem,
     SeqHoldInPlace,
@@ -435,19 +436,20 @@ class SolveFloorPuzzle(SeqSection2D):
         # While navigating the puzzle, keep an eye out for enemies/fireballs. Open menu to avoid damage
         ctrl = evo_ctrl()
         with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
+            nearby = mem.actor_index.in_box(
+                player_hitbox, [EKind.MONSTER, EKind.INTERACT]
+            )
+            for _, actor in nearby:
                 # Some issues with detection here; the floor is entities in the same cathegory as the fireballs
-                if player_hitbox.contains(actor.pos):
-                    kind = actor.kind
-                    is_enemy = kind == EKind.MONSTER
-                    # Fireballs will have target set, the floor will not
-                    is_projectile = kind == EKind.INTERACT and actor.target is not None
-                    if is_projectile or is_enemy:
-                        # 2. Time fireballs
-                        # 3. If caught (detect target?), open menu
-                        ctrl.menu()
-                        wait_seconds(0.4)
-                        ctrl.menu()
+                is_enemy = actor.kind == EKind.MONSTER
+                # Fireballs will have target set, the floor will not
+                is_projectile = not is_enemy and actor.target is not None
+                if is_projectile or is_enemy:
+                    # 2. Time fireballs
+                    # 3. If caught (detect target?), open menu
+                    ctrl.menu()
+                    wait_seconds(0.4)
+                    ctrl.menu()
         # TODO: Check for failures and reset
         return False
 
@@ -587,17 +589,14 @@ class NavigateFireballs(SeqSection2D):
         # While navigating the maze, keep an eye out for fireballs. Open menu to avoid damage
         ctrl = evo_ctrl()
         with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
-                if player_hitbox.contains(actor.pos):
-                    kind = actor.kind
-                    # Fireballs will have target set, the floor will not
-                    is_projectile = kind == EKind.INTERACT and actor.target is not None
-                    if is_projectile:
-                        # 2. Time fireballs
-                        # 3. If caught (detect target?), open menu
-                        ctrl.menu()
-                        wait_seconds(0.4)
-                        ctrl.menu()
+            for _, actor in mem.actor_index.in_box(player_hitbox, [EKind.INTERACT]):
+                # Fireballs will have target set, the floor will not
+                if actor.target is not None:
+                    # 2. Time fireballs
+                    # 3. If caught (detect target?), open menu
+                    ctrl.menu()
+                    wait_seconds(0.4)
+                    ctrl.menu()
         # TODO: Prep deathwarp
         # (1). Prep death warp by repeatedly moving into lava: Vec2(71, 31)
         # 2. Navigate over bridge and through maze: AStar start=Vec2(70, 31), goal=Vec2(70, 49)
@@ -663,14 +662,13 @@ class NoriaLavaMaze(SeqList):
         )
 
 
-class SeekDeath(SeqSection2D):
+# Walks back to the target when enemies knock us away
+class SeekDeath(SeqFlowMove2D):
     def __init__(self, name: str, target: Vec2):
-        super().__init__(name)
-        self.target = target
+        super().__init__(name, nav=_noria_astar, goal=target)
 
     def execute(self, delta: float) -> bool:
-        player_pos = self.zelda_mem().player.pos
-        move_to(player=player_pos, target=self.target, precision=0.2)
+        super().execute(delta)
         # TODO: Actively bump into enemies
         # Check if we are dead, if so, return to menu
         return get_memory().player_hearts <= 0
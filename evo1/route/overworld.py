@@ -4,21 +4,23 @@ from enum import Enum, auto
 from typing import Optional
 
 from control import evo_ctrl
-from engine.mathlib import Facing, Vec2, dist, is_close
+from engine.mathlib import Facing, Vec2, is_close
 from engine.move2d import SeqGrabChest, SeqMove2D, SeqMove2DCancel, move_to
 from engine.seq import SeqBase, SeqDelay, SeqInteract, SeqList
 from evo1.atb import (
     Encounter,
     EncounterID,
     FarmingGoal,
+    ManipAction,
     SeqATBmove2D,
-    calc_next_encounter,
+    find_manip,
+    get_encounter_forecast,
+    get_encounter_timer_model,
 )
 from evo1.move2d import SeqZoneTransition
 from evo1.route.aogai import AogaiWrongWarp
 from maps.evo1 import GetNavmap
 from memory.evo1 import EKind, IKind, MapID, get_memory, get_zelda_memory
-from memory.rng import EvolandRNG
 from term.window import WindowLayout
 
 _overworld_astar = GetNavmap(MapID.OVERWORLD)
@@ -44,13 +46,14 @@ class OverworldGliFarm(SeqATBmove2D):
         super().reset()
 
     _CHEST_LOCATION = Vec2(84, 46)
-    _CHEST_RNG_ADVANCE = 66  # Ticks the rng forward 66 steps
+    # Ticks the rng forward 66 steps. The time is only used by the farm planner
+    _CHEST_MANIP = ManipAction(name="chest", steps=66, time=1.5, uses=1)
     _GLI_PER_ENEMY = 50
 
-    def _should_manip(self) -> bool:
+    def _is_better(self, enc: Encounter) -> bool:
         # self.next_enc already calculated
         next_nr_enemies = len(self.next_enc.enemies)
-        manip_nr_enemies = len(self.manipulated_enc.enemies)
+        manip_nr_enemies = len(enc.enemies)
 
         next_gli = next_nr_enemies * self._GLI_PER_ENEMY
         manip_gli = manip_nr_enemies * self._GLI_PER_ENEMY
@@ -64,8 +67,7 @@ class OverworldGliFarm(SeqATBmove2D):
             # Don't manip if we're already done farming
             return False
         elif (
-            self.next_enc.enc_id == EncounterID.EMUK
-            and self.manipulated_enc.enc_id == EncounterID.SLIME
+            self.next_enc.enc_id == EncounterID.EMUK and enc.enc_id == EncounterID.SLIME
         ):
             # Slime is generally faster than emuk
             return True
@@ -76,6 +78,13 @@ class OverworldGliFarm(SeqATBmove2D):
             # Else, go for the encounter that gives the most gli
             return manip_gli > next_gli
 
+    def _can_reach_chest(self) -> bool:
+        # The chest only works before the next encounter if we get there first
+        player = get_zelda_memory().player
+        return get_encounter_timer_model().reaches(
+            player.pos, player.encounter_timer, [self._CHEST_LOCATION], player.speed
+        )
+
     class _MANIP_FSM(Enum):
         CAN_MANIP = auto()
         STARTED_MANIP = auto()
@@ -94,17 +103,18 @@ class OverworldGliFarm(SeqATBmove2D):
         match self.manip_state:
             case self._MANIP_FSM.CAN_MANIP:
                 # Check if we are outside range of the chest for next enc
-                dist_to_chest = dist(player.pos, self._CHEST_LOCATION)
-                if not dist_to_chest < player.encounter_timer:
+                if not self._can_reach_chest():
                     return False
 
-                # Calculate the manipulated encounter
-                rng = EvolandRNG().get_rng()
-                rng.advance_rng(self._CHEST_RNG_ADVANCE)
-                self.manipulated_enc = calc_next_encounter(rng, clink_level=0)
-
-                if not self._should_manip():
+                # Search for a better encounter (the next one is never better than
+                # itself, so an empty manip means there is nothing to gain)
+                forecast, offset = get_encounter_forecast(clink_level=0)
+                manip = find_manip(
+                    forecast, offset, [self._CHEST_MANIP], goal=self._is_better
+                )
+                if manip is None or not manip.actions:
                     return False
+                self.manipulated_enc = manip.encounter
                 # Initiate the manip
                 logger.info(
                     f"Picking up chest to forward rng. {self.manipulated_enc} is better than {self.next_enc}"
@@ -166,6 +176,7 @@ class OverworldToMeadow(SeqList):
                         farm_coords=[Vec2(87, 44), Vec2(87, 43)],
                         precision=0.2,
                         gli_goal=200,
+                        nav=_overworld_astar,
                     ),
                 ),
                 SeqZoneTransition(
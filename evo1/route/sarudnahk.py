@@ -8,7 +8,21 @@ from control import evo_ctrl
 
 # from engine.combat import SeqMove2DClunkyCombat
 from engine.blackboard import blackboard
-from engine.mathlib import Facing, Vec2, cross, dist, is_close, is_left
+from engine.boids import (
+    BoidKind,
+    BoidWeights,
+    boid_steering,
+    get_boid_recorder,
+    pack_actors,
+)
+from engine.mathlib import (
+    Facing,
+    Vec2,
+    cross,
+    dist,
+    is_close,
+    is_left,
+)
 from engine.move2d import (
     SeqGrabChest,
     SeqGrabChestKeyItem,
@@ -17,8 +31,9 @@ from engine.move2d import (
     move_to,
 )
 from engine.seq import SeqCheckpoint, SeqList
+from engine.spatial import Tags
 from evo1.move2d import SeqZoneTransition
-from maps.evo1.maps import GetNavmap
+from maps.evo1.maps import GetNavmap, GetNavNode
 from memory import ZeldaMemory
 from memory.evo1 import (
     EKind,
@@ -92,82 +107,47 @@ class SeqDiabloCombat(SeqDiabloMove2D):
         health: float = mem.player_hearts
         return health < self._HEAL_GLITCH_THRESHOLD
 
-    # Boid rules:
+    # Boid rules, see engine.boids:
     # 1. Move towards goal
-    # 2. Avoid enemies
+    # 2. Avoid enemies (skeletons are weighed higher, they are dangerous)
     # 3. Grab health
     # Move at full speed using the final direction vector from all rules
     # Restrict vision to a cone to avoid distractions?
 
-    _BOID_AVOID_RANGE = 4
-    # Weigh skeletons higher, they are dangerous
-    _BOID_SKELETON_MULT = 2
-
-    def _get_boid_enemy_adjustment(self, player_pos: Vec2) -> Vec2:
-        mem = get_diablo_memory()
-        ret = Vec2(0, 0)
-        with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
-                actor_kind = actor.kind
-                # Avoid enemies and fireballs
-                if actor_kind == EKind.MONSTER or (
-                    actor_kind == EKind.INTERACT and actor.ikind == IKind.FIRE
-                ):
-                    factor = 1
-                    # Check if we should weigh this enemy more heavily
-                    if actor_kind == EKind.MONSTER and actor.mkind == MKind.SKELETON:
-                        factor = self._BOID_SKELETON_MULT
-                    actor_pos = actor.pos
-                    if is_close(
-                        player_pos, actor_pos, precision=self._BOID_AVOID_RANGE
-                    ):
-                        ret = ret + ((player_pos - actor_pos) * factor)
-        return ret
-
-    _BOID_HEALTH_RANGE = 2
-
-    # TODO: Move towards closest instead?
-    def _get_boid_health_adjustment(self, player_pos: Vec2) -> Vec2:
-        mem = get_diablo_memory()
-        ret = Vec2(0, 0)
-        with contextlib.suppress(ReferenceError):
-            for actor in mem.actors:
-                # Move towards life pickups
-                if actor.kind == EKind.INTERACT and actor.ikind == IKind.LIFE_GLOBE:
-                    actor_pos = actor.pos
-                    if is_close(
-                        player_pos, actor_pos, precision=self._BOID_HEALTH_RANGE
-                    ):
-                        ret = ret + (actor_pos - player_pos)
-        return ret
-
-    _MIN_TARGET_WEIGHT = 1
-    _BOID_HEALTH_FACTOR = 0.4
-    _BOID_AVOID_FACTOR = 0.4
-
     # TODO: Tweak weights
+    _BOID_WEIGHTS = BoidWeights()
+    _BOID_AVOID = _BOID_WEIGHTS.avoid_table()
+
+    @staticmethod
+    def _boid_kind(tags: Tags) -> BoidKind:
+        # Kind tags of the actor index, see Evo1ZeldaMemory._actor_tags
+        match tags:
+            case (EKind.MONSTER, MKind.SKELETON):
+                return BoidKind.SKELETON
+            case (EKind.MONSTER, _):
+                return BoidKind.MONSTER
+            case (EKind.INTERACT, IKind.FIRE):
+                return BoidKind.FIRE
+            case (EKind.INTERACT, IKind.LIFE_GLOBE):
+                return BoidKind.LIFE_GLOBE
+        return BoidKind.IGNORE
+
     def _get_boid_movement(self, player_pos: Vec2, target: Vec2) -> Vec2:
         """Combine movement from target, enemy and health"""
-        move_vector = target - player_pos
-        # Check if we are close enough to proceed to the next checkpoint
-        if move_vector.norm < self._MIN_TARGET_WEIGHT:
-            return move_vector.normalized
-        move_vector = move_vector.normalized
-
-        move_vector = move_vector + (
-            self._get_boid_enemy_adjustment(player_pos).normalized
-            * self._BOID_AVOID_FACTOR
-        )
-        heal_factor = (
-            self._BOID_HEALTH_FACTOR
-            if self._need_healing()
-            else self._BOID_HEALTH_FACTOR / 3
+        # The index of the tick is shared with the attack check
+        positions, kinds = pack_actors(get_diablo_memory().actor_index, self._boid_kind)
+        need_healing = self._need_healing()
+        if (recorder := get_boid_recorder()) is not None:
+            recorder.record(player_pos, target, positions, kinds, need_healing)
+        return boid_steering(
+            player_pos,
+            target,
+            positions,
+            kinds,
+            self._BOID_WEIGHTS,
+            need_healing,
+            self._BOID_AVOID,
         )
-        move_vector = move_vector + (
-            self._get_boid_health_adjustment(player_pos).normalized * heal_factor
-        )
-
-        return move_vector.normalized
 
     # OVERRIDE OF SeqMove2d
     def move_function(self, player_pos: Vec2, target_pos: Vec2):
@@ -198,13 +178,9 @@ class SeqDiabloCombat(SeqDiabloMove2D):
             ahead = player_pos + direction_vec * 0.5
 
             # TODO: More complex attack pattern? Currently clears ahead with combo
-            with contextlib.suppress(ReferenceError):
-                for actor in mem.actors:
-                    if actor.kind == EKind.MONSTER and is_close(
-                        ahead, actor.pos, precision=self._ATTACK_RANGE
-                    ):
-                        self.attack.update(delta)
-                        return False
+            if mem.actor_index.in_radius(ahead, self._ATTACK_RANGE, [EKind.MONSTER]):
+                self.attack.update(delta)
+                return False
             self.attack.reset()
         ctrl.toggle_attack(False)
         return done
@@ -428,16 +404,16 @@ class SeqGrabChestDiablo(SeqSection2D):
         return False
 
 
-_ENTRANCE = _ruins_nav.map[0]
-_CHAR_SEL_CHEST = _ruins_nav.map[2]
-_COMBO_CHEST = _ruins_nav.map[4]
-_LIFEBAR_CHEST = _ruins_nav.map[7]
-_AMBIENT_CHEST = _ruins_nav.map[13]
-_BOSS_CHEST = _ruins_nav.map[39]
-_GATE = _ruins_nav.map[42]
-_AMULET_CHEST = _ruins_nav.map[46]
-_PORTAL_CHEST = _ruins_nav.map[48]
-_TOWN_PORTAL = _ruins_nav.map[49]
+_ENTRANCE = GetNavNode(MapID.SARUDNAHK, 0)
+_CHAR_SEL_CHEST = GetNavNode(MapID.SARUDNAHK, 2)
+_COMBO_CHEST = GetNavNode(MapID.SARUDNAHK, 4)
+_LIFEBAR_CHEST = GetNavNode(MapID.SARUDNAHK, 7)
+_AMBIENT_CHEST = GetNavNode(MapID.SARUDNAHK, 13)
+_BOSS_CHEST = GetNavNode(MapID.SARUDNAHK, 39)
+_GATE = GetNavNode(MapID.SARUDNAHK, 42)
+_AMULET_CHEST = GetNavNode(MapID.SARUDNAHK, 46)
+_PORTAL_CHEST = GetNavNode(MapID.SARUDNAHK, 48)
+_TOWN_PORTAL = GetNavNode(MapID.SARUDNAHK, 49)
 
 
 class SarudnahkToBoss(SeqList):
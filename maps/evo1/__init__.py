@@ -1,7 +1,17 @@
-from maps.evo1.maps import CurrentTilemap, GetNavmap, GetTilemap
+from maps.evo1.maps import (
+    CurrentTilemap,
+    GetNavmap,
+    GetNavNode,
+    GetTilemap,
+    PreloadMaps,
+    SetMapPreload,
+)
 
 __all__ = [
     "CurrentTilemap",
     "GetNavmap",
+    "GetNavNode",
     "GetTilemap",
+    "PreloadMaps",
+    "SetMapPreload",
 ]
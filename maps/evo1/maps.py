@@ -1,31 +1,135 @@
-from typing import Dict, Optional
-
-from engine.pathing import AStar, NavMesh, Pathing, TileMap
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+
+from engine.mathlib import Vec2
+from engine.pathing import JPS, AStar, NavMesh, PathCache, Pathing, TileMap
 from memory.evo1 import MapID, get_memory
 
+logger = logging.getLogger(__name__)
 
-class NavMap:
-    def __init__(self) -> None:
-        self.tilemap: Optional[TileMap] = None
-        self.nav: Optional[Pathing] = None
 
+class NavMap(ABC):
+    """
+    Map entry. The tilemap and navigation are only loaded on first use, or ahead of
+    time by the preload worker (see PreloadMaps).
+    """
+
+    # Search used, kept with the cached paths
+    _SEARCH = "astar"
 
-class AStarNavMap(NavMap):
     def __init__(self, filename: str) -> None:
-        self.tilemap = TileMap(filename=filename)
-        self.nav = AStar(self.tilemap.map)
+        self.filename = filename
+        # Shared with the preload worker
+        self._lock = threading.RLock()
+        self._tilemap: Optional[TileMap] = None
+        self._nav: Optional[Pathing] = None
+        self._cache: Optional[PathCache] = None
+        self._nodes: Optional[list[Vec2]] = None
+
+    @abstractmethod
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        pass
+
+    @property
+    def loaded(self) -> bool:
+        return self._nav is not None
+
+    def load(self) -> None:
+        with self._lock:
+            if self._nav is not None:
+                return
+            tilemap = TileMap(filename=self.filename)
+            nav = self._create_nav(tilemap)
+            nav.cache = self.cache
+            self._tilemap, self._nav = tilemap, nav
+
+    @property
+    def cache(self) -> PathCache:
+        with self._lock:
+            if self._cache is None:
+                self._cache = PathCache(self.filename, search=self._SEARCH)
+            return self._cache
+
+    @property
+    def nodes(self) -> list[Vec2]:
+        # NavMesh nodes, read from the map file if the map isn't loaded
+        with self._lock:
+            if self._nodes is None:
+                self._nodes = (
+                    self._tilemap.nav_nodes
+                    if self._tilemap is not None
+                    else TileMap.read_nav_nodes(self.filename)
+                )
+            return self._nodes
+
+    @property
+    def tilemap(self) -> TileMap:
+        self.load()
+        return self._tilemap
+
+    @property
+    def nav(self) -> Pathing:
+        self.load()
+        return self._nav
+
+
+class AStarNavMap(NavMap):
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        return AStar(tilemap.map, smooth=tilemap.smooth_paths)
+
+
+# Jump Point Search, faster than AStar on large open grids. Opt-in per map
+class JPSNavMap(NavMap):
+    _SEARCH = "jps"
+
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        return JPS(tilemap.map, smooth=tilemap.smooth_paths)
 
 
 class NavMeshNavMap(NavMap):
-    def __init__(self, filename: str) -> None:
-        self.tilemap = TileMap(filename=filename)
-        self.nav = NavMesh(
-            map_nodes=self.tilemap.nav_nodes, edges=self.tilemap.nav_edges
+    _SEARCH = "navmesh"
+
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        return NavMesh(map_nodes=tilemap.nav_nodes, edges=tilemap.nav_edges)
+
+
+class LazyNav:
+    """
+    Stand-in for the Pathing of a map, handed out by GetNavmap so that routes can
+    hold on to it at import. Paths found in the path cache don't load the map at all,
+    anything else loads it and is forwarded to the real Pathing.
+    """
+
+    def __init__(self, navmap: NavMap) -> None:
+        self._navmap = navmap
+
+    def calculate(
+        self,
+        start: Vec2,
+        goal: Vec2,
+        final_pos: Optional[Vec2] = None,
+        free_move: bool = True,
+    ) -> list[Vec2]:
+        return self._navmap.cache.calculate(
+            self._search, start, goal, final_pos, free_move
         )
 
+    def _search(
+        self, start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> list[Vec2]:
+        return self._navmap.nav.search(start, goal, final_pos, free_move)
+
+    def __getattr__(self, name: str):
+        return getattr(self._navmap.nav, name)
+
 
 _sacred_grove = AStarNavMap("maps/evo1/sacred_grove.yaml")
 
+# JPSNavMap is faster on large open grids (see benchmarks/jps.py) but its paths are
+# not checked in game yet. Switch a map to it once its route is verified
 _maps: Dict[MapID, NavMap] = {
     MapID.EDEL_VALE: AStarNavMap("maps/evo1/edel_vale.yaml"),
     MapID.OVERWORLD: AStarNavMap("maps/evo1/overworld.yaml"),
@@ -49,6 +153,70 @@ _maps: Dict[MapID, NavMap] = {
 }
 
 
+# Order in which the maps are visited in the route, used to preload the next ones
+_ROUTE_ORDER = [
+    MapID.EDEL_VALE,
+    MapID.OVERWORLD,
+    MapID.MEADOW,
+    MapID.PAPURIKA,
+    MapID.PAPURIKA_INTERIOR,
+    MapID.CRYSTAL_CAVERN,
+    MapID.LIMBO,
+    MapID.NORIA_CLOSED,
+    MapID.NORIA,
+    MapID.AOGAI,
+    MapID.SACRED_GROVE_2D,
+    MapID.SACRED_GROVE_CAVE_1,
+    MapID.SACRED_GROVE_CAVE_2,
+    MapID.SARUDNAHK,
+    MapID.END,
+]
+# Number of maps ahead to preload (0 to disable)
+_preload_ahead = 0
+_preload_queue: "queue.Queue[NavMap]" = queue.Queue()
+_preload_worker: Optional[threading.Thread] = None
+_last_map: Optional[MapID] = None
+
+
+def _preload_loop() -> None:
+    while True:
+        navmap = _preload_queue.get()
+        try:
+            navmap.load()
+        except Exception:
+            # The map is loaded again (and fails loudly) when it is actually used
+            logger.exception(f"Failed to preload {navmap.filename}")
+
+
+def PreloadMaps(map_ids: Iterable[MapID]) -> None:
+    """Load the given maps in the background, on a worker thread."""
+    global _preload_worker
+    if _preload_worker is None:
+        _preload_worker = threading.Thread(
+            target=_preload_loop, name="map_preload", daemon=True
+        )
+        _preload_worker.start()
+    for map_id in map_ids:
+        if (navmap := _maps.get(map_id)) and not navmap.loaded:
+            _preload_queue.put(navmap)
+
+
+def SetMapPreload(ahead: int) -> None:
+    """Preload the next `ahead` maps of the route whenever the current map changes."""
+    global _preload_ahead
+    _preload_ahead = ahead
+
+
+def _preload_next(map_id: MapID) -> None:
+    global _last_map
+    if map_id == _last_map:
+        return
+    _last_map = map_id
+    if _preload_ahead > 0 and map_id in _ROUTE_ORDER:
+        index = _ROUTE_ORDER.index(map_id) + 1
+        PreloadMaps(_ROUTE_ORDER[index : index + _preload_ahead])
+
+
 def GetTilemap(map_id: MapID) -> Optional[TileMap]:
     return navmap.tilemap if (navmap := _maps.get(map_id)) else None
 
@@ -56,8 +224,15 @@ def GetTilemap(map_id: MapID) -> Optional[TileMap]:
 def CurrentTilemap() -> Optional[TileMap]:
     mem = get_memory()
     current_map = mem.map_id
+    _preload_next(current_map)
     return navmap.tilemap if (navmap := _maps.get(current_map)) else None
 
 
+def GetNavNode(map_id: MapID, index: int) -> Vec2:
+    """Node of the map's NavMesh graph. Doesn't load the map."""
+    return _maps[map_id].nodes[index]
+
+
 def GetNavmap(map_id: MapID) -> Pathing:
-    return _maps.get(map_id).nav
+    # Typed as Pathing, the proxy has the same API
+    return LazyNav(_maps[map_id])
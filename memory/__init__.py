@@ -1,8 +1,15 @@
-from memory.rng import EvolandRNG
+from memory.rng import EvolandRNG, RNGLookahead, get_rng_memory
+from memory.rng_tracker import RNGTracker, get_rng_tracker
+from memory.snapshot import TickSnapshot
 from memory.zelda_base import GameEntity2D, ZeldaMemory
 
 __all__ = [
     "EvolandRNG",
+    "RNGLookahead",
+    "get_rng_memory",
+    "RNGTracker",
+    "get_rng_tracker",
+    "TickSnapshot",
     "ZeldaMemory",
     "GameEntity2D",
 ]
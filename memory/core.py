@@ -3,6 +3,7 @@ import ctypes
 import ctypes.wintypes
 import logging
 import os
+from typing import Optional
 
 import pymem
 from ReadWriteMemory import Process, ReadWriteMemory, ReadWriteMemoryError
@@ -71,6 +72,18 @@ class LocProcess(Process):
         lp_buffer = ctypes.c_uint64()
         return self._read_val(lp_base_address=lp_base_address, lp_buffer=lp_buffer)
 
+    def read_buffer(self, lp_base_address: int, lp_buffer) -> None:
+        """Fill a preallocated ctypes buffer with a single bulk read."""
+        bytes_read = ctypes.c_size_t()
+        if not ctypes.windll.kernel32.ReadProcessMemory(
+            self.handle,
+            lp_base_address,
+            ctypes.byref(lp_buffer),
+            ctypes.sizeof(lp_buffer),
+            ctypes.byref(bytes_read),
+        ):
+            raise ReferenceError(lp_base_address)
+
     def read_string(self, lp_base_address: int, str_len: int) -> str:
         ret = ""
         for i in range(str_len):
@@ -79,6 +92,65 @@ class LocProcess(Process):
         return ret
 
 
+class PointerCache:
+    """
+    Resolved pointer chains, keyed by (base, offsets).
+
+    Only the first link of a chain (the value stored at base) is read again, once per
+    tick, and shared by every chain starting at the same base. While it is unchanged,
+    the rest of the chain is reused. All chains are dropped when the generation changes
+    (Evoland1Memory uses the map id). Chains that can change within a generation, like
+    the ones into a battle, live in their own scope and are dropped by the owner.
+    """
+
+    def __init__(self, mem: "EvolandMemory") -> None:
+        self._mem = mem
+        self.generation = None
+        # scope -> (base, offsets) -> (first link, resolved pointer)
+        self._chains: dict[
+            Optional[str], dict[tuple[int, tuple[int, ...]], tuple[int, int]]
+        ] = {}
+        # base -> (tick, first link)
+        self._links: dict[int, tuple[int, int]] = {}
+
+    def set_generation(self, generation) -> None:
+        if generation != self.generation:
+            self.generation = generation
+            self.invalidate()
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        """Drop the chains of a scope, or everything when no scope is given."""
+        if scope is not None:
+            self._chains.pop(scope, None)
+            return
+        self._chains.clear()
+        self._links.clear()
+
+    def _first_link(self, base: int) -> int:
+        tick = self._mem.tick
+        link = self._links.get(base)
+        if link is None or link[0] != tick:
+            link = (tick, self._mem.process.read(base))
+            self._links[base] = link
+        return link[1]
+
+    def get_pointer(
+        self, base: int, offsets: list[int], scope: Optional[str] = None
+    ) -> int:
+        if not offsets:
+            return base
+        key = (base, tuple(offsets))
+        first_link = self._first_link(base)
+        chains = self._chains.setdefault(scope, {})
+        chain = chains.get(key)
+        if chain is not None and chain[0] == first_link:
+            return chain[1]
+        # Walk the full chain, raises ValueError like the uncached version
+        ptr = self._mem.process.get_pointer(base, offsets)
+        chains[key] = (first_link, ptr)
+        return ptr
+
+
 # Process Permissions
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_VM_OPERATION = 0x0008
@@ -92,6 +164,12 @@ class EvolandMemory(ReadWriteMemory):
     def __init__(self, *args, **kwargs):
         super(EvolandMemory, self).__init__(*args, **kwargs)
         self.process = LocProcess()
+        # Incremented once per sequencer frame. Used to expire per-tick snapshots
+        self.tick = 0
+        self.pointers = PointerCache(self)
+
+    def next_tick(self) -> None:
+        self.tick += 1
 
     def initialize(
         self, process_name: str = "Evoland.exe", dll_name: str = "libhl.dll"
@@ -1,4 +1,4 @@
-from memory.evo1.atb import BattleEntity, BattleMemory
+from memory.evo1.atb import BattleEntity, BattleMemory, get_battle_memory
 from memory.evo1.base import Evo1Weapon, get_memory, load_memory
 from memory.evo1.diablo import (
     Evo1DiabloEntity,
@@ -7,8 +7,10 @@ from memory.evo1.diablo import (
     load_diablo_memory,
 )
 from memory.evo1.kind import EKind, IKind, MKind
+from memory.evo1.manager import update_memory
 from memory.evo1.map_id import MapID
 from memory.evo1.zelda import (
+    ActorTable,
     Evo1GameEntity2D,
     Evo1ZeldaMemory,
     get_zelda_memory,
@@ -18,10 +20,13 @@ from memory.evo1.zelda import (
 __all__ = [
     "BattleEntity",
     "BattleMemory",
+    "get_battle_memory",
+    "update_memory",
     "load_zelda_memory",
     "get_zelda_memory",
     "Evo1ZeldaMemory",
     "Evo1GameEntity2D",
+    "ActorTable",
     "load_diablo_memory",
     "get_diablo_memory",
     "Evo1DiabloMemory",
@@ -4,6 +4,7 @@ import logging
 
 from memory.core import LIBHL_OFFSET, LocProcess, mem_handle
 from memory.evo1.zelda import get_zelda_memory
+from memory.snapshot import LazyView
 
 logger = logging.getLogger(__name__)
 
@@ -32,40 +33,49 @@ class BattleEntity:
         self.setup_pointers()
 
     def setup_pointers(self) -> None:
-        self.max_hp_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._MAX_HP_PTR
+        pointers = mem_handle().pointers
+        self.max_hp_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._MAX_HP_PTR, scope=BattleMemory.SCOPE
         )
-        self.cur_hp_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._CUR_HP_PTR
+        self.cur_hp_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._CUR_HP_PTR, scope=BattleMemory.SCOPE
         )
-        self.atk_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._ATK_PTR)
-        self.def_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._DEF_PTR)
-        self.evade_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._EVADE_PTR
+        self.atk_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._ATK_PTR, scope=BattleMemory.SCOPE
         )
-        self.magic_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._MAGIC_PTR
+        self.def_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._DEF_PTR, scope=BattleMemory.SCOPE
         )
-        self.turn_gauge_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TURN_GAUGE_PTR
+        self.evade_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._EVADE_PTR, scope=BattleMemory.SCOPE
         )
-        self.turn_gauge_speed_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TURN_GAUGE_SPEED_PTR
+        self.magic_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._MAGIC_PTR, scope=BattleMemory.SCOPE
         )
-        self.turn_counter_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TURN_COUNTER_PTR
+        self.turn_gauge_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._TURN_GAUGE_PTR, scope=BattleMemory.SCOPE
         )
-        self.timer_since_turn_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TIMER_SINCE_TURN_PTR
+        self.turn_gauge_speed_ptr = pointers.get_pointer(
+            self.entity_ptr,
+            offsets=self._TURN_GAUGE_SPEED_PTR,
+            scope=BattleMemory.SCOPE,
         )
-        self.name_buf_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._NAME_BUF_PTR
+        self.turn_counter_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._TURN_COUNTER_PTR, scope=BattleMemory.SCOPE
         )
-        self.name_len_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._NAME_LEN_PTR
+        self.timer_since_turn_ptr = pointers.get_pointer(
+            self.entity_ptr,
+            offsets=self._TIMER_SINCE_TURN_PTR,
+            scope=BattleMemory.SCOPE,
         )
-        self.is_running_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._IS_RUNNING_PTR
+        self.name_buf_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._NAME_BUF_PTR, scope=BattleMemory.SCOPE
+        )
+        self.name_len_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._NAME_LEN_PTR, scope=BattleMemory.SCOPE
+        )
+        self.is_running_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._IS_RUNNING_PTR, scope=BattleMemory.SCOPE
         )
 
     @property
@@ -119,6 +129,10 @@ class BattleEntity:
 
 
 class BattleMemory:
+    # Pointer cache scope. A new battle allocates new structures, so these chains are
+    # dropped whenever we are out of battle
+    SCOPE = "battle"
+
     # All battle data is stored here
     _BATTLE_BASE_PTR = [0x860, 0x0, 0x244]
     # All allies are listed here
@@ -141,14 +155,18 @@ class BattleMemory:
         self.active = False
         mem = get_zelda_memory()
         if mem.player.in_control:
+            mem_handle().pointers.invalidate(scope=self.SCOPE)
             return
 
         # Set up memory access, get the base pointer to the battle structure
         mem = mem_handle()
         self.process = mem.process
         self.base_addr = mem.base_addr
-        self.base_offset = self.process.get_pointer(
-            self.base_addr + LIBHL_OFFSET, offsets=self._BATTLE_BASE_PTR
+        self.pointers = mem.pointers
+        self.base_offset = self.pointers.get_pointer(
+            self.base_addr + LIBHL_OFFSET,
+            offsets=self._BATTLE_BASE_PTR,
+            scope=self.SCOPE,
         )
 
         self.menu_open = False
@@ -172,33 +190,42 @@ class BattleMemory:
             self.active = False
 
         if self.active:
-            with contextlib.suppress(ValueError):
-                self.cursor_ptr = self.process.get_pointer(
-                    self.base_offset, offsets=self._PLAYER_ATB_MENU_CURSOR_PTR
-                )
-                self.menu_open = True
-
-            with contextlib.suppress(ValueError):
-                self.spec_cursor_ptr = self.process.get_pointer(
-                    self.base_offset, offsets=self._PLAYER_ATB_SPECIAL_MENU_CURSOR_PTR
-                )
-                self.spec_menu_open = True
+            self.update_cursors()
+
+    def update_cursors(self):
+        # Menus are opened and closed during the battle, always walk these chains.
+        # Walk them again after opening a sub-menu
+        self.menu_open = False
+        self.spec_menu_open = False
+        with contextlib.suppress(ValueError):
+            self.cursor_ptr = self.process.get_pointer(
+                self.base_offset, offsets=self._PLAYER_ATB_MENU_CURSOR_PTR
+            )
+            self.menu_open = True
+
+        with contextlib.suppress(ValueError):
+            self.spec_cursor_ptr = self.process.get_pointer(
+                self.base_offset, offsets=self._PLAYER_ATB_SPECIAL_MENU_CURSOR_PTR
+            )
+            self.spec_menu_open = True
 
     def _init_entities(
         self, array_size_ptr: list[int], array_base_ptr: list[int]
     ) -> list[BattleEntity]:
         entities: list[BattleEntity] = []
-        entities_arr_size_ptr = self.process.get_pointer(
-            self.base_offset, offsets=array_size_ptr
+        entities_arr_size_ptr = self.pointers.get_pointer(
+            self.base_offset, offsets=array_size_ptr, scope=self.SCOPE
         )
         entities_arr_size = self.process.read_u32(entities_arr_size_ptr)
-        entities_arr_offset = self.process.get_pointer(
-            self.base_offset, offsets=array_base_ptr
+        entities_arr_offset = self.pointers.get_pointer(
+            self.base_offset, offsets=array_base_ptr, scope=self.SCOPE
         )
         for i in range(entities_arr_size):
             # Set enemy offsets
             entity_offset = self._FIRST_ENT_OFFSET + i * self._ENT_PTR_SIZE
-            entity_ptr = self.process.get_pointer(entities_arr_offset, [entity_offset])
+            entity_ptr = self.pointers.get_pointer(
+                entities_arr_offset, [entity_offset], scope=self.SCOPE
+            )
             entities.append(BattleEntity(self.process, entity_ptr))
         return entities
 
@@ -224,3 +251,11 @@ class BattleMemory:
         in_control = mem.player.in_control
         battle_active = False if in_control else self.active
         return battle_active
+
+
+# Shared by execute and render. Not snapshotted, the menu cursors are polled
+_battle_mem = LazyView(BattleMemory, snapshot=False)
+
+
+def get_battle_memory() -> BattleMemory:
+    return _battle_mem.get()
@@ -3,6 +3,7 @@ from enum import Enum
 # Libraries and Core Files
 from memory.core import LIBHL_OFFSET, mem_handle
 from memory.evo1.map_id import MapID
+from memory.snapshot import LazyView
 
 
 class Evo1Weapon(Enum):
@@ -39,28 +40,41 @@ class Evoland1Memory:
         mem = mem_handle()
         self.process = mem.process
         self.base_addr = mem.base_addr
+        self.pointers = mem.pointers
 
-        self.base_ptr = self.process.get_pointer(
+        self._track_map()
+        self.base_ptr = self.pointers.get_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._GAME_PTR
         )
         self.setup_pointers()
 
+    def _track_map(self) -> None:
+        # The map id is always resolved from scratch, a map change expires every
+        # cached pointer chain
+        self.map_id_ptr = self.process.get_pointer(
+            self.base_addr + LIBHL_OFFSET, offsets=self._GAME_PTR + self._MAP_ID_PTR
+        )
+        try:
+            map_id = self.process.read_u32(self.map_id_ptr)
+        except ReferenceError:
+            map_id = None
+        self.pointers.set_generation(map_id)
+
     def setup_pointers(self):
-        self.player_hp_overworld_ptr = self.process.get_pointer(
+        self.player_hp_overworld_ptr = self.pointers.get_pointer(
             self.base_ptr, offsets=self._PLAYER_HP_OVERWORLD_PTR
         )
-        self.gli_ptr = self.process.get_pointer(self.base_ptr, offsets=self._GLI_PTR)
-        self.map_id_ptr = self.process.get_pointer(self.base_ptr, self._MAP_ID_PTR)
-        self.lvl_ptr = self.process.get_pointer(self.base_ptr, self._PLAYER_LVL_PTR)
-        self.current_weapon_ptr = self.process.get_pointer(
+        self.gli_ptr = self.pointers.get_pointer(self.base_ptr, offsets=self._GLI_PTR)
+        self.lvl_ptr = self.pointers.get_pointer(self.base_ptr, self._PLAYER_LVL_PTR)
+        self.current_weapon_ptr = self.pointers.get_pointer(
             self.base_ptr, self._CUR_WEAPON_PTR
         )
-        self.nr_potions_ptr = self.process.get_pointer(self.base_ptr, self._NR_POTIONS)
+        self.nr_potions_ptr = self.pointers.get_pointer(self.base_ptr, self._NR_POTIONS)
 
     # Only valid in zelda map
     @property
     def player_hearts(self) -> float:
-        player_hearts_ptr = self.process.get_pointer(
+        player_hearts_ptr = self.pointers.get_pointer(
             self.base_ptr, offsets=self._PLAYER_HP_ZELDA_PTR
         )
         return self.process.read_double(player_hearts_ptr)
@@ -90,13 +104,13 @@ class Evoland1Memory:
         return Evo1Weapon(self.process.read_u32(self.current_weapon_ptr))
 
 
-_mem = None
+# Properties are read at most once per tick, shared by execute and render
+_mem = LazyView(Evoland1Memory)
 
 
 def load_memory() -> None:
-    global _mem
-    _mem = Evoland1Memory()
+    _mem.load()
 
 
 def get_memory() -> Evoland1Memory:
-    return _mem
+    return _mem.get()
@@ -1,8 +1,8 @@
 # Libraries and Core Files
 import logging
 
-from memory.core import LocProcess
-from memory.evo1.zelda import Evo1GameEntity2D, Evo1ZeldaMemory
+from memory.evo1.zelda import ActorTable, Evo1GameEntity2D, Evo1ZeldaMemory
+from memory.snapshot import LazyView
 
 logger = logging.getLogger(__name__)
 
@@ -11,19 +11,14 @@ logger = logging.getLogger(__name__)
 class Evo1DiabloEntity(Evo1GameEntity2D):
     """Memory representation of HackMonster (Sarudnahk section)."""
 
+    # Resolved by Evo1GameEntity2D.setup_pointers, also when the entity is reused
     _MKIND_PTR = [0xA4, 0x4]  # MKind enum (overrides base class)
     _HP_PTR = [0x108]  # double (overrides base class)
 
-    def __init__(self, process: LocProcess, entity_ptr: int):
-        super().__init__(process, entity_ptr)
-        # Overrides
-        self.mkind_ptr = self.process.get_pointer(entity_ptr, offsets=self._MKIND_PTR)
-        self.hp_ptr = self.process.get_pointer(entity_ptr, offsets=self._HP_PTR)
-
     # Override (double instead of int)
     @property
     def hp(self) -> float:
-        return self.process.read_double(self.hp_ptr)
+        return self._read_double(self.hp_ptr)
 
 
 class Evo1DiabloMemory(Evo1ZeldaMemory):
@@ -31,16 +26,17 @@ class Evo1DiabloMemory(Evo1ZeldaMemory):
 
     # Override to get correct class
     def _alloc_monster(self, actor_ptr) -> Evo1DiabloEntity:
-        return Evo1DiabloEntity(self.process, actor_ptr)
+        return Evo1DiabloEntity(self.process, actor_ptr, self.snapshot)
 
 
-_diablo_mem = None
+_diablo_actors = ActorTable()
+# Properties are read at most once per tick, shared by execute and render
+_diablo_mem = LazyView(lambda: Evo1DiabloMemory(actors=_diablo_actors))
 
 
 def load_diablo_memory() -> None:
-    global _diablo_mem
-    _diablo_mem = Evo1DiabloMemory()
+    _diablo_mem.load()
 
 
 def get_diablo_memory() -> Evo1DiabloMemory:
-    return _diablo_mem
+    return _diablo_mem.get()
@@ -0,0 +1,37 @@
+import contextlib
+from typing import Optional
+
+from memory.evo1.base import get_memory, load_memory
+from memory.evo1.diablo import get_diablo_memory
+from memory.evo1.map_id import MapID
+from memory.evo1.zelda import set_zelda_memory_source
+from memory.rng_tracker import track_rng
+
+# Maps where the Diablo memory also serves as the Zelda memory (same actor array,
+# with Diablo entities)
+_DIABLO_MAPS = {MapID.SARUDNAHK}
+
+
+def current_map() -> Optional[MapID]:
+    try:
+        return get_memory().map_id
+    except (ReferenceError, ValueError):
+        return None
+
+
+def update_memory() -> None:
+    """
+    Run once per tick, before the sequencer. Only the game memory is loaded here, it
+    tells which map we are on (and expires the pointer cache on map change).
+    The other views are built on first use during the tick:
+    - Zelda memory, served by the Diablo memory in Sarudnahk
+    - Diablo memory, only requested by the Sarudnahk sequences
+    - Battle memory, which doesn't resolve anything while the player is in control
+    - Zephyros structs, only resolved during the fight
+    The rng is followed every tick, for the consumption rate per map.
+    """
+    load_memory()
+    map_id = current_map()
+    set_zelda_memory_source(get_diablo_memory if map_id in _DIABLO_MAPS else None)
+    with contextlib.suppress(ReferenceError, ValueError):
+        track_rng(map_id)
@@ -1,22 +1,35 @@
 # Libraries and Core Files
+import ctypes
 import logging
-from typing import Optional, Tuple
+import struct
+from typing import Any, Callable, Optional, Tuple
 
 from engine.mathlib import Facing, Vec2
-from memory.core import LIBHL_OFFSET, LocProcess
+from engine.spatial import Tags
+from memory.core import LIBHL_OFFSET, LocProcess, mem_handle
 from memory.evo1.kind import EKind, IKind, IKindToChar, MKind, MKindToChar
 from memory.evo1.zephy import (
     ZephyrosGanonMemory,
     ZephyrosGolemMemory,
     ZephyrosPlayerMemory,
 )
+from memory.snapshot import LazyView
 from memory.zelda_base import GameEntity2D, ZeldaMemory
 
 logger = logging.getLogger(__name__)
 
 
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_DOUBLE = struct.Struct("<d")
+
+
 # Only valid when instantiated, on the screen that they live
 class Evo1GameEntity2D(GameEntity2D):
+    _STRUCT_PTR = [0x0]  # Start of the entity struct
+    # Size of the snapshot. Covers all fields below (and the double hp in Sarudnahk)
+    _STRUCT_SIZE = 0x110
+
     _ENT_KIND_PTR = [0x4, 0x4]  # int
     _X_PTR = [0x8]  # double
     _Y_PTR = [0x10]  # double
@@ -42,8 +55,16 @@ class Evo1GameEntity2D(GameEntity2D):
     _IN_CONTROL_PTR = [0xA4]
     _ENCOUNTER_TIMER_PTR = [0xD0]  # double. Steps to encounter
 
-    def __init__(self, process: LocProcess, entity_ptr: int):
+    def __init__(self, process: LocProcess, entity_ptr: int, snapshot: bool = False):
         super().__init__(process=process, entity_ptr=entity_ptr)
+        # In snapshot mode, the entity struct is read once per tick and all the
+        # properties are decoded from that buffer instead of reading each field
+        self.snapshot = snapshot
+        self._snapshot_buf = ctypes.create_string_buffer(self._STRUCT_SIZE)
+        self._snapshot_tick: Optional[int] = None
+        self._snapshot_valid = False
+        # Values outside the struct (kinds), cached for the same tick
+        self._snapshot_cache: dict[int, Any] = {}
         self.setup_pointers()
 
     def __eq__(self, other: object) -> bool:
@@ -58,55 +79,92 @@ class Evo1GameEntity2D(GameEntity2D):
         return kind_match and pos_match
 
     def setup_pointers(self) -> None:
-        self.ent_kind_ptr = self.process.get_pointer(
+        # Chains share the entity as first link, one read per tick validates them all
+        pointers = mem_handle().pointers
+        self.struct_ptr = pointers.get_pointer(
+            self.entity_ptr, offsets=self._STRUCT_PTR
+        )
+        self.ent_kind_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._ENT_KIND_PTR
         )
-        self.x_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._X_PTR)
-        self.y_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._Y_PTR)
-        self.x_tile_ptr = self.process.get_pointer(
+        self.x_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._X_PTR)
+        self.y_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._Y_PTR)
+        self.x_tile_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._X_TILE_PTR
         )
-        self.y_tile_ptr = self.process.get_pointer(
+        self.y_tile_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._Y_TILE_PTR
         )
-        self.speed_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._SPEED_PTR
-        )
-        self.target_ptr = self.process.get_pointer(
+        self.speed_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._SPEED_PTR)
+        self.target_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._TARGET_PTR
         )
-        self.timer_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TIMER_PTR
-        )
-        self.facing_ptr = self.process.get_pointer(
+        self.timer_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._TIMER_PTR)
+        self.facing_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._FACING_PTR
         )
-        self.attack_ptr = self.process.get_pointer(
+        self.attack_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._ATTACK_PTR
         )
-        self.rotation_ptr = self.process.get_pointer(
+        self.rotation_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._ROTATION_PTR
         )
-        self.hp_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._HP_PTR)
-        self.in_control_ptr = self.process.get_pointer(
+        self.hp_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._HP_PTR)
+        self.in_control_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._IN_CONTROL_PTR
         )
-        self.encounter_timer_ptr = self.process.get_pointer(
+        self.encounter_timer_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._ENCOUNTER_TIMER_PTR
         )
-        self.cur_anim_ptr = self.process.get_pointer(
+        self.cur_anim_ptr = pointers.get_pointer(
             self.entity_ptr, offsets=self._CUR_ANIM_PTR
         )
-        self.mkind_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._MKIND_PTR
-        )
-        self.ikind_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._IKIND_PTR
-        )
+        self.mkind_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._MKIND_PTR)
+        self.ikind_ptr = pointers.get_pointer(self.entity_ptr, offsets=self._IKIND_PTR)
+
+    def refresh(self) -> "Evo1GameEntity2D":
+        """Drop the current snapshot, forcing a fresh read on next access.
+        Needed when polling the entity several times within the same tick."""
+        self._snapshot_tick = None
+        return self
+
+    def _take_snapshot(self) -> bool:
+        tick = mem_handle().tick
+        if self._snapshot_tick != tick:
+            self._snapshot_tick = tick
+            self._snapshot_cache.clear()
+            try:
+                self.process.read_buffer(self.struct_ptr, self._snapshot_buf)
+                self._snapshot_valid = True
+            except ReferenceError:
+                # Can happen if the struct ends close to unmapped memory. Fall back
+                # to reading each field on its own this tick.
+                self._snapshot_valid = False
+        return self._snapshot_valid
+
+    def _read(self, ptr: int, fmt: struct.Struct, read_func: Callable[[int], Any]):
+        if not self.snapshot or not self._take_snapshot():
+            return read_func(ptr)
+        offset = ptr - self.struct_ptr
+        if 0 <= offset <= self._STRUCT_SIZE - fmt.size:
+            return fmt.unpack_from(self._snapshot_buf, offset)[0]
+        # Not part of the entity struct, read it once and keep until next tick
+        if ptr not in self._snapshot_cache:
+            self._snapshot_cache[ptr] = read_func(ptr)
+        return self._snapshot_cache[ptr]
+
+    def _read_u8(self, ptr: int) -> int:
+        return self._read(ptr, _U8, self.process.read_u8)
+
+    def _read_u32(self, ptr: int) -> int:
+        return self._read(ptr, _U32, self.process.read_u32)
+
+    def _read_double(self, ptr: int) -> float:
+        return self._read(ptr, _DOUBLE, self.process.read_double)
 
     @property
     def kind(self) -> EKind:
-        kind_val = self.process.read_u32(self.ent_kind_ptr)
+        kind_val = self._read_u32(self.ent_kind_ptr)
         try:
             return EKind(kind_val)
         except ValueError:
@@ -151,52 +209,52 @@ class Evo1GameEntity2D(GameEntity2D):
     @property
     def pos(self) -> Vec2:
         return Vec2(
-            self.process.read_double(self.x_ptr),
-            self.process.read_double(self.y_ptr),
+            self._read_double(self.x_ptr),
+            self._read_double(self.y_ptr),
         )
 
     @property
     def tile_pos(self) -> Tuple[int, int]:
         return [
-            self.process.read_u32(self.x_tile_ptr),
-            self.process.read_u32(self.y_tile_ptr),
+            self._read_u32(self.x_tile_ptr),
+            self._read_u32(self.y_tile_ptr),
         ]
 
     @property
     def speed(self) -> float:
-        return self.process.read_double(self.speed_ptr)
+        return self._read_double(self.speed_ptr)
 
     @property
     def target(self) -> Optional[Vec2]:
-        target_ptr = self.process.read_u32(self.target_ptr)
+        target_ptr = self._read_u32(self.target_ptr)
         if target_ptr != 0:
             return Vec2(
-                x=self.process.read_double(target_ptr + self._TARGET_X_OFFSET),
-                y=self.process.read_double(target_ptr + self._TARGET_Y_OFFSET),
+                x=self._read_double(target_ptr + self._TARGET_X_OFFSET),
+                y=self._read_double(target_ptr + self._TARGET_Y_OFFSET),
             )
         return None
 
     @property
     def timer(self) -> float:
-        return self.process.read_double(self.timer_ptr)
+        return self._read_double(self.timer_ptr)
 
     # 0=left,1=right,2=up,3=down. Doesn't do diagonal facings.
     @property
     def facing(self) -> Facing:
-        return self.process.read_u32(self.facing_ptr)
+        return self._read_u32(self.facing_ptr)
 
     @property
     def is_attacking(self) -> bool:
-        attacking = self.process.read_u8(self.attack_ptr)
+        attacking = self._read_u8(self.attack_ptr)
         return attacking & 0x10  # Bit5 denotes attacking
 
     @property
     def rotation(self) -> float:
-        return self.process.read_double(self.rotation_ptr)
+        return self._read_double(self.rotation_ptr)
 
     @property
     def cur_anim(self) -> int:
-        return self.process.read_u32(self.cur_anim_ptr)
+        return self._read_u32(self.cur_anim_ptr)
 
     def __repr__(self) -> str:
         kind = self.kind
@@ -206,7 +264,7 @@ class Evo1GameEntity2D(GameEntity2D):
     # Only interactible
     @property
     def ikind(self) -> IKind:
-        ikind_val = self.process.read_u32(self.ikind_ptr)
+        ikind_val = self._read_u32(self.ikind_ptr)
         try:
             return IKind(ikind_val)
         except ValueError:
@@ -216,7 +274,7 @@ class Evo1GameEntity2D(GameEntity2D):
     # Only monster
     @property
     def mkind(self) -> MKind:
-        mkind_val = self.process.read_u32(self.mkind_ptr)
+        mkind_val = self._read_u32(self.mkind_ptr)
         try:
             return MKind(mkind_val)
         except ValueError:
@@ -225,20 +283,81 @@ class Evo1GameEntity2D(GameEntity2D):
 
     @property
     def hp(self) -> int:
-        return self.process.read_u32(self.hp_ptr)
+        return self._read_u32(self.hp_ptr)
 
     # Only Hero
     @property
     def not_in_control(self) -> bool:
-        return self.process.read_u8(self.in_control_ptr) == 1
+        return self._read_u8(self.in_control_ptr) == 1
 
     @property
     def in_control(self) -> bool:
-        return self.process.read_u8(self.in_control_ptr) == 0
+        return self._read_u8(self.in_control_ptr) == 0
 
     @property
     def encounter_timer(self) -> float:
-        return self.process.read_double(self.encounter_timer_ptr)
+        return self._read_double(self.encounter_timer_ptr)
+
+
+class ActorTable:
+    """
+    Actors of the current map, kept between ticks.
+
+    Each tick the actor pointer array is read in one go and diffed against the previous
+    tick. Entities are kept for actors that are still alive (and moved to their new
+    slot), new entities are only allocated for actors that just spawned. Everything is
+    dropped when the pointer generation (the map) changes, addresses get reused.
+    """
+
+    def __init__(self) -> None:
+        # Actor object pointer -> entity
+        self._entities: dict[int, Evo1GameEntity2D] = {}
+        self._generation = None
+        self._buf = ctypes.create_string_buffer(0)
+        # Events of the last update
+        self.spawned: list[Evo1GameEntity2D] = []
+        self.despawned: list[Evo1GameEntity2D] = []
+
+    def update(
+        self,
+        process: LocProcess,
+        slots_ptr: int,
+        size: int,
+        alloc: Callable[[int], Evo1GameEntity2D],
+    ) -> list[Evo1GameEntity2D]:
+        if ctypes.sizeof(self._buf) != size * _U32.size:
+            self._buf = ctypes.create_string_buffer(size * _U32.size)
+        if size > 0:
+            process.read_buffer(slots_ptr, self._buf)
+        actors: list[Evo1GameEntity2D] = []
+        entities: dict[int, Evo1GameEntity2D] = {}
+        self.spawned = []
+        self.despawned = []
+        generation = mem_handle().pointers.generation
+        if generation != self._generation:
+            self._generation = generation
+            self.despawned = list(self._entities.values())
+            self._entities = {}
+        for i, (obj_ptr,) in enumerate(_U32.iter_unpack(self._buf.raw)):
+            slot_ptr = slots_ptr + i * _U32.size
+            entity = self._entities.pop(obj_ptr, None)
+            if entity is None:
+                entity = alloc(slot_ptr)
+                self.spawned.append(entity)
+            else:
+                # The slot can move. Chains are checked against the object pointer,
+                # so resolving them again is cheap
+                entity.entity_ptr = slot_ptr
+                entity.setup_pointers()
+            entities[obj_ptr] = entity
+            actors.append(entity)
+        self.despawned += self._entities.values()
+        self._entities = entities
+        if self.spawned or self.despawned:
+            logger.debug(
+                f"Actors: {len(self.spawned)} spawned, {len(self.despawned)} despawned"
+            )
+        return actors
 
 
 class Evo1ZeldaMemory(ZeldaMemory):
@@ -259,23 +378,27 @@ class Evo1ZeldaMemory(ZeldaMemory):
     _ZEPHY_PTR = [0x24]
     _ZEPHY_DIALOG_PTR = [0x4]
 
-    def __init__(self):
+    def __init__(self, snapshot: bool = True, actors: Optional[ActorTable] = None):
         super().__init__()
-        self.base_offset = self.process.get_pointer(
+        self.snapshot = snapshot
+        # Pass the table of the previous tick to reuse its entities
+        self.actor_table = actors or ActorTable()
+        self.pointers = mem_handle().pointers
+        self.base_offset = self.pointers.get_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._ZELDA_PTR
         )
 
-        self.zephy_fight_ptr = self.process.get_pointer(
+        self.zephy_fight_ptr = self.pointers.get_pointer(
             self.base_offset, self._ZEPHY_FIGHT_PTR
         )
         if self.in_zephy_fight:
-            self.zephy_player_ptr = self.process.get_pointer(
+            self.zephy_player_ptr = self.pointers.get_pointer(
                 self.zephy_fight_ptr, self._ZEPHY_PLAYER_PTR
             )
-            self.zephy_ptr = self.process.get_pointer(
+            self.zephy_ptr = self.pointers.get_pointer(
                 self.zephy_fight_ptr, self._ZEPHY_PTR
             )
-            self.zephy_dialog_ptr = self.process.get_pointer(
+            self.zephy_dialog_ptr = self.pointers.get_pointer(
                 self.zephy_fight_ptr, self._ZEPHY_DIALOG_PTR
             )
 
@@ -283,27 +406,43 @@ class Evo1ZeldaMemory(ZeldaMemory):
         self._init_actors()
 
     def _init_player(self):
-        player_ptr = self.process.get_pointer(self.base_offset, self._PLAYER_PTR)
-        self.player = Evo1GameEntity2D(self.process, player_ptr)
+        player_ptr = self.pointers.get_pointer(self.base_offset, self._PLAYER_PTR)
+        self.player = Evo1GameEntity2D(self.process, player_ptr, self.snapshot)
 
     def _init_actors(self):
-        self.actors: list[Evo1GameEntity2D] = []
-        actor_arr_size_ptr = self.process.get_pointer(
+        actor_arr_size_ptr = self.pointers.get_pointer(
             self.base_offset, offsets=self._ACTOR_ARR_SIZE_PTR
         )
         actor_arr_size = self.process.read_u32(actor_arr_size_ptr)
-        actor_arr_offset = self.process.get_pointer(
+        actor_arr_offset = self.pointers.get_pointer(
             self.base_offset, offsets=self._ACTOR_ARR_PTR
         )
-        for i in range(actor_arr_size):
-            # Set enemy offsets
-            actor_offset = self._ACTOR_BASE_ADDR + i * self._ACTOR_PTR_SIZE
-            actor_ptr = self.process.get_pointer(actor_arr_offset, [actor_offset])
-            self.actors.append(self._alloc_monster(actor_ptr))
+        slots_ptr = self.process.read_u32(actor_arr_offset) + self._ACTOR_BASE_ADDR
+        self.actors: list[Evo1GameEntity2D] = self.actor_table.update(
+            self.process, slots_ptr, actor_arr_size, self._alloc_monster
+        )
+
+    @property
+    def spawned(self) -> list[Evo1GameEntity2D]:
+        return self.actor_table.spawned
+
+    @property
+    def despawned(self) -> list[Evo1GameEntity2D]:
+        return self.actor_table.despawned
 
     # OVERRIDE
     def _alloc_monster(self, actor_ptr) -> Evo1GameEntity2D:
-        return Evo1GameEntity2D(self.process, actor_ptr)
+        return Evo1GameEntity2D(self.process, actor_ptr, self.snapshot)
+
+    # OVERRIDE: filter on EKind, and MKind/IKind for monsters and interactibles
+    def _actor_tags(self, actor: Evo1GameEntity2D) -> Tags:
+        kind = actor.kind
+        match kind:
+            case EKind.MONSTER:
+                return kind, actor.mkind
+            case EKind.INTERACT:
+                return kind, actor.ikind
+        return (kind,)
 
     @property
     def in_zephy_fight(self) -> bool:
@@ -335,13 +474,25 @@ class Evo1ZeldaMemory(ZeldaMemory):
         return self.process.read_u32(self.zephy_dialog_ptr)
 
 
-_zelda_mem = None
+_zelda_actors = ActorTable()
+# Properties are read at most once per tick, shared by execute and render
+_zelda_mem = LazyView(lambda: Evo1ZeldaMemory(actors=_zelda_actors))
+# Another view serving the Zelda memory (see memory.evo1.manager)
+_zelda_source: Optional[Callable[[], Evo1ZeldaMemory]] = None
 
 
 def load_zelda_memory() -> None:
-    global _zelda_mem
-    _zelda_mem = Evo1ZeldaMemory()
+    _zelda_mem.load()
+
+
+def set_zelda_memory_source(
+    source: Optional[Callable[[], Evo1ZeldaMemory]] = None
+) -> None:
+    global _zelda_source
+    _zelda_source = source
 
 
 def get_zelda_memory() -> Evo1ZeldaMemory:
-    return _zelda_mem
+    if _zelda_source is not None:
+        return _zelda_source()
+    return _zelda_mem.get()
@@ -1,5 +1,5 @@
 from engine.mathlib import Polar, Vec2
-from memory.core import LocProcess
+from memory.core import LocProcess, mem_handle
 
 
 class ZephyrosPlayerMemory:
@@ -20,19 +20,18 @@ class ZephyrosPlayerMemory:
         self.setup_pointers()
 
     def setup_pointers(self) -> None:
-        self.x_ptr = self.process.get_pointer(self.base_ptr, offsets=self._X_PTR)
-        self.y_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Y_PTR)
-        self.polar_angle_ptr = self.process.get_pointer(
+        pointers = mem_handle().pointers
+        self.x_ptr = pointers.get_pointer(self.base_ptr, offsets=self._X_PTR)
+        self.y_ptr = pointers.get_pointer(self.base_ptr, offsets=self._Y_PTR)
+        self.polar_angle_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._POLAR_ANGLE_PTR
         )
-        self.polar_dist_ptr = self.process.get_pointer(
+        self.polar_dist_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._POLAR_DIST_PTR
         )
-        self.moving_ptr = self.process.get_pointer(
-            self.base_ptr, offsets=self._MOVING_PTR
-        )
-        self.hp_ptr = self.process.get_pointer(self.base_ptr, offsets=self._HP_PTR)
-        self.rotation_ptr = self.process.get_pointer(
+        self.moving_ptr = pointers.get_pointer(self.base_ptr, offsets=self._MOVING_PTR)
+        self.hp_ptr = pointers.get_pointer(self.base_ptr, offsets=self._HP_PTR)
+        self.rotation_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._ROTATION_PTR
         )
 
@@ -76,10 +75,11 @@ class ZephyrosGolemBodypart:
         self.setup_pointers()
 
     def setup_pointers(self) -> None:
-        self.x_ptr = self.process.get_pointer(self.base_ptr, offsets=self._X_PTR)
-        self.y_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Y_PTR)
-        # self.z_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Z_PTR)
-        self.hp_ptr = self.process.get_pointer(self.base_ptr, offsets=self._HP_PTR)
+        pointers = mem_handle().pointers
+        self.x_ptr = pointers.get_pointer(self.base_ptr, offsets=self._X_PTR)
+        self.y_ptr = pointers.get_pointer(self.base_ptr, offsets=self._Y_PTR)
+        # self.z_ptr = pointers.get_pointer(self.base_ptr, offsets=self._Z_PTR)
+        self.hp_ptr = pointers.get_pointer(self.base_ptr, offsets=self._HP_PTR)
 
     @property
     def pos(self) -> Vec2:
@@ -116,42 +116,33 @@ class ZephyrosGolemMemory:
         self.setup_pointers()
 
     def setup_pointers(self) -> None:
-        self.anim_timer_ptr = self.process.get_pointer(
+        pointers = mem_handle().pointers
+        self.anim_timer_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._ANIM_TIMER_PTR
         )
-        self.rotation_ptr = self.process.get_pointer(
+        self.rotation_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._ROTATION_PTR
         )
-        self.facing_ptr = self.process.get_pointer(
-            self.base_ptr, offsets=self._FACING_PTR
-        )
+        self.facing_ptr = pointers.get_pointer(self.base_ptr, offsets=self._FACING_PTR)
         if self.armless:
-            self.armor_ptr = self.process.get_pointer(
-                self.base_ptr, offsets=self._BP0_PTR
-            )
-            self.core_ptr = self.process.get_pointer(
-                self.base_ptr, offsets=self._BP1_PTR
-            )
+            self.armor_ptr = pointers.get_pointer(self.base_ptr, offsets=self._BP0_PTR)
+            self.core_ptr = pointers.get_pointer(self.base_ptr, offsets=self._BP1_PTR)
             self.left = None
             self.right = None
         else:
             # NOTE: These will be invalid and overwritten with something else
             # after the golem phase ends. Don't use once all 3 hp bars are exhausted
-            self.left_arm_ptr = self.process.get_pointer(
+            self.left_arm_ptr = pointers.get_pointer(
                 self.base_ptr, offsets=self._BP0_PTR
             )
-            self.right_arm_ptr = self.process.get_pointer(
+            self.right_arm_ptr = pointers.get_pointer(
                 self.base_ptr, offsets=self._BP1_PTR
             )
             self.left = ZephyrosGolemBodypart(self.process, self.left_arm_ptr)
             self.right = ZephyrosGolemBodypart(self.process, self.right_arm_ptr)
             # NOTE: These are adjusted when the first phase ends, they are no longer valid
-            self.armor_ptr = self.process.get_pointer(
-                self.base_ptr, offsets=self._BP2_PTR
-            )
-            self.core_ptr = self.process.get_pointer(
-                self.base_ptr, offsets=self._BP3_PTR
-            )
+            self.armor_ptr = pointers.get_pointer(self.base_ptr, offsets=self._BP2_PTR)
+            self.core_ptr = pointers.get_pointer(self.base_ptr, offsets=self._BP3_PTR)
         self.armor = ZephyrosGolemBodypart(self.process, self.armor_ptr)
         self.core = ZephyrosGolemBodypart(self.process, self.core_ptr)
 
@@ -185,18 +176,19 @@ class ZephyrosProjectile:
         self.setup_pointers()
 
     def setup_pointers(self) -> None:
-        self.id_ptr = self.process.get_pointer(self.base_ptr, offsets=self._ID_PTR)
-        self.x_ptr = self.process.get_pointer(self.base_ptr, offsets=self._X_PTR)
-        self.y_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Y_PTR)
-        self.z_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Z_PTR)
+        pointers = mem_handle().pointers
+        self.id_ptr = pointers.get_pointer(self.base_ptr, offsets=self._ID_PTR)
+        self.x_ptr = pointers.get_pointer(self.base_ptr, offsets=self._X_PTR)
+        self.y_ptr = pointers.get_pointer(self.base_ptr, offsets=self._Y_PTR)
+        self.z_ptr = pointers.get_pointer(self.base_ptr, offsets=self._Z_PTR)
 
-        self.blue_flag_ptr = self.process.get_pointer(
+        self.blue_flag_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._BLUE_FLAG_PTR
         )
-        self.active_flag_ptr = self.process.get_pointer(
+        self.active_flag_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._ACTIVE_FLAG_PTR
         )
-        self.countered_flag_ptr = self.process.get_pointer(
+        self.countered_flag_ptr = pointers.get_pointer(
             self.base_ptr, offsets=self._COUNTERED_FLAG_PTR
         )
 
@@ -246,31 +238,32 @@ class ZephyrosGanonMemory:
     def __init__(self, process: LocProcess, base_ptr: int) -> None:
         self.process = process
         self.base_ptr = base_ptr
+        self.pointers = mem_handle().pointers
 
-        self.x_ptr = self.process.get_pointer(self.base_ptr, offsets=self._X_PTR)
-        self.y_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Y_PTR)
-        self.z_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Z_PTR)
+        self.x_ptr = self.pointers.get_pointer(self.base_ptr, offsets=self._X_PTR)
+        self.y_ptr = self.pointers.get_pointer(self.base_ptr, offsets=self._Y_PTR)
+        self.z_ptr = self.pointers.get_pointer(self.base_ptr, offsets=self._Z_PTR)
 
-        self.ganon_hp_ptr = self.process.get_pointer(
+        self.ganon_hp_ptr = self.pointers.get_pointer(
             self.base_ptr, offsets=self._GANON_HP_PTR
         )
-        self.red_cnt_ptr = self.process.get_pointer(
+        self.red_cnt_ptr = self.pointers.get_pointer(
             self.base_ptr, offsets=self._RED_ATTACKS_CNT_PTR
         )
         self._init_projectiles()
 
     def _init_projectiles(self):
         self.projectiles: list[ZephyrosProjectile] = []
-        proj_size_ptr = self.process.get_pointer(
+        proj_size_ptr = self.pointers.get_pointer(
             self.base_ptr, self._PROJECTILES_SIZE_PTR
         )
         proj_arr_size = self.process.read_u32(proj_size_ptr)
-        proj_arr_offset = self.process.get_pointer(
+        proj_arr_offset = self.pointers.get_pointer(
             self.base_ptr, self._PROJECTILES_ARR_PTR
         )
         for i in range(proj_arr_size):
             proj_offset = self._PROJECTILES_OFFSET + i * self._PROJECTILES_PTR_SIZE
-            proj_ptr = self.process.get_pointer(proj_arr_offset, offsets=[proj_offset])
+            proj_ptr = self.pointers.get_pointer(proj_arr_offset, offsets=[proj_offset])
             self.projectiles.append(ZephyrosProjectile(self.process, proj_ptr))
 
     @property
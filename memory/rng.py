@@ -1,6 +1,12 @@
 # Libraries and Core Files
+import ctypes
 import logging
+from array import array
+from typing import Optional
 
+import numpy as np
+
+from engine import rng as twister
 from memory.core import LIBHL_OFFSET, mem_handle
 
 logger = logging.getLogger(__name__)
@@ -15,25 +21,28 @@ class EvolandRNG:
 
     # Code: https://github.com/HaxeFoundation/hashlink/blob/master/src/std/random.c
 
-    RNG_VALS = 25
-    RNG_MAX = 7
-    RNG_MAG01 = [0x0, 0x8EBFD028]
+    RNG_VALS = twister.RNG_VALS
+    RNG_MAX = twister.RNG_MAX
+    RNG_MAG01 = twister.RNG_MAG01
 
     _RNG_VALUE_SIZE = 4  # 4 bytes
+    # The cursor (at 0x64) directly follows the values, both are read at once
+    _RNG_BUFFER_SIZE = (RNG_VALS + 1) * _RNG_VALUE_SIZE
     _RNG_BASE_PTR = [0x7F4, 0x0, 0x18, 0x0]
-    _RNG_CURSOR_PTR = [0x7F4, 0x0, 0x18, 0x64]
 
     def __init__(self) -> None:
         mem = mem_handle()
         self.process = mem.process
         self.base_addr = mem.base_addr
+        self.tick = mem.tick
+        # Raw rng buffer, read at most once per tick
+        self._snapshot: Optional[EvolandRNG.RNGStruct] = None
+        self._snapshot_tick: Optional[int] = None
         self.setup_pointers()
 
     def setup_pointers(self):
-        self.rng_cursor_ptr = self.process.get_pointer(
-            self.base_addr + LIBHL_OFFSET, offsets=self._RNG_CURSOR_PTR
-        )
-        self.rng_base_ptr = self.process.get_pointer(
+        pointers = mem_handle().pointers
+        self.rng_base_ptr = pointers.get_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._RNG_BASE_PTR
         )
 
@@ -71,11 +80,12 @@ class EvolandRNG:
         # consumes one rng value and returns an int
         def rand_int(self) -> int:
             pos = self.advance_rng()
-            ret = self.values[pos]
-            ret ^= (ret << 7) & 0x2B5B2500
-            ret ^= (ret << 15) & 0xDB8B0000
-            ret ^= ret >> 16
-            return ret
+            return twister.temper(self.values[pos])
+
+        # The next `count` outputs of rand_int, without consuming them. Vectorized,
+        # meant for long forecasts (thousands of steps)
+        def forecast(self, count: int) -> np.ndarray:
+            return twister.forecast(self.values, self.cursor, count)
 
         # consume three rng values and returns a float
         def rand_float(self) -> float:
@@ -84,11 +94,147 @@ class EvolandRNG:
                 (self.rand_int() / big + self.rand_int()) / big + self.rand_int()
             ) / big
 
-    # Get the current RNG values
+    # Get the current RNG values. The buffer is only read once per tick, and each
+    # caller gets its own copy (it's common to advance the returned struct)
     def get_rng(self) -> RNGStruct:
-        cursor = self.process.read_u32(self.rng_cursor_ptr)
-        values = [
-            self.process.read_u32(self.rng_base_ptr + i * self._RNG_VALUE_SIZE)
-            for i in range(self.RNG_VALS)
-        ]
-        return EvolandRNG.RNGStruct(cursor=cursor, values=values)
+        snapshot = self._get_snapshot()
+        return EvolandRNG.RNGStruct(
+            cursor=snapshot.cursor, values=list(snapshot.values)
+        )
+
+    # Predictions from the current RNG state, without touching the twister for states
+    # that were already generated (see RNGLookahead)
+    def get_lookahead(self) -> "RNGLookahead.Cursor":
+        global _lookahead
+        snapshot = self._get_snapshot()
+        offset = _lookahead.find(snapshot) if _lookahead else None
+        if offset is None or offset > _LOOKAHEAD_ROLLOVER:
+            _lookahead = RNGLookahead(snapshot)
+            offset = 0
+        return _lookahead.at(offset)
+
+    def _get_snapshot(self) -> RNGStruct:
+        tick = mem_handle().tick
+        if self._snapshot_tick != tick:
+            self._snapshot = self._read_rng()
+            self._snapshot_tick = tick
+        return self._snapshot
+
+    def _read_rng(self) -> RNGStruct:
+        buffer = ctypes.create_string_buffer(self._RNG_BUFFER_SIZE)
+        self.process.read_buffer(self.rng_base_ptr, buffer)
+        raw = array("I", buffer.raw)
+        return EvolandRNG.RNGStruct(
+            cursor=raw[self.RNG_VALS], values=raw[: self.RNG_VALS].tolist()
+        )
+
+
+class RNGLookahead:
+    """
+    Outputs of rand_int from a RNG state onwards, as a table. Batches are generated
+    (and tempered) on demand, so predicting at offsets 0..k indexes the table instead
+    of running the twister every time.
+
+    The table rolls along with the game: a later state that is found in one of the
+    generated batches keeps using it (see find).
+    """
+
+    def __init__(self, rng: EvolandRNG.RNGStruct) -> None:
+        # Position of the first table entry in the first batch
+        self.origin = rng.cursor
+        self._state = EvolandRNG.RNGStruct(cursor=rng.cursor, values=list(rng.values))
+        self._batches: list[tuple[int, ...]] = [tuple(rng.values)]
+        self._table = array("I")
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def _grow(self, batches: int = 1) -> None:
+        state = self._state
+        if state.cursor < EvolandRNG.RNG_VALS:
+            # Rest of the current batch
+            self._table.extend(
+                twister.temper(value) for value in state.values[state.cursor :]
+            )
+            state.cursor = EvolandRNG.RNG_VALS
+        elif batches < _VECTORIZED_BATCHES:
+            for _ in range(batches):
+                state._calc_next_rng()
+                self._batches.append(tuple(state.values))
+                self._table.extend(twister.temper(value) for value in state.values)
+        else:
+            # Far ahead, let NumPy generate the batches
+            stream = twister.raw_stream(state.values, batches * EvolandRNG.RNG_VALS)
+            raw = stream[EvolandRNG.RNG_VALS :].reshape(batches, EvolandRNG.RNG_VALS)
+            self._batches.extend(tuple(batch) for batch in raw.tolist())
+            self._table.extend(twister.temper_array(raw.ravel()).tolist())
+            state.values = raw[-1].tolist()
+
+    def rand_int(self, offset: int) -> int:
+        while offset >= len(self._table):
+            self._grow(batches=(offset - len(self._table)) // EvolandRNG.RNG_VALS + 1)
+        return self._table[offset]
+
+    def ints(self, offset: int, count: int) -> np.ndarray:
+        """rand_int outputs at offsets [offset, offset + count)."""
+        self.rand_int(offset + count - 1)
+        return np.frombuffer(self._table[offset : offset + count], dtype=np.uint32)
+
+    def rand_float(self, offset: int) -> float:
+        big = 4294967296.0
+        return (
+            (self.rand_int(offset) / big + self.rand_int(offset + 1)) / big
+            + self.rand_int(offset + 2)
+        ) / big
+
+    def find(self, rng: EvolandRNG.RNGStruct) -> Optional[int]:
+        """Offset of a RNG state in the table, None if it isn't a generated state."""
+        values = tuple(rng.values)
+        for batch, batch_values in enumerate(self._batches):
+            if batch_values == values:
+                offset = batch * EvolandRNG.RNG_VALS + rng.cursor - self.origin
+                return offset if offset >= 0 else None
+        return None
+
+    def at(self, offset: int = 0) -> "RNGLookahead.Cursor":
+        return RNGLookahead.Cursor(self, offset)
+
+    class Cursor:
+        """Same API as RNGStruct (for the predictions), reading from the table."""
+
+        def __init__(self, table: "RNGLookahead", offset: int) -> None:
+            self.table = table
+            self.offset = offset
+
+        def advance_rng(self, steps: int = 1) -> None:
+            self.offset += steps
+
+        def rand_int(self) -> int:
+            ret = self.table.rand_int(self.offset)
+            self.offset += 1
+            return ret
+
+        def rand_float(self) -> float:
+            ret = self.table.rand_float(self.offset)
+            self.offset += 3
+            return ret
+
+
+# Growing the table by at least this many batches at once is done with NumPy
+_VECTORIZED_BATCHES = 8
+
+# Anything the predictions can draw values from
+RNGSource = EvolandRNG.RNGStruct | RNGLookahead.Cursor
+
+# Once the game is this far into the table, it is rebuilt from the current state
+_LOOKAHEAD_ROLLOVER = 8 * EvolandRNG.RNG_VALS
+_lookahead: Optional[RNGLookahead] = None
+_rng: Optional[EvolandRNG] = None
+
+
+# Shared rng memory for the current tick (pointer chains come from the pointer cache)
+def get_rng_memory() -> EvolandRNG:
+    global _rng
+    if _rng is None or _rng.tick != mem_handle().tick:
+        _rng = EvolandRNG()
+    return _rng
@@ -0,0 +1,101 @@
+import logging
+import time
+from typing import Hashable, Optional
+
+from engine import rng as twister
+from memory.rng import EvolandRNG, get_rng_memory
+
+logger = logging.getLogger(__name__)
+
+
+class RNGTracker:
+    """
+    Absolute position of the game in the rng stream: the number of values consumed
+    since tracking started, counting every batch regeneration.
+
+    The batches ahead are forecast and indexed by their values, so finding the live
+    buffer is a single lookup however far the game advanced between two updates. The
+    index slides forward once the game is halfway through it. If the live buffer isn't
+    in the index (the game reseeded, or ran past the whole horizon), tracking restarts
+    from it and `resyncs` is incremented.
+
+    Also keeps the consumption rate (values per second) per key, usually the map.
+    """
+
+    def __init__(self, rng: EvolandRNG.RNGStruct, horizon: int = 4096) -> None:
+        # Number of batches in the index
+        self.horizon = horizon
+        self.position = 0
+        # Batches generated since tracking started (not counting the ones missed
+        # while lost)
+        self.regenerations = 0
+        self.resyncs = 0
+        self._start(rng)
+        self._last_time: Optional[float] = None
+        # key -> [values consumed, seconds]
+        self._rates: dict[Hashable, list[float]] = {}
+
+    def _start(self, rng: EvolandRNG.RNGStruct) -> None:
+        # Position of value 0 of batch 0, so position = batch * 25 + cursor - origin
+        self._origin = rng.cursor - self.position
+        self._batch = 0
+        self._index_from(0, rng.values)
+
+    def _index_from(self, batch: int, values: list[int]) -> None:
+        stream = twister.raw_stream(values, (self.horizon - 1) * EvolandRNG.RNG_VALS)
+        batches = stream.reshape(self.horizon, EvolandRNG.RNG_VALS).tolist()
+        self._index = {
+            tuple(batch_values): batch + i for i, batch_values in enumerate(batches)
+        }
+        self._index_end = batch + self.horizon
+
+    def update(self, rng: EvolandRNG.RNGStruct, key: Hashable = None) -> int:
+        """Follow the live rng, returns the number of values consumed since last time."""
+        now = time.perf_counter()
+        values = tuple(rng.values)
+        batch = self._index.get(values)
+        if batch is None:
+            logger.info(f"Lost the rng at position {self.position}, resyncing")
+            self.resyncs += 1
+            self._start(rng)
+            advance = 0
+        else:
+            position = batch * EvolandRNG.RNG_VALS + rng.cursor - self._origin
+            advance = position - self.position
+            self.position = position
+            self.regenerations += batch - self._batch
+            self._batch = batch
+            if batch > self._index_end - self.horizon // 2:
+                self._index_from(batch, rng.values)
+        if self._last_time is not None:
+            rate = self._rates.setdefault(key, [0, 0.0])
+            rate[0] += advance
+            rate[1] += now - self._last_time
+        self._last_time = now
+        return advance
+
+    def rate(self, key: Hashable = None) -> Optional[float]:
+        """Average values consumed per second under the key, None if never seen."""
+        values, seconds = self._rates.get(key, (0, 0.0))
+        return values / seconds if seconds > 0 else None
+
+    @property
+    def rates(self) -> dict[Hashable, float]:
+        return {key: self.rate(key) for key in self._rates}
+
+
+_tracker: Optional[RNGTracker] = None
+
+
+def get_rng_tracker() -> Optional[RNGTracker]:
+    return _tracker
+
+
+# Called once per tick, with the current map as key
+def track_rng(key: Hashable = None) -> int:
+    global _tracker
+    rng = get_rng_memory().get_rng()
+    if _tracker is None:
+        _tracker = RNGTracker(rng)
+        return 0
+    return _tracker.update(rng, key)
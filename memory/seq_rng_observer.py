@@ -4,6 +4,7 @@ from typing import Optional
 from engine.mathlib import Vec2
 from engine.seq import SeqBase, SequencerEngine, wait_seconds
 from memory.rng import EvolandRNG
+from memory.rng_tracker import RNGTracker
 from term.window import WindowLayout
 
 logger = logging.getLogger("RNG")
@@ -23,7 +24,7 @@ class SeqRngObserver(SeqBase):
         self.mask = 0xFFFFFFFF
         self.setting_modulo = 0
         self.tracking = False
-        self.tracking_offset = 0
+        self.tracker: Optional[RNGTracker] = None
         super().__init__(name)
 
     def _get_digit(self, input: str) -> Optional[int]:
@@ -69,11 +70,11 @@ class SeqRngObserver(SeqBase):
         elif input == ord("t"):
             if self.tracking:
                 logger.info(
-                    f"Stopped tracking. Offset from start: {self.tracking_offset}"
+                    f"Stopped tracking. Offset from start: {self.tracker.position}"
                 )
             else:
                 self.captured_rng = self.mem.get_rng()
-                self.tracking_offset = 0
+                self.tracker = RNGTracker(self.captured_rng)
                 logger.info(f"Tracking rng. Cursor is at {self.captured_rng.cursor}")
             self.tracking = not self.tracking
         # Capture next int from capture buffer
@@ -102,13 +103,9 @@ class SeqRngObserver(SeqBase):
 
     def execute(self, delta: float) -> bool:
         self.rng = self.mem.get_rng()
-        if self.tracking:
-            # Frame-restricted to prevent softlocks if we lose the cursor
-            for _ in range(128):
-                if self.captured_rng.cursor == self.rng.cursor:
-                    break
-                self.captured_rng.advance_rng()
-                self.tracking_offset += 1
+        # The captured buffer follows the game, however far it advanced
+        if self.tracking and self.tracker.update(self.rng):
+            self.captured_rng = self.mem.get_rng()
         return False  # Never completes
 
     def _render_rng_table(
@@ -161,9 +158,15 @@ class SeqRngObserver(SeqBase):
 
         if self.tracking:
             size = window.main.size
+            rate = self.tracker.rate()
+            rate_str = f", {rate:.1f}/s" if rate is not None else ""
+            window.main.addstr(
+                Vec2(1, size.y - 2),
+                f"Batches generated: {self.tracker.regenerations} (resyncs: {self.tracker.resyncs})",
+            )
             window.main.addstr(
                 Vec2(1, size.y - 1),
-                f"Tracking rng changes. Cursor has advanced by: {self.tracking_offset}",
+                f"Tracking rng changes. Cursor has advanced by: {self.tracker.position}{rate_str}",
             )
 
 
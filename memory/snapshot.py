@@ -0,0 +1,71 @@
+import contextlib
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from memory.core import mem_handle
+
+T = TypeVar("T")
+
+
+class TickSnapshot(Generic[T]):
+    """
+    Read-through view of a memory class (Evoland1Memory, ZeldaMemory...), with the
+    same API as the wrapped object.
+
+    The first time a property is read during a tick, the value is read from the game
+    and cached. Any further reads of the same property (from both execute and render)
+    return the cached value. The cache is cleared automatically when the sequencer
+    starts the next tick. Methods and plain attributes are forwarded as-is.
+    """
+
+    def __init__(self, view: T) -> None:
+        self._view = view
+        self._tick = None
+        self._cache: dict[str, Any] = {}
+
+    @property
+    def view(self) -> T:
+        return self._view
+
+    def __getattr__(self, name: str) -> Any:
+        if not isinstance(getattr(type(self._view), name, None), property):
+            return getattr(self._view, name)
+        tick = mem_handle().tick
+        if self._tick != tick:
+            self._tick = tick
+            self._cache.clear()
+        if name not in self._cache:
+            self._cache[name] = getattr(self._view, name)
+        return self._cache[name]
+
+    def __repr__(self) -> str:
+        return f"TickSnapshot({self._view.__class__.__name__})"
+
+
+class LazyView(Generic[T]):
+    """
+    Memory view that is only built when it is used. The first get() during a tick
+    builds the view, later calls in the same tick share it. A view that is never
+    requested doesn't touch the process at all.
+
+    If building fails (ReferenceError, typically during transitions), the view of the
+    previous tick is kept.
+    """
+
+    def __init__(self, factory: Callable[[], T], snapshot: bool = True) -> None:
+        self._factory = factory
+        # Wrap the view in a TickSnapshot
+        self._snapshot = snapshot
+        self._view: Optional[T] = None
+        self._tick = None
+
+    def load(self) -> None:
+        """Build the view right away, raises ReferenceError on failure."""
+        self._tick = mem_handle().tick
+        view = self._factory()
+        self._view = TickSnapshot(view) if self._snapshot else view
+
+    def get(self) -> T:
+        if self._tick != mem_handle().tick:
+            with contextlib.suppress(ReferenceError):
+                self.load()
+        return self._view
@@ -1,4 +1,7 @@
+from typing import Optional
+
 from engine.mathlib import Facing, Vec2
+from engine.spatial import ActorIndex, Tags
 from memory.core import LocProcess, mem_handle
 
 
@@ -45,3 +48,20 @@ class ZeldaMemory:
 
         self.player = GameEntity2D(self.process)
         self.actors: list[GameEntity2D] = []
+        self._actor_index: Optional[ActorIndex[GameEntity2D]] = None
+
+    # OVERRIDE: kinds the actor index can filter on
+    def _actor_tags(self, actor: GameEntity2D) -> Tags:
+        return ()
+
+    @property
+    def actor_index(self) -> ActorIndex[GameEntity2D]:
+        """Actors by tile and kind, built on first use (once per tick)."""
+        if self._actor_index is None:
+            self._actor_index = ActorIndex(
+                self.actors,
+                pos_of=lambda actor: actor.pos,
+                tags_of=self._actor_tags,
+                skip=(ReferenceError,),
+            )
+        return self._actor_index